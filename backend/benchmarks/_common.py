@@ -0,0 +1,29 @@
+"""Shared helpers for the benchmark scripts (run from the backend directory)."""
+
+import os
+import statistics
+import sys
+import time
+from typing import Callable, Dict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def timeit(func: Callable[[], object], repeat: int = 7) -> Dict[str, float]:
+    """Run ``func`` ``repeat`` times and return best/median wall time in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return {'best_ms': min(samples), 'median_ms': statistics.median(samples)}
+
+
+def report(title: str, rows: Dict[str, Dict[str, float]]) -> None:
+    print(f"\n{title}")
+    print('-' * len(title))
+    for name, stats in rows.items():
+        cells = '  '.join(f"{key}={value:,.3f}" for key, value in stats.items())
+        print(f"  {name:<28} {cells}")
@@ -0,0 +1,87 @@
+"""
+Gemini reply parsing benchmark: the previous fence strip + fix_json_newlines regex + json.loads
+against the lenient decoder with repair_json as fallback, on well-formed and malformed replies.
+
+    cd backend && python benchmarks/bench_ai_json.py
+"""
+
+import json
+import re
+
+from _common import report, timeit
+
+from utils.json_repair import repair_json
+
+
+def legacy_parse(text: str):
+    """DocumentationGenerator._parse_ai_response as it was; None when the reply is kept as plain text."""
+    response_text = text.strip()
+    if response_text.startswith('```json'):
+        response_text = response_text[7:]
+    if response_text.startswith('```'):
+        response_text = response_text[3:]
+    if response_text.endswith('```'):
+        response_text = response_text[:-3]
+    response_text = response_text.strip()
+
+    def repl(match):
+        return match.group(0).replace('\n', ' ').replace('\r', ' ')
+    fixed = re.sub(r'"(.*?)(?<!\\)"', repl, response_text, flags=re.DOTALL)
+    try:
+        return json.loads(fixed)
+    except json.JSONDecodeError:
+        return None
+
+
+_DECODER = json.JSONDecoder(strict=False)
+
+
+def lenient_parse(text: str):
+    response_text = text.strip().removeprefix('```json').removeprefix('```').removesuffix('```').strip()
+    try:
+        return _DECODER.decode(response_text)
+    except json.JSONDecodeError:
+        try:
+            return repair_json(response_text)
+        except ValueError:
+            return None
+
+
+def reply(items: int) -> dict:
+    return {
+        'title': 'Request handlers',
+        'overview': 'Handlers for every request kind.',
+        'components': [{'name': f'Handler{i}', 'description': f'Handles request kind {i}.'} for i in range(items)],
+        'examples': [{'description': 'Run one', 'code': 'Handler1().run([1, 2, 3])'}],
+        'notes': ['Not thread-safe.']
+    }
+
+
+REPLIES = {
+    'well-formed': json.dumps(reply(200)),
+    'fenced, raw newlines': '```json\n' + json.dumps(reply(200), indent=2).replace('\\n', '\n') + '\n```',
+    'trailing commas': json.dumps(reply(200)).replace(']', ',]'),
+    'stray quotes': json.dumps(reply(200)).replace('Handles request', 'Handles \\"request').replace('\\"', '"'),
+    'truncated': json.dumps(reply(200))[:-400],
+}
+
+
+def main():
+    rows = {}
+    for name, text in REPLIES.items():
+        for label, parse in (('legacy', legacy_parse), ('lenient+repair', lenient_parse)):
+            result = parse(text)
+            rows[f'{name} {label}'] = dict(timeit(lambda: parse(text), repeat=7),
+                                           parsed=float(isinstance(result, dict)))
+    report(f'Parse a {len(REPLIES["well-formed"]) // 1024}KB Gemini reply (parsed=1 means a dict came back)', rows)
+
+    rows = {}
+    for quotes in (2000, 8000, 32000):
+        text = '{"overview": "' + 'a "b" ' * quotes + '"}'
+        rows[f'{quotes} stray quotes legacy'] = timeit(lambda: legacy_parse(text), repeat=3)
+        rows[f'{quotes} stray quotes repair'] = timeit(lambda: lenient_parse(text), repeat=3)
+    report('Stray quotes inside one string (the legacy parse fails on all of these)', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Block parser benchmark: brace-aware event parser vs. the legacy per-line regex scanners.
+
+The legacy JavaScript scanner only looks at line starts (no block ends, names, strings or
+comments), so it stays faster than the brace parser on JavaScript; TypeScript had no parser
+before, so its legacy row runs that scanner for reference.
+
+    cd backend && python benchmarks/bench_block_parsers.py
+"""
+
+from _common import report, timeit
+
+from pygments import lex
+from pygments.lexers import get_lexer_by_name
+
+from benchmarks.legacy_parsers import LegacyLineParsers
+from services.parsers import parse_braces
+
+UNITS = {
+    'java': '''
+/** Service number {i}. Braces in comments {{ are ignored. */
+@Component
+public class Service{i} extends Base implements Runnable {{
+    private final String label = "service {{{i}}}";
+    @Override
+    public void run() {{
+        for (int j = 0; j < {i}; j++) {{
+            if (j % 2 == 0 && label != null) {{ handle(j); }} else {{ skip(j); }}
+        }}
+    }}
+    public static <T> List<T> wrap(@Nullable T value) throws Exception {{
+        return value == null ? Collections.emptyList() : List.of(value);
+    }}
+}}
+''',
+    'cpp': '''
+// Widget number {i}
+template <typename T>
+class Widget{i} : public Base {{
+public:
+    Widget{i}() : value_(0) {{}}
+    T get() const {{ return value_; }}
+private:
+    T value_;
+}};
+int compute{i}(int a, int b) {{
+    for (int j = 0; j < a; ++j) {{ if (j > b || j == {i}) {{ return j; }} }}
+    return -1;
+}}
+''',
+    'csharp': '''
+namespace App.Area{i} {{
+    [Serializable]
+    public class Repo{i}<T> where T : new() {{
+        public int Count {{ get; set; }}
+        public async Task<T> LoadAsync(string id) {{
+            if (string.IsNullOrEmpty(id)) {{ throw new ArgumentException("id {{"); }}
+            return await Task.FromResult(new T());
+        }}
+    }}
+}}
+''',
+    'javascript': '''
+// Handler {i}
+function handler{i}(req, res) {{
+    const label = `handler ${{req.id}} {{`;
+    if (req && req.body) {{ return res.send(label); }}
+    return null;
+}}
+const helper{i} = async (value) => {{
+    for (const item of value) {{ await item; }}
+}};
+class Store{i} extends Base {{
+    constructor() {{ super(); this.items = []; }}
+    add(item) {{ this.items.push(item); }}
+}}
+''',
+}
+UNITS['typescript'] = UNITS['javascript']
+
+LEGACY = LegacyLineParsers()
+LEGACY_PARSERS = {
+    'java': LEGACY._parse_java,
+    'cpp': LEGACY._parse_cpp,
+    'csharp': LEGACY._parse_csharp,
+    'javascript': LEGACY._parse_javascript,
+    'typescript': LEGACY._parse_javascript,
+}
+
+
+def corpus(language: str, size: int) -> str:
+    parts, total, i = [], 0, 0
+    while total < size:
+        unit = UNITS[language].format(i=i)
+        parts.append(unit)
+        total += len(unit)
+        i += 1
+    return ''.join(parts)
+
+
+def main():
+    rows = {}
+    for language in UNITS:
+        source = corpus(language, 50_000)
+        rows[f'{language} legacy line regex'] = timeit(lambda: LEGACY_PARSERS[language](source))
+        rows[f'{language} brace parser'] = timeit(lambda: parse_braces(source, language))
+    source = corpus('java', 50_000)
+    lexer = get_lexer_by_name('java')
+    rows['java full pygments lex'] = timeit(lambda: list(lex(source, lexer)), repeat=3)
+    report('Block parsing, 50KB inputs', rows)
+
+    rows = {}
+    for size in (25_000, 50_000, 100_000, 200_000):
+        source = corpus('java', size)
+        stats = timeit(lambda: parse_braces(source, 'java'))
+        stats['us_per_kb'] = stats['best_ms'] * 1000 / (len(source) / 1024)
+        rows[f'java {size // 1000}KB'] = stats
+    report('Brace parser scaling (flat us/KB means linear time)', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+JSON benchmark: serialization time and payload size of large documents with the stdlib
+(indented, as the JSON export and flask.jsonify did, and compact) against orjson, plus
+parsing a large request body.
+
+    cd backend && python benchmarks/bench_json.py
+"""
+
+import json
+
+from _common import report, timeit
+
+from benchmarks.bench_templates import document
+from utils.json_codec import ORJSON_AVAILABLE, JsonCodec
+
+
+def codecs():
+    yield 'json', JsonCodec('json')
+    if ORJSON_AVAILABLE:
+        yield 'orjson', JsonCodec('orjson')
+
+
+def main():
+    for blocks in (2000, 10000):
+        doc = document(blocks).to_dict()
+        rows = {
+            'stdlib indent=2 (before)': dict(
+                timeit(lambda: json.dumps(doc, indent=2).encode('utf-8'), repeat=5),
+                kb=len(json.dumps(doc, indent=2)) / 1024
+            )
+        }
+        for name, codec in codecs():
+            for pretty in (True, False):
+                label = f"{name} {'pretty' if pretty else 'compact'}"
+                rows[label] = dict(timeit(lambda: codec.dumps(doc, pretty=pretty), repeat=5),
+                                   kb=len(codec.dumps(doc, pretty=pretty)) / 1024)
+        report(f'Serialize to_dict() of a {blocks}-block document', rows)
+
+    code = '\n'.join(block.content for block in document(8000).code_blocks)
+    body = json.dumps({'code': code, 'language': 'java', 'title': 'Large request'}).encode('utf-8')
+    rows = {'stdlib json.loads (before)': timeit(lambda: json.loads(body), repeat=5)}
+    for name, codec in codecs():
+        rows[f'{name} loads'] = timeit(lambda: codec.loads(body), repeat=5)
+    report(f'Parse a {len(body) // 1024}KB request body', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+"""
+Markdown to HTML benchmark: the single-pass converter vs. the previous chain of re.sub passes,
+on multi-megabyte exports and on input that makes the old code-block regex backtrack.
+
+    cd backend && python benchmarks/bench_markdown_html.py
+"""
+
+import re
+
+from _common import report, timeit
+
+from benchmarks.bench_block_parsers import UNITS
+from utils.markdown_html import markdown_to_html
+
+
+def legacy_markdown_to_html(markdown_content: str) -> str:
+    """DocumentationGenerator._markdown_to_html as it was (metrics tables left as <pre>)."""
+    content = re.sub(r'^# (.*?)$', r'<h1>\1</h1>', markdown_content, flags=re.MULTILINE)
+    content = re.sub(r'^## (.*?)$', r'<h2>\1</h2>', content, flags=re.MULTILINE)
+    content = re.sub(r'^### (.*?)$', r'<h3>\1</h3>', content, flags=re.MULTILINE)
+    content = re.sub(
+        r'```(\w+)\n(.*?)\n```',
+        lambda m: f'<div class="code-block"><div class="code-block-header">{m.group(1)}</div><pre><code>{m.group(2)}</code></pre></div>',
+        content,
+        flags=re.DOTALL
+    )
+    content = re.sub(r'`(.*?)`', r'<code>\1</code>', content)
+    content = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', content)
+    content = re.sub(r'\*(.*?)\*', r'<em>\1</em>', content)
+    content = re.sub(r'^\- (.*?)$', r'<li>\1</li>', content, flags=re.MULTILINE)
+    content = content.replace('<li>', '<ul><li>').replace('</li>\n\n', '</li></ul>\n\n')
+    content = re.sub(
+        r'```json\n(.*?)\n```',
+        lambda m: f'<div class="metrics"><pre>{m.group(1)}</pre></div>',
+        content,
+        flags=re.DOTALL
+    )
+    content = re.sub(r'\n\n(.*?)\n\n', r'\n\n<p>\1</p>\n\n', content)
+    return content
+
+
+def export_markdown(size: int) -> str:
+    """A detailed-template style export of roughly ``size`` characters."""
+    parts = ['# Repository Documentation\n\n## Overview\n\n']
+    total, i = 0, 0
+    while total < size:
+        part = (
+            f'The **Service{i}** class handles *request {i}*; call `run()` to start it.\n'
+            f'It keeps a label and a counter.\n\n'
+            f'- Lines of code: 16\n- Complexity: 4\n\n'
+            f'### Block at line {i * 16 + 1}\n\n```java\n{UNITS["java"].format(i=i)}\n```\n\n'
+        )
+        parts.append(part)
+        total += len(part)
+        i += 1
+    parts.append('## Project Metrics\n\n```json\n{"total_blocks": %d, "average_complexity": 4.0}\n```\n' % i)
+    return ''.join(parts)
+
+
+def main():
+    rows = {}
+    for megabytes in (1, 4):
+        markdown = export_markdown(megabytes * 1024 * 1024)
+        rows[f'{megabytes}MB export legacy'] = timeit(lambda: legacy_markdown_to_html(markdown), repeat=3)
+        rows[f'{megabytes}MB export single pass'] = timeit(lambda: markdown_to_html(markdown), repeat=3)
+    report('Markdown to HTML, generated exports', rows)
+
+    rows = {}
+    # Fence openers that never close: the legacy DOTALL code-block regex rescans the rest of the
+    # input from each one, so time grows with the square of the line count
+    for lines in (5000, 10000, 20000):
+        markdown = 'x```py\n' * lines
+        rows[f'{lines} open fences legacy'] = timeit(lambda: legacy_markdown_to_html(markdown), repeat=1)
+        rows[f'{lines} open fences single pass'] = timeit(lambda: markdown_to_html(markdown), repeat=3)
+    markdown = 'x```py\n' * 500_000
+    rows['500000 open fences single pass'] = timeit(lambda: markdown_to_html(markdown), repeat=3)
+    report('Markdown to HTML, worst case', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,152 @@
+"""
+Memory benchmark: offset-based code blocks vs. blocks holding copies of their text,
+for a generate + JSON response request on a 50KB Python file.
+
+Each variant runs in its own process so peak RSS is not shared between them.
+
+    cd backend && python benchmarks/bench_memory.py
+"""
+
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+
+from _common import BACKEND_DIR
+
+REQUESTS = 200
+
+UNIT = '''
+class Handler{i}(Base):
+    """Handles request kind {i}."""
+
+    def __init__(self, label: str = "handler {i}"):
+        self.label = label
+        self.count = 0
+
+    def run(self, items):
+        total = 0
+        for item in items:
+            if item % {m} == 0 and item > 0:
+                total += item
+            elif item < 0:
+                total -= item
+        self.count += 1
+        return total
+
+
+def helper_{i}(value, *, scale=2):
+    # Scale and clamp a value
+    return max(0, min(value * scale, {i} * 100))
+'''
+
+
+def source(size: int = 50 * 1024) -> str:
+    parts, total, i = ['import os\nimport sys\n'], 0, 0
+    while total < size:
+        part = UNIT.format(i=i, m=i % 7 + 2)
+        parts.append(part)
+        total += len(part)
+        i += 1
+    return ''.join(parts)
+
+
+def _copied_parse_python(self, code):
+    """_parse_python as it was: every block's text joined out of a list of the file's lines."""
+    from services.documentation_generator import CodeBlock
+
+    parsed = self._parse_python_source(code)
+    lines = code.split('\n')
+    return [
+        CodeBlock(
+            content='\n'.join(lines[symbol.line_number - 1:symbol.end_line]),
+            language='python',
+            line_number=symbol.line_number,
+            end_line=symbol.end_line,
+            name=symbol.qualname,
+            kind=symbol.kind,
+            decorators=symbol.decorators,
+            complexity=symbol.total_complexity
+        )
+        for symbol in parsed.blocks
+    ]
+
+
+def _traced(func):
+    """(result, peak KB, retained KB, live allocations) of one call; the result is kept alive."""
+    blocks_before = sys.getallocatedblocks()
+    tracemalloc.start()
+    result = func()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, peak / 1024, retained / 1024, sys.getallocatedblocks() - blocks_before
+
+
+def measure(variant: str) -> dict:
+    os.environ['AI_CACHE_ENABLED'] = 'false'
+    os.environ['EXPORT_CACHE_ENABLED'] = 'false'
+    if BACKEND_DIR not in sys.path:
+        sys.path.insert(0, BACKEND_DIR)
+    from services.documentation_generator import DocumentationGenerator
+
+    if variant == 'copied text':
+        DocumentationGenerator._parse_python = _copied_parse_python
+    generator = DocumentationGenerator(use_ai=False)
+    code = source()
+
+    def request(i: int):
+        # A fresh source string per request, as when it arrives in a JSON body
+        doc = generator.generate(code + f"\n# request {i}\n", 'python', title=f'request {i}', use_ai=False)
+        json.dumps(doc.to_dict())
+        return doc
+
+    # Block extraction alone, with the syntax tree already cached
+    generator._parse_python(code)
+    blocks, parse_peak, parse_retained, parse_allocations = _traced(lambda: generator._parse_python(code))
+
+    request(-1)
+    _, peak, retained, allocations = _traced(lambda: request(-2))
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Finished documents stay in the result cache, as they do between requests
+    for i in range(REQUESTS):
+        request(i)
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        'parse': {
+            'blocks': len(blocks),
+            'peak_kb': parse_peak,
+            'retained_kb': parse_retained,
+            'live_allocations': parse_allocations
+        },
+        'request': {
+            'peak_kb': peak,
+            'retained_kb': retained,
+            'live_allocations': allocations,
+            # ru_maxrss is in KB on Linux
+            'peak_rss_mb': rss_after / 1024,
+            'rss_kb_per_request': (rss_after - rss_before) / REQUESTS
+        }
+    }
+
+
+def main():
+    from _common import report
+
+    results = {}
+    context = multiprocessing.get_context('spawn')
+    for variant in ('copied text', 'offsets'):
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            results[variant] = executor.submit(measure, variant).result()
+    size = len(source()) // 1024
+    report(f'Python block extraction, {size}KB file', {
+        variant: result['parse'] for variant, result in results.items()})
+    report(f'generate + to_dict + JSON, {size}KB file ({REQUESTS} requests for RSS)', {
+        variant: result['request'] for variant, result in results.items()})
+
+
+if __name__ == '__main__':
+    main()
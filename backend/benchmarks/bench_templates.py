@@ -0,0 +1,64 @@
+"""
+Export template benchmark: compile cost and per-render time of every registered template,
+against formatting the same section strings with str.format on each render.
+
+    cd backend && python benchmarks/bench_templates.py
+"""
+
+from _common import report, timeit
+
+from benchmarks.bench_block_parsers import UNITS
+from services.documentation_generator import CodeBlock, Documentation
+from services.templates import CompiledTemplate, TemplateRegistry
+
+
+def document(blocks: int = 2000) -> Documentation:
+    code_blocks = [
+        CodeBlock(content=UNITS['java'].format(i=i), language='java', line_number=i * 16 + 1,
+                  name=f'Service{i}', complexity=4, metrics={'loc': 16})
+        for i in range(blocks)
+    ]
+    metrics = {'total_blocks': blocks, 'total_lines': blocks * 16, 'average_complexity': 4.0}
+    return Documentation('Benchmark', 'Synthetic services.', 'java', code_blocks, metrics)
+
+
+def format_each_time(template: CompiledTemplate, doc: Documentation) -> str:
+    """The same output with every section re-parsed by str.format per document and block."""
+    return ''.join(
+        text.format_map(context) for text, context in _contexts(template, doc)
+    )
+
+
+def _contexts(template: CompiledTemplate, doc: Documentation):
+    sections = template.sections
+    context = template._document_context(doc)
+    blocks = [template._block_context(context, i, block) for i, block in enumerate(doc.code_blocks, 1)]
+    for name in ('title', 'description', 'toc'):
+        if name in sections:
+            yield sections[name], context
+    for block in blocks if 'toc_item' in sections else ():
+        yield sections['toc_item'], block
+    if 'metrics' in sections:
+        yield sections['metrics'], context
+    for key, value in doc.metrics.items() if 'metric_item' in sections else ():
+        yield sections['metric_item'], template._metric_context(context, key, value)
+    if 'code_blocks' in sections:
+        yield sections['code_blocks'], context
+    for block in blocks if 'code_block' in sections else ():
+        yield sections['code_block'], block
+
+
+def main():
+    registry = TemplateRegistry()
+    doc = document()
+    rows = {}
+    for name in registry:
+        compiled = registry.get(name)
+        rows[f'{name} compile'] = timeit(lambda: CompiledTemplate(name, compiled.sections))
+        rows[f'{name} render (compiled)'] = timeit(lambda: ''.join(compiled.render(doc)))
+        rows[f'{name} render (str.format)'] = timeit(lambda: format_each_time(compiled, doc))
+    report(f'Export templates, {len(doc.code_blocks)} blocks', rows)
+
+
+if __name__ == '__main__':
+    main()
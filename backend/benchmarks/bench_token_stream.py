@@ -0,0 +1,76 @@
+"""
+Token stream benchmark: token/comment counts from one ``scan_source`` pass and
+highlighting with the per-language lexer, against a lexer lookup and a full
+pygments.lex per block for both.
+
+    cd backend && python benchmarks/bench_token_stream.py
+"""
+
+import re
+
+from _common import report, timeit
+
+from pygments import highlight, lex
+from pygments.formatters import HtmlFormatter
+from pygments.lexers import get_lexer_by_name
+
+from benchmarks.bench_block_parsers import UNITS
+from benchmarks.bench_memory import source as python_source
+from services.documentation_generator import DocumentationGenerator
+from services.parsers import pygments_lexer, scan_source
+
+_COMMENT_MARKERS = re.compile(r'(?://|#|/\*|\*/|"""|\'\'\')')
+
+
+def java_source(size: int) -> str:
+    parts, total, i = [], 0, 0
+    while total < size:
+        part = UNITS['java'].format(i=i)
+        parts.append(part)
+        total += len(part)
+        i += 1
+    return ''.join(parts)
+
+
+def per_block_counts(blocks):
+    """The previous token and comment counts: a new lexer and a full lex for every block."""
+    return [
+        (len(list(lex(block.content, get_lexer_by_name(block.language)))),
+         len(_COMMENT_MARKERS.findall(block.content)))
+        for block in blocks
+    ]
+
+
+def shared_counts(blocks):
+    stats = scan_source(blocks[0].source, blocks[0].language)
+    return [stats.span(block.line_number, block.end_line) for block in blocks]
+
+
+def per_block_export(blocks, formatter):
+    """Counts, then highlighting, each lexing every block again (the HTML export after metrics)."""
+    counts = per_block_counts(blocks)
+    return counts, [highlight(block.content, get_lexer_by_name(block.language), formatter) for block in blocks]
+
+
+def shared_export(blocks, formatter):
+    counts = shared_counts(blocks)
+    return counts, [highlight(block.content, pygments_lexer(block.language), formatter) for block in blocks]
+
+
+def main():
+    generator = DocumentationGenerator(use_ai=False)
+    formatter = HtmlFormatter(nowrap=True)
+    for language, make in (('python', python_source), ('java', java_source)):
+        rows = {}
+        for kb in (50, 200, 800):
+            blocks = generator._parse_code_blocks(make(kb * 1024), language)
+            label = f'{kb}KB, {len(blocks)} blocks'
+            rows[f'{label} counts, per block'] = timeit(lambda: per_block_counts(blocks), repeat=3)
+            rows[f'{label} counts, shared'] = timeit(lambda: shared_counts(blocks), repeat=3)
+            rows[f'{label} + highlight, per block'] = timeit(lambda: per_block_export(blocks, formatter), repeat=3)
+            rows[f'{label} + highlight, shared'] = timeit(lambda: shared_export(blocks, formatter), repeat=3)
+        report(f'{language}: token/comment counts, then highlighting', rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+"""
+Per-line regex block scanners as they existed before the brace-aware parser.
+
+Kept only as the baseline for benchmarks/bench_block_parsers.py.
+"""
+
+import re
+from typing import List
+
+from services.documentation_generator import CodeBlock
+
+
+class LegacyLineParsers:
+    def _parse_javascript(self, code: str) -> List[CodeBlock]:
+        """Parse JavaScript/TypeScript code into code blocks."""
+        blocks = []
+        lines = code.split('\n')
+        current_block = []
+        line_number = 1
+
+        for line in lines:
+            stripped = line.strip()
+            # Detect function or class definitions
+            if (stripped.startswith('function ') or 
+                stripped.startswith('class ') or 
+                stripped.startswith('const ') and '=> {' in stripped):
+                if current_block:
+                    blocks.append(CodeBlock(
+                        content='\n'.join(current_block),
+                        language='javascript',
+                        line_number=line_number - len(current_block)
+                    ))
+                current_block = [line]
+            elif current_block:
+                current_block.append(line)
+            line_number += 1
+
+        # Add the last block
+        if current_block:
+            blocks.append(CodeBlock(
+                content='\n'.join(current_block),
+                language='javascript',
+                line_number=line_number - len(current_block)
+            ))
+
+        return blocks
+
+    def _parse_java(self, source_code: str) -> List[CodeBlock]:
+        """Parse Java source code and extract code blocks."""
+        code_blocks = []
+        lines = source_code.split('\n')
+        
+        current_block = []
+        in_comment = False
+        
+        for i, line in enumerate(lines, 1):
+            stripped_line = line.strip()
+            
+            # Handle multi-line comments
+            if '/*' in stripped_line:
+                in_comment = True
+            if '*/' in stripped_line:
+                in_comment = False
+                continue
+                
+            # Skip comments
+            if stripped_line.startswith('//') or in_comment:
+                continue
+                
+            # Check for class, interface, or method declarations
+            if re.match(r'^\s*(public|private|protected)?\s*(class|interface|enum|@interface|abstract\s+class|\w+\s+\w+\s*\()', line):
+                if current_block:
+                    code_blocks.append(CodeBlock(
+                        content='\n'.join(current_block),
+                        language='java',
+                        line_number=i - len(current_block)
+                    ))
+                current_block = [line]
+            elif current_block:
+                current_block.append(line)
+                
+        if current_block:
+            code_blocks.append(CodeBlock(
+                content='\n'.join(current_block),
+                language='java',
+                line_number=len(lines) - len(current_block) + 1
+            ))
+            
+        return code_blocks
+
+    def _parse_cpp(self, source_code: str) -> List[CodeBlock]:
+        """Parse C++ source code and extract code blocks."""
+        code_blocks = []
+        lines = source_code.split('\n')
+        
+        current_block = []
+        in_comment = False
+        template_depth = 0
+        
+        for i, line in enumerate(lines, 1):
+            stripped_line = line.strip()
+            
+            # Handle multi-line comments
+            if '/*' in stripped_line:
+                in_comment = True
+            if '*/' in stripped_line:
+                in_comment = False
+                continue
+                
+            # Skip comments
+            if stripped_line.startswith('//') or in_comment:
+                continue
+                
+            # Track template depth
+            template_depth += stripped_line.count('<') - stripped_line.count('>')
+            
+            # Check for function, class, or struct declarations
+            if template_depth == 0 and re.match(r'^\s*(template\s*<.*>)?\s*(class|struct|enum|union|\w+\s+\w+\s*\()', line):
+                if current_block:
+                    code_blocks.append(CodeBlock(
+                        content='\n'.join(current_block),
+                        language='cpp',
+                        line_number=i - len(current_block)
+                    ))
+                current_block = [line]
+            elif current_block:
+                current_block.append(line)
+                
+        if current_block:
+            code_blocks.append(CodeBlock(
+                content='\n'.join(current_block),
+                language='cpp',
+                line_number=len(lines) - len(current_block) + 1
+            ))
+            
+        return code_blocks
+
+    def _parse_csharp(self, source_code: str) -> List[CodeBlock]:
+        """Parse C# source code and extract code blocks."""
+        code_blocks = []
+        lines = source_code.split('\n')
+        
+        current_block = []
+        in_comment = False
+        
+        for i, line in enumerate(lines, 1):
+            stripped_line = line.strip()
+            
+            # Handle multi-line comments
+            if '/*' in stripped_line:
+                in_comment = True
+            if '*/' in stripped_line:
+                in_comment = False
+                continue
+                
+            # Skip comments
+            if stripped_line.startswith('//') or in_comment:
+                continue
+                
+            # Check for class, interface, method, or property declarations
+            if re.match(r'^\s*(public|private|protected|internal)?\s*(class|interface|enum|struct|record|async\s+Task|\w+\s+\w+\s*\(|\w+\s+\w+\s*{)', line):
+                if current_block:
+                    code_blocks.append(CodeBlock(
+                        content='\n'.join(current_block),
+                        language='csharp',
+                        line_number=i - len(current_block)
+                    ))
+                current_block = [line]
+            elif current_block:
+                current_block.append(line)
+                
+        if current_block:
+            code_blocks.append(CodeBlock(
+                content='\n'.join(current_block),
+                language='csharp',
+                line_number=len(lines) - len(current_block) + 1
+            ))
+            
+        return code_blocks
+
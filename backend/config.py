@@ -9,6 +9,8 @@ from typing import Dict, Any
 
 load_dotenv()
 
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 class Config:
     # GitHub settings (optional - for GitHub integration features)
     GITHUB_TOKEN = os.getenv('GITHUB_TOKEN', '')
@@ -22,6 +24,83 @@ class Config:
     MAX_CONTENT_LENGTH = 5 * 1024 * 1024  # 5MB
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', 'http://localhost:3000').split(',')
 
+    # Documentation result cache (in-memory, per worker)
+    DOC_CACHE_TTL = int(os.getenv('DOC_CACHE_TTL', '3600'))
+    DOC_CACHE_MAX_ENTRIES = int(os.getenv('DOC_CACHE_MAX_ENTRIES', '256'))
+    DOC_CACHE_MAX_BYTES = int(os.getenv('DOC_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))  # 32MB
+    # Incremental runs reuse the previous AI sections when at most this share of block lines changed
+    INCREMENTAL_AI_MAX_CHANGE_RATIO = float(os.getenv('INCREMENTAL_AI_MAX_CHANGE_RATIO', '0.25'))
+
+    # Persistent Gemini response cache (SQLite, shared by all workers)
+    AI_CACHE_ENABLED = os.getenv('AI_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    AI_CACHE_PATH = os.getenv('AI_CACHE_PATH', os.path.join(BASE_DIR, 'exports', '.cache', 'ai_responses.sqlite3'))
+    AI_CACHE_MAX_BYTES = int(os.getenv('AI_CACHE_MAX_BYTES', str(64 * 1024 * 1024)))  # 64MB
+    AI_CACHE_TTL = int(os.getenv('AI_CACHE_TTL', str(30 * 24 * 3600)))  # 30 days
+    # Ask Gemini for schema-constrained JSON (needs google-generativeai >= 0.6; otherwise replies are repaired)
+    AI_STRUCTURED_OUTPUT = os.getenv('AI_STRUCTURED_OUTPUT', 'true').lower() in ('1', 'true', 'yes')
+
+    # Rendered exports (markdown/HTML/JSON/PDF/DOCX), keyed by document hash + format + template
+    EXPORT_CACHE_ENABLED = os.getenv('EXPORT_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    EXPORT_CACHE_DIR = os.getenv('EXPORT_CACHE_DIR', os.path.join(BASE_DIR, 'exports', '.cache', 'artifacts'))
+    EXPORT_CACHE_MAX_BYTES = int(os.getenv('EXPORT_CACHE_MAX_BYTES', str(256 * 1024 * 1024)))  # 256MB
+    EXPORT_CACHE_MAX_ENTRIES = int(os.getenv('EXPORT_CACHE_MAX_ENTRIES', '1024'))
+
+    # Syntax-highlighted HTML per code block (in-memory, per worker)
+    HIGHLIGHT_CACHE_MAX_ENTRIES = int(os.getenv('HIGHLIGHT_CACHE_MAX_ENTRIES', '4096'))
+    HIGHLIGHT_CACHE_MAX_BYTES = int(os.getenv('HIGHLIGHT_CACHE_MAX_BYTES', str(32 * 1024 * 1024)))  # 32MB
+
+    # JSON encoding for API requests/responses and JSON exports: 'auto' (orjson if installed), 'orjson' or 'json'
+    JSON_BACKEND = os.getenv('JSON_BACKEND', 'auto')
+    # JSON exports without indentation (API responses are compact unless ?pretty=1)
+    JSON_EXPORT_COMPACT = os.getenv('JSON_EXPORT_COMPACT', 'false').lower() in ('1', 'true', 'yes')
+
+    # User export templates: <name>.json files of section format strings, added to 'default'/'detailed'
+    TEMPLATES_DIR = os.getenv('TEMPLATES_DIR', '')
+
+    # PDF/DOCX exports render in a process pool; 0 workers renders in the request thread
+    RENDER_POOL_WORKERS = int(os.getenv('RENDER_POOL_WORKERS', '2'))
+    RENDER_QUEUE_MAX = int(os.getenv('RENDER_QUEUE_MAX', '8'))
+    RENDER_TIMEOUT = float(os.getenv('RENDER_TIMEOUT', '60'))
+
+    # Background jobs (/api/jobs); records and results are shared by all workers via SQLite
+    JOBS_STORE_PATH = os.getenv('JOBS_STORE_PATH', os.path.join(BASE_DIR, 'exports', '.cache', 'jobs.sqlite3'))
+    JOBS_STORE_MAX_BYTES = int(os.getenv('JOBS_STORE_MAX_BYTES', str(64 * 1024 * 1024)))  # 64MB
+    JOBS_TTL = int(os.getenv('JOBS_TTL', '3600'))
+    JOBS_MAX_CONCURRENT = int(os.getenv('JOBS_MAX_CONCURRENT', '4'))
+    JOBS_MAX_PENDING = int(os.getenv('JOBS_MAX_PENDING', '64'))
+    JOBS_MAX_WAIT = float(os.getenv('JOBS_MAX_WAIT', '30'))  # longest long-poll
+
+    # Repository scanning (/api/scan); larger files are not listed
+    SCAN_MAX_FILE_BYTES = int(os.getenv('SCAN_MAX_FILE_BYTES', str(2 * 1024 * 1024)))  # 2MB
+    SCAN_WORKERS = int(os.getenv('SCAN_WORKERS', '4'))
+    # Directory names pruned on top of the VCS/cache/virtualenv defaults, e.g. "build,dist"
+    SCAN_SKIP_DIRS = [name.strip() for name in os.getenv('SCAN_SKIP_DIRS', '').split(',') if name.strip()]
+
+    # Repository documentation pipeline (/api/scan/document); 0 workers runs in the job thread
+    PIPELINE_WORKERS = int(os.getenv('PIPELINE_WORKERS', str(os.cpu_count() or 1)))
+    PIPELINE_BATCH_SIZE = int(os.getenv('PIPELINE_BATCH_SIZE', '8'))
+    PIPELINE_MAX_FILE_BYTES = int(os.getenv('PIPELINE_MAX_FILE_BYTES', str(1024 * 1024)))  # 1MB
+    PIPELINE_OUTPUT_DIR = os.getenv('PIPELINE_OUTPUT_DIR', os.path.join(BASE_DIR, 'exports', 'repositories'))
+    # Jobs may only read repositories under PIPELINE_REPOSITORY_ROOT and write under PIPELINE_OUTPUT_DIR
+    PIPELINE_REPOSITORY_ROOT = os.getenv('PIPELINE_REPOSITORY_ROOT', os.path.join(BASE_DIR, 'repositories'))
+    # Per-file stat/hash/blocks/metrics from the last run, so rescans only re-document changed files
+    FILE_INDEX_ENABLED = os.getenv('FILE_INDEX_ENABLED', 'true').lower() in ('1', 'true', 'yes')
+    FILE_INDEX_PATH = os.getenv('FILE_INDEX_PATH', os.path.join(BASE_DIR, 'exports', '.cache', 'file_index.sqlite3'))
+
+    # Large files are documented as concurrent per-chunk Gemini prompts instead of one
+    AI_FANOUT_MIN_LINES = int(os.getenv('AI_FANOUT_MIN_LINES', '400'))
+    AI_FANOUT_CONCURRENCY = int(os.getenv('AI_FANOUT_CONCURRENCY', '4'))
+    AI_CHUNK_MAX_CHARS = int(os.getenv('AI_CHUNK_MAX_CHARS', '12000'))
+
+    # Time budget of one request across its Gemini/translator/GitHub calls, kept under gunicorn's
+    # --timeout 120; what does not fit is returned as partial. 0 disables the deadline
+    REQUEST_DEADLINE = float(os.getenv('REQUEST_DEADLINE', '90'))
+    # A retry is skipped unless its backoff plus this many seconds is left
+    RETRY_MIN_BUDGET = float(os.getenv('RETRY_MIN_BUDGET', '2'))
+    GITHUB_TIMEOUT = float(os.getenv('GITHUB_TIMEOUT', '10'))
+    # Longest single Gemini call (google-generativeai 0.4+), further capped by the request deadline
+    AI_TIMEOUT = float(os.getenv('AI_TIMEOUT', '60'))
+
     @classmethod
     def get_test_config(cls) -> Dict[str, Any]:
         """Return configuration for testing environment"""
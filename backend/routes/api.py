@@ -1,9 +1,20 @@
-from flask import Blueprint, request, jsonify, redirect, session, current_app
+from flask import Blueprint, Response, request, redirect, session, current_app, stream_with_context
 from typing import Dict, Any
+import os
+import base64
+from config import Config
 from services.azure_service import AzureService
 from services.github_service import GitHubService
 from utils.validators import validate_code_input
+from utils.deadline import Deadline
+from utils.json_codec import codec
+from utils.json_response import jsonify
 from services.documentation_generator import DocumentationGenerator
+from services.render_pool import RenderQueueFull, RenderTimeout
+from services.job_manager import JobManager, JobQueueFull
+from services.repository_pipeline import RepositoryPipeline
+from utils.persistent_cache import PersistentCache
+from utils.file_index import FileIndex
 from services.translator import TranslatorService
 from utils.middleware import RateLimiter, rate_limit, require_auth
 import logging
@@ -15,6 +26,40 @@ github = GitHubService(validate_on_init=False)
 doc_generator = DocumentationGenerator()
 translator = TranslatorService()
 rate_limiter = RateLimiter(requests_per_minute=60)
+pipeline = RepositoryPipeline(
+    github.scan_repository_files,
+    workers=Config.PIPELINE_WORKERS,
+    batch_size=Config.PIPELINE_BATCH_SIZE,
+    max_file_bytes=Config.PIPELINE_MAX_FILE_BYTES,
+    index=FileIndex(Config.FILE_INDEX_PATH) if Config.FILE_INDEX_ENABLED else None
+)
+jobs = JobManager(
+    PersistentCache(Config.JOBS_STORE_PATH, max_bytes=Config.JOBS_STORE_MAX_BYTES),
+    max_concurrent=Config.JOBS_MAX_CONCURRENT,
+    max_pending=Config.JOBS_MAX_PENDING,
+    ttl=Config.JOBS_TTL
+)
+
+EXPORT_MIMETYPES = {
+    'markdown': 'text/markdown; charset=utf-8',
+    'html': 'text/html; charset=utf-8',
+    'json': 'application/json',
+    'pdf': 'application/pdf',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+}
+
+def _deadline() -> Deadline:
+    """This request's time budget for outbound calls (REQUEST_DEADLINE; 0 means none)"""
+    return Deadline(Config.REQUEST_DEADLINE or None)
+
+def _stream_export(doc, export_format: str = 'markdown', template: str = 'default') -> Response:
+    """Send an export as a chunked response, written out as it is produced"""
+    chunks = doc_generator.export_stream(doc, format=export_format, template=template)
+    return Response(
+        stream_with_context(chunks),
+        mimetype=EXPORT_MIMETYPES.get(export_format, 'application/octet-stream'),
+        headers={'X-Accel-Buffering': 'no'}
+    )
 
 @api.route('/analyze', methods=['POST'])
 @rate_limit(rate_limiter)
@@ -65,10 +110,106 @@ def documentation():
                 'required_fields': ['code', 'language']
             }), 400
 
-        result = doc_generator.generate(data['code'], data['language'])
+        deadline = _deadline()
+        result = doc_generator.generate(data['code'], data['language'], deadline=deadline)
         return jsonify({
             'status': 'success',
-            'documentation': result.__dict__ if hasattr(result, '__dict__') else result
+            'documentation': result.to_dict(),
+            'partial': deadline.cut_short
+        })
+    except ValueError as e:
+        return jsonify({
+            'status': 'error',
+            'error': str(e)
+        }), 400
+    except Exception as e:
+        return jsonify({
+            'status': 'error',
+            'error': str(e)
+        }), 500
+
+@api.route('/analyze/documentation/generate/stream', methods=['POST'])
+@rate_limit(rate_limiter)
+def stream_documentation():
+    """Server-sent events: code blocks and metrics first, then each AI section as it arrives"""
+    if not request.is_json:
+        return jsonify({'error': 'Content-Type must be application/json'}), 400
+
+    try:
+        data = request.get_json()
+        if not validate_code_input(data):
+            return jsonify({
+                'error': 'Invalid input format',
+                'required_fields': ['code', 'language']
+            }), 400
+
+        fan_out = data.get('fan_out')
+        if fan_out is not None and not isinstance(fan_out, bool):
+            raise ValueError("fan_out must be a boolean")
+        events = doc_generator.generate_stream(
+            data['code'],
+            data['language'],
+            title=data.get('title'),
+            description=data.get('description'),
+            fan_out=fan_out,
+            deadline=_deadline()
+        )
+    except ValueError as e:
+        return jsonify({'status': 'error', 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'status': 'error', 'error': str(e)}), 500
+
+    def event_stream():
+        try:
+            for event, payload in events:
+                yield f"event: {event}\ndata: {codec.dumps_str(payload)}\n\n"
+        except Exception as e:
+            logging.exception("Documentation stream failed")
+            yield f"event: error\ndata: {codec.dumps_str({'error': str(e)})}\n\n"
+
+    return Response(
+        stream_with_context(event_stream()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@api.route('/analyze/documentation/incremental', methods=['POST'])
+@rate_limit(rate_limiter)
+def incremental_documentation():
+    """Re-generate documentation, reusing what is unchanged since a previous result"""
+    if not request.is_json:
+        return jsonify({'error': 'Content-Type must be application/json'}), 400
+
+    try:
+        data = request.get_json()
+        if not validate_code_input(data):
+            return jsonify({
+                'error': 'Invalid input format',
+                'required_fields': ['code', 'language']
+            }), 400
+
+        previous_id = data.get('previous_id')
+        if previous_id is not None and not isinstance(previous_id, str):
+            raise ValueError("previous_id must be a string")
+        block_hashes = data.get('block_hashes')
+        if block_hashes is not None and not (
+                isinstance(block_hashes, list) and all(isinstance(h, str) for h in block_hashes)):
+            raise ValueError("block_hashes must be a list of strings")
+
+        deadline = _deadline()
+        doc = doc_generator.generate(
+            data['code'],
+            data['language'],
+            title=data.get('title'),
+            description=data.get('description'),
+            previous=previous_id,
+            block_hashes=block_hashes,
+            deadline=deadline
+        )
+        return jsonify({
+            'status': 'success',
+            'documentation': doc.to_dict(),
+            'partial': deadline.cut_short
         })
     except ValueError as e:
         return jsonify({
@@ -97,13 +238,21 @@ def generate_documentation():
 
         template = data.get('template', 'default')
         export_format = data.get('format', 'markdown')
+        fan_out = data.get('fan_out')
+        if fan_out is not None and not isinstance(fan_out, bool):
+            raise ValueError("fan_out must be a boolean")
         
+        deadline = _deadline()
         doc = doc_generator.generate(
             data['code'],
             data['language'],
             title=data.get('title'),
-            description=data.get('description')
+            description=data.get('description'),
+            fan_out=fan_out,
+            deadline=deadline
         )
+        if data.get('stream'):
+            return _stream_export(doc, export_format, template)
         
         result = doc_generator.export_documentation(
             doc,
@@ -115,12 +264,17 @@ def generate_documentation():
             'status': 'success',
             'documentation': result,
             'format': export_format,
-            'template': template
+            'template': template,
+            'partial': deadline.cut_short
         })
     except ValueError as e:
         return jsonify({'status': 'error', 'error': str(e)}), 400
     except NotImplementedError as e:
         return jsonify({'status': 'error', 'error': str(e)}), 501
+    except RenderQueueFull as e:
+        return jsonify({'status': 'error', 'error': str(e)}), 503, {'Retry-After': '5'}
+    except RenderTimeout as e:
+        return jsonify({'status': 'error', 'error': str(e)}), 504
     except Exception as e:
         logging.error(f"Documentation generation failed: {str(e)}")
         return jsonify({'status': 'error', 'error': 'Internal server error'}), 500
@@ -144,13 +298,13 @@ def translate():
         return jsonify({'error': 'Invalid or missing target_language field'}), 400
     
     try:
-        translation_result = translator.translate(text, target_language)
+        translation_result = translator.translate(text, target_language, deadline=_deadline())
         
         if 'error' in translation_result:
             return jsonify({
                 'status': 'error',
                 'error': translation_result['error']
-            }), 500
+            }), 504 if translation_result.get('skipped') else 500
 
         return jsonify({
             'status': 'success',
@@ -187,10 +341,12 @@ def batch_translate():
         return jsonify({'error': 'Invalid or missing target_language field'}), 400
 
     try:
-        translations = translator.batch_translate(texts, target_language)
+        deadline = _deadline()
+        translations = translator.batch_translate(texts, target_language, deadline=deadline)
         return jsonify({
             'status': 'success',
-            'translations': translations
+            'translations': translations,
+            'partial': deadline.cut_short
         }), 200
     except Exception as e:
         logging.error(f"Batch translation failed: {str(e)}")
@@ -235,8 +391,11 @@ def github_info(owner, repo):
     try:
         if not github.token:
             return jsonify({'error': 'GitHub token not configured'}), 401
-        result = github.get_repository_info(owner, repo)
+        deadline = _deadline()
+        result = github.get_repository_info(owner, repo, deadline)
         if 'error' in result:
+            if deadline.cut_short:
+                return jsonify(result), 504
             return jsonify(result), 401 if 'credentials' in result.get('error', '') else 500
         return jsonify({"repo": f"{owner}/{repo}", "info": result})
     except Exception as e:
@@ -247,13 +406,22 @@ def github_info(owner, repo):
 def analyze_repository(owner: str, repo: str):
     """Get detailed repository analysis"""
     try:
-        analysis = github.analyze_repository(owner, repo)
+        deadline = _deadline()
+        analysis = github.analyze_repository(owner, repo, deadline)
         if 'error' in analysis:
-            return jsonify(analysis), 500
+            return jsonify(analysis), 504 if deadline.cut_short else 500
         return jsonify(analysis)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _batch_process(repositories) -> Dict[str, Any]:
+    """Analyze ``repositories`` within one deadline; ``partial`` when any of them was cut short"""
+    deadline = _deadline()
+    results = github.batch_process_repositories(repositories, deadline)
+    results['partial'] = deadline.cut_short or any(
+        result.get('partial') for result in results['results'].values())
+    return results
+
 @api.route('/github/batch', methods=['POST'])
 @rate_limit(rate_limiter)
 @require_auth
@@ -264,8 +432,7 @@ def batch_analyze_repositories():
         if not data or 'repositories' not in data:
             return jsonify({'error': 'repositories list is required'}), 400
             
-        results = github.batch_process_repositories(data['repositories'])
-        return jsonify(results)
+        return jsonify(_batch_process(data['repositories']))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -298,8 +465,11 @@ def scan_repository():
             return jsonify({'error': 'repo_path is required'}), 400
         
         repo_path = data['repo_path']
-        files = github.scan_repository(repo_path)
-        return jsonify({'files': files})
+        scanned = github.scan_repository_files(repo_path)
+        return jsonify({
+            'files': [entry.path for entry in scanned],
+            'entries': [entry.to_dict() for entry in scanned]
+        })
     except Exception as e:
         logging.error(f"Repository scan failed: {str(e)}")
         return jsonify({'error': str(e)}), 500
@@ -312,7 +482,7 @@ def save_documentation():
         if not all(k in data for k in ['code', 'language', 'output_path']):
             return jsonify({'error': 'Missing required fields'}), 400
             
-        doc = doc_generator.generate(data['code'], data['language'])
+        doc = doc_generator.generate(data['code'], data['language'], deadline=_deadline())
         doc_generator.save_documentation(doc, data['output_path'])
         return jsonify({'status': 'success'})
     except Exception as e:
@@ -323,11 +493,206 @@ def save_documentation():
 def export_documentation_markdown():  # Changed function name from export_markdown to export_documentation_markdown
     try:
         data = request.get_json()
-        if not all(k in data for k in ['code', 'language', 'output_path']):
+        if not all(k in data for k in ['code', 'language']):
             return jsonify({'error': 'Missing required fields'}), 400
             
-        doc = doc_generator.generate(data['code'], data['language'])
+        doc = doc_generator.generate(data['code'], data['language'], deadline=_deadline())
+        if not data.get('output_path'):
+            # No file to write: stream the markdown back instead
+            return _stream_export(doc, 'markdown', data.get('template', 'default'))
         doc_generator.export_to_markdown(doc, data['output_path'])
         return jsonify({'status': 'success'})
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+@api.route('/cache/stats', methods=['GET'])
+def cache_stats():
+    """Hit/miss counters for the in-process documentation caches"""
+    return jsonify({
+        'status': 'success',
+        'caches': {
+            'documentation': doc_generator.result_cache.stats(),
+            'ai_responses': doc_generator.ai_cache.stats() if doc_generator.ai_cache else None,
+            'exports': doc_generator.export_cache.stats() if doc_generator.export_cache else None,
+            'highlighting': doc_generator.highlight_cache.stats(),
+            'file_index': pipeline.index.stats() if pipeline.index else None
+        },
+        'ai_parsing': doc_generator.ai_parsing_stats()
+    })
+
+@api.route('/export/stats', methods=['GET'])
+def export_stats():
+    """Queue depth and render times of the PDF/DOCX render pool"""
+    return jsonify({
+        'status': 'success',
+        'render_pool': doc_generator.render_pool.stats()
+    })
+
+@api.route('/export/templates', methods=['GET'])
+def export_templates():
+    """Built-in and user export templates (see TEMPLATES_DIR)"""
+    return jsonify({
+        'status': 'success',
+        'templates': doc_generator.templates.describe()
+    })
+
+# Background jobs: the same work as the synchronous endpoints, run off the request thread
+
+def _validate_code_job(params: Dict[str, Any]) -> None:
+    if not validate_code_input(params):
+        raise ValueError("params must include code and language")
+
+def _validate_documentation_job(params: Dict[str, Any]) -> None:
+    _validate_code_job(params)
+    if params.get('format', 'markdown') not in doc_generator.exporters:
+        raise ValueError(f"Invalid format: {params.get('format')}")
+    if params.get('template', 'default') not in doc_generator.templates:
+        raise ValueError(f"Invalid template: {params.get('template')}")
+    if params.get('fan_out') is not None and not isinstance(params['fan_out'], bool):
+        raise ValueError("fan_out must be a boolean")
+
+def _documentation_job(params: Dict[str, Any]) -> Dict[str, Any]:
+    export_format = params.get('format', 'markdown')
+    template = params.get('template', 'default')
+    doc = doc_generator.generate(
+        params['code'],
+        params['language'],
+        title=params.get('title'),
+        description=params.get('description'),
+        fan_out=params.get('fan_out')
+    )
+    content = doc_generator.export_documentation(doc, format=export_format, template=template)
+    result = {'documentation': content, 'format': export_format, 'template': template, 'id': doc.id}
+    if isinstance(content, bytes):
+        result.update(documentation=base64.b64encode(content).decode('ascii'), encoding='base64')
+    return result
+
+def _analyze_job(params: Dict[str, Any]) -> Dict[str, Any]:
+    result = azure_service.analyze_sentiment(params['code'], params['language'])
+    if 'error' in result:
+        raise RuntimeError(result['error'])
+    return result
+
+def _validate_github_batch_job(params: Dict[str, Any]) -> None:
+    repositories = params.get('repositories')
+    if not isinstance(repositories, list) or not all(
+            isinstance(repo, dict) and 'owner' in repo and 'name' in repo for repo in repositories):
+        raise ValueError("repositories must be a list of {owner, name} objects")
+
+jobs.register('documentation', _documentation_job, _validate_documentation_job)
+jobs.register('analyze', _analyze_job, _validate_code_job)
+jobs.register('github_batch', lambda params: _batch_process(params['repositories']), _validate_github_batch_job)
+
+def _confined_path(path: str, root: str, name: str) -> str:
+    """
+    ``path`` resolved against ``root``, symlinks and ``..`` included.
+
+    Raises:
+        ValueError: If the resolved path is outside ``root``
+    """
+    root = os.path.realpath(root)
+    resolved = os.path.realpath(os.path.join(root, path))
+    if os.path.commonpath([root, resolved]) != root:
+        raise ValueError(f"{name} must be inside the configured directory")
+    return resolved
+
+def _repository_paths(params: Dict[str, Any]):
+    """(repo_path, output_dir) of a repository job, confined to the configured roots"""
+    repo_path = _confined_path(params['repo_path'], Config.PIPELINE_REPOSITORY_ROOT, 'repo_path')
+    output_dir = _confined_path(params.get('output_dir') or os.path.basename(repo_path),
+                                Config.PIPELINE_OUTPUT_DIR, 'output_dir')
+    return repo_path, output_dir
+
+def _validate_repository_job(params: Dict[str, Any]) -> None:
+    if not isinstance(params.get('repo_path'), str):
+        raise ValueError("repo_path must be an existing directory")
+    if params.get('output_dir') is not None and not isinstance(params['output_dir'], str):
+        raise ValueError("output_dir must be a string")
+    repo_path, _ = _repository_paths(params)
+    if not os.path.isdir(repo_path):
+        raise ValueError("repo_path must be an existing directory")
+    if params.get('format', 'markdown') not in doc_generator.exporters:
+        raise ValueError(f"Invalid format: {params.get('format')}")
+    if params.get('template', 'default') not in doc_generator.templates:
+        raise ValueError(f"Invalid template: {params.get('template')}")
+    for flag in ('use_ai', 'force'):
+        if not isinstance(params.get(flag, False), bool):
+            raise ValueError(f"{flag} must be a boolean")
+
+def _repository_job(params: Dict[str, Any], report) -> Dict[str, Any]:
+    repo_path, output_dir = _repository_paths(params)
+    return pipeline.run(
+        repo_path,
+        output_dir,
+        format=params.get('format', 'markdown'),
+        template=params.get('template', 'default'),
+        use_ai=params.get('use_ai', False),
+        report=report,
+        force=params.get('force', False)
+    )
+
+jobs.register('repository', _repository_job, _validate_repository_job, reports_progress=True)
+
+# Same rule as the synchronous /github/batch endpoint
+AUTHENTICATED_JOB_TYPES = {'github_batch'}
+
+def _submit_job(job_type: str, params: Dict[str, Any]):
+    try:
+        job = jobs.submit(job_type, params)
+    except ValueError as e:
+        return jsonify({'status': 'error', 'error': str(e)}), 400
+    except JobQueueFull as e:
+        return jsonify({'status': 'error', 'error': str(e)}), 503, {'Retry-After': '5'}
+    return jsonify({'status': 'success', 'job': job}), 202, {'Location': f"/api/jobs/{job['id']}"}
+
+@api.route('/jobs', methods=['POST'])
+@rate_limit(rate_limiter)
+def submit_job():
+    """Queue a documentation, analyze, github_batch or repository job; poll /jobs/<id> for the result"""
+    if not request.is_json:
+        return jsonify({'error': 'Content-Type must be application/json'}), 400
+
+    data = request.get_json() or {}
+    job_type = data.get('type')
+    params = data.get('params', {})
+    if job_type in AUTHENTICATED_JOB_TYPES:
+        return require_auth(_submit_job)(job_type, params)
+    return _submit_job(job_type, params)
+
+@api.route('/scan/document', methods=['POST'])
+@rate_limit(rate_limiter)
+def document_repository():
+    """Scan a repository and document every supported file in the background (a 'repository' job)"""
+    if not request.is_json:
+        return jsonify({'error': 'Content-Type must be application/json'}), 400
+    return _submit_job('repository', request.get_json() or {})
+
+@api.route('/jobs/stats', methods=['GET'])
+def job_stats():
+    """Pending/running counts for the background jobs of this worker"""
+    return jsonify({'status': 'success', 'jobs': jobs.stats()})
+
+@api.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id: str):
+    """Job status and, once finished, its result; ?wait=<seconds> long-polls until it finishes"""
+    try:
+        wait = max(0.0, min(float(request.args.get('wait', 0)), Config.JOBS_MAX_WAIT))
+    except ValueError:
+        return jsonify({'status': 'error', 'error': 'wait must be a number of seconds'}), 400
+
+    job = jobs.get(job_id, wait=wait)
+    if job is None:
+        return jsonify({'status': 'error', 'error': 'Job not found or expired'}), 404
+    return jsonify({'status': 'success', 'job': job})
+
+@api.route('/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id: str):
+    """The job's result alone: 200 when succeeded, 202 while pending, 500 if it failed"""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'error': 'Job not found or expired'}), 404
+    if job['status'] == 'succeeded':
+        return jsonify(job['result'])
+    if job['status'] == 'failed':
+        return jsonify({'status': 'error', 'error': job['error']}), 500
+    return jsonify({'status': 'pending', 'job': job}), 202
@@ -17,6 +17,7 @@ except ImportError:
 
 # Change relative import to absolute
 from routes import api
+from utils.json_response import JsonRequest
 
 # Initialize limiter globally
 limiter = Limiter(
@@ -31,6 +32,8 @@ def create_app(testing=False):
     load_dotenv(os.path.join(os.path.dirname(__file__), '.env'))
     
     app = Flask(__name__)
+    # JSON bodies are parsed with the same codec the API responds with
+    app.request_class = JsonRequest
     CORS(app)
     
     # Configure security settings
@@ -1,10 +1,25 @@
 # backend/services/__init__.py
-from .sentiment_service import SentimentService
-from .code_analyzer import CodeAnalyzer
-from .github_service import GitHubService
-from .translator import TranslatorService
+import importlib
 
-# Backwards compatibility
-from .sentiment_service import SentimentService as AzureService
+# Submodules are imported on first attribute access, so importing one service
+# (e.g. services.documentation_generator) does not load every other backend.
+_EXPORTS = {
+    'SentimentService': 'sentiment_service',
+    'CodeAnalyzer': 'code_analyzer',
+    'GitHubService': 'github_service',
+    'TranslatorService': 'translator',
+    # Backwards compatibility
+    'AzureService': 'sentiment_service',
+}
 
-__all__ = ['SentimentService', 'AzureService', 'CodeAnalyzer', 'GitHubService', 'TranslatorService']
\ No newline at end of file
+__all__ = ['SentimentService', 'AzureService', 'CodeAnalyzer', 'GitHubService', 'TranslatorService']
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__),
+                    'SentimentService' if name == 'AzureService' else name)
+    globals()[name] = value
+    return value
@@ -1,56 +1,231 @@
 import re
+import ast
+import bisect
+import html
 import json
+import codecs
+import copy
+import difflib
 import logging
+import textwrap
 import datetime
-from io import BytesIO
-from typing import List, Dict, Any, Literal, Optional, Union
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, Literal, Optional, Tuple, Union
 from dataclasses import dataclass, field
 import os
 
-# Remove pdfkit import
-from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Preformatted
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from docx import Document
-from pygments import lex
-from pygments.lexers import get_lexer_by_name
+from config import Config
+from utils.cache_manager import LRUCache, content_hash
+from utils.persistent_cache import PersistentCache
+from utils.artifact_cache import ArtifactCache
+from utils.json_codec import codec
+from utils.json_repair import repair_json
+from utils.deadline import Deadline
+from utils.json_stream import JsonSectionStream
+from utils.markdown_html import markdown_to_html
+from utils.optional_imports import module_available
+from services.render_pool import RenderPool
+from services.templates import TemplateRegistry
+from services.parsers import (
+    ParsedBraces, ParsedPython, SourceStats, SpanStats,
+    cyclomatic_complexity, parse_braces, parse_python, pygments_lexer, scan_source
+)
 
-try:
+# Exporter (reportlab, python-docx, pygments), metrics (radon) and AI (google.generativeai)
+# backends are imported where they are first used; only their presence is checked here.
+GEMINI_AVAILABLE = module_available(
+    'google.generativeai',
+    "Google Generative AI package not found. AI-enhanced documentation will be disabled."
+)
+RADON_AVAILABLE = module_available('radon', "radon package not found. Advanced metrics will be limited.")
+PYGMENTS_AVAILABLE = module_available(
+    'pygments', "pygments package not found. HTML exports will not be syntax highlighted."
+)
+
+# Response schema for structured-output mode; one schema serves every prompt, which
+# asks for a subset of these keys
+AI_RESPONSE_SCHEMA = {
+    'type': 'OBJECT',
+    'properties': {
+        **{key: {'type': 'STRING'} for key in ('title', 'overview', 'purpose', 'returns')},
+        **{key: {
+            'type': 'ARRAY',
+            'items': {
+                'type': 'OBJECT',
+                'properties': {'name': {'type': 'STRING'}, 'description': {'type': 'STRING'}}
+            }
+        } for key in ('components', 'parameters')},
+        'examples': {
+            'type': 'ARRAY',
+            'items': {
+                'type': 'OBJECT',
+                'properties': {'description': {'type': 'STRING'}, 'code': {'type': 'STRING'}}
+            }
+        },
+        **{key: {'type': 'ARRAY', 'items': {'type': 'STRING'}} for key in ('best_practices', 'notes')}
+    }
+}
+
+# Gemini replies often hold raw newlines inside strings; strict=False accepts them
+_AI_JSON_DECODER = json.JSONDecoder(strict=False)
+
+@lru_cache(maxsize=None)
+def _genai_version() -> Tuple[int, ...]:
+    """Installed google-generativeai (major, minor), from package metadata so the SDK is not imported."""
+    from importlib.metadata import PackageNotFoundError, version
+    try:
+        return tuple(int(part) for part in re.findall(r'\d+', version('google-generativeai'))[:2])
+    except PackageNotFoundError:
+        return ()
+
+@lru_cache(maxsize=None)
+def _structured_output_supported() -> bool:
+    """Whether the installed Gemini SDK takes ``response_schema`` (0.6+)."""
+    if _genai_version() < (0, 6):
+        logging.warning("google-generativeai < 0.6 has no response_schema; AI replies are parsed leniently instead")
+        return False
+    return True
+
+@lru_cache(maxsize=None)
+def _load_genai():
+    """Import and configure the Gemini SDK once, on the first AI request."""
     import google.generativeai as genai
-    GEMINI_AVAILABLE = True
     # Configure Gemini API
     gemini_api_key = os.getenv('GEMINI_API_KEY', '')
     if gemini_api_key:
         genai.configure(api_key=gemini_api_key)
-except ImportError:
-    GEMINI_AVAILABLE = False
-    logging.warning("Google Generative AI package not found. AI-enhanced documentation will be disabled.")
-
-try:
-    import radon.metrics
-    import radon.complexity
-    from radon.visitors import ComplexityVisitor
-    RADON_AVAILABLE = True
-except ImportError:
-    RADON_AVAILABLE = False
-    logging.warning("radon package not found. Advanced metrics will be limited.")
-
-@dataclass
+    return genai
+
+@lru_cache(maxsize=None)
+def _pygments_formatter():
+    from pygments.formatters import HtmlFormatter
+    return HtmlFormatter(nowrap=True)
+
+@lru_cache(maxsize=None)
+def _highlight_css() -> str:
+    return _pygments_formatter().get_style_defs('.code-block pre') if PYGMENTS_AVAILABLE else ''
+
+_HTML_STYLE = """
+body { font-family: -apple-system, 'Segoe UI', Helvetica, Arial, sans-serif; max-width: 960px; margin: 2em auto; padding: 0 1em; color: #24292f; }
+.generated-at { color: #57606a; font-style: italic; }
+.toc ol { padding-left: 1.5em; }
+.metrics-table { border-collapse: collapse; }
+.metrics-table th, .metrics-table td { border: 1px solid #d0d7de; padding: 4px 10px; text-align: left; }
+.code-block { border: 1px solid #d0d7de; border-radius: 6px; margin: 1em 0; overflow: hidden; }
+.code-block-header { background: #f6f8fa; border-bottom: 1px solid #d0d7de; padding: 4px 10px; font-size: 0.85em; color: #57606a; }
+.code-block pre { margin: 0; padding: 10px; overflow-x: auto; background: #fff; }
+.analysis { color: #57606a; font-size: 0.9em; }
+"""
+
 class CodeBlock:
-    content: str
-    language: str
-    line_number: int
+    """
+    One top-level declaration of a source file.
+
+    The text is not copied out of the file: a block keeps the shared ``source``
+    string and its ``[start, end)`` offsets, and ``content`` slices it on access.
+    Parsers build blocks with ``from_source``; ``char_count``, ``line_count``
+    and ``first_line`` answer the common questions without materializing the
+    text. Passing ``content`` makes a block that owns its text.
+    """
+
+    __slots__ = ('source', 'start', 'end', 'language', 'line_number', 'end_line', 'name', 'kind',
+                 'decorators', 'complexity', 'metrics', 'hash')
+
+    def __init__(self, content: Optional[str], language: str, line_number: int, end_line: Optional[int] = None,
+                 name: Optional[str] = None, kind: Optional[str] = None, decorators: Optional[List[str]] = None,
+                 complexity: Optional[int] = None, metrics: Optional[Dict[str, Any]] = None,
+                 hash: Optional[str] = None, *, source: Optional[str] = None, start: int = 0,
+                 end: Optional[int] = None):
+        if source is None:
+            if content is None:
+                raise TypeError("CodeBlock needs content or source")
+            source, start, end = content, 0, len(content)
+        self.source = source
+        self.start = start
+        self.end = len(source) if end is None else end
+        self.language = language
+        self.line_number = line_number
+        self.end_line = end_line
+        self.name = name
+        self.kind = kind
+        self.decorators = decorators if decorators is not None else []
+        self.complexity = complexity
+        self.metrics = metrics if metrics is not None else {}
+        self.hash = hash
+
+    @classmethod
+    def from_source(cls, source: str, start: int, end: int, language: str, line_number: int,
+                    **fields: Any) -> 'CodeBlock':
+        return cls(None, language, line_number, source=source, start=start, end=end, **fields)
+
+    @property
+    def content(self) -> str:
+        if self.start == 0 and self.end == len(self.source):
+            return self.source
+        return self.source[self.start:self.end]
+
+    @content.setter
+    def content(self, value: str) -> None:
+        self.source, self.start, self.end = value, 0, len(value)
+
+    @property
+    def char_count(self) -> int:
+        return self.end - self.start
+
+    @property
+    def line_count(self) -> int:
+        return self.source.count('\n', self.start, self.end) + 1
+
+    @property
+    def first_line(self) -> str:
+        newline = self.source.find('\n', self.start, self.end)
+        return self.source[self.start:self.end if newline == -1 else newline]
+
+    def _key(self) -> tuple:
+        return (self.content, self.language, self.line_number, self.end_line, self.name, self.kind,
+                self.decorators, self.complexity, self.metrics, self.hash)
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._key() == other._key()
 
-@dataclass
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (f"CodeBlock(language={self.language!r}, line_number={self.line_number}, "
+                f"end_line={self.end_line}, name={self.name!r}, kind={self.kind!r}, chars={self.char_count})")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'content': self.content,
+            'language': self.language,
+            'line_number': self.line_number,
+            'end_line': self.end_line,
+            'name': self.name,
+            'kind': self.kind,
+            'complexity': self.complexity,
+            'metrics': self.metrics,
+            'hash': self.hash
+        }
+
+@dataclass(slots=True)
 class Documentation:
     """Documentation model class"""
-    title: str 
-    description: str 
+    title: str
+    description: str
     code_blocks: List[CodeBlock]
     language: str
     generated_at: str
     metrics: Dict[str, Any] = field(default_factory=dict)
+    # Set by DocumentationGenerator.generate(); ``id`` is what incremental runs refer back to
+    id: Optional[str] = None
+    outline_hash: Optional[str] = None
+    incremental: Optional[Dict[str, Any]] = None
+    ai_enhanced: Optional[Dict[str, Any]] = None
 
     def __init__(self, title: str, description: str, language: str, code_blocks: List[CodeBlock], metrics: Dict[str, Any]):
         self.title = title
@@ -59,24 +234,54 @@ class Documentation:
         self.code_blocks = code_blocks
         self.metrics = metrics
         self.generated_at = datetime.datetime.now().isoformat()
+        self.id = None
+        self.outline_hash = None
+        self.incremental = None
+        self.ai_enhanced = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert Documentation to dictionary"""
         return {
             'title': self.title,
             'description': self.description,
-            'code_blocks': [
-                {
-                    'content': block.content,
-                    'language': block.language,
-                    'line_number': block.line_number
-                } for block in self.code_blocks
-            ],
+            'code_blocks': [block.to_dict() for block in self.code_blocks],
             'language': self.language,
             'generated_at': self.generated_at,
-            'metrics': self.metrics
+            'metrics': self.metrics,
+            'id': self.id,
+            'incremental': self.incremental,
+            'ai_enhanced': self.ai_enhanced
         }
 
+_BINARY_FORMATS = ('pdf', 'docx')
+
+_PYTHON_DEFINITION = re.compile(r'^[^\S\n]*(?:def|class) ', re.MULTILINE)
+# parse_cache entry for Python source that does not parse, so it is not re-parsed per stage
+_UNPARSABLE = object()
+
+def _line_offsets(code: str) -> List[int]:
+    """Start offset of every line of ``code`` (line ``n`` starts at ``offsets[n - 1]``)."""
+    offsets = [0]
+    newline = code.find('\n')
+    while newline != -1:
+        offsets.append(newline + 1)
+        newline = code.find('\n', newline + 1)
+    return offsets
+
+def _line_span(code: str, offsets: List[int], first: int, last: int) -> Tuple[int, int]:
+    """``[start, end)`` of lines ``first``..``last`` (1-based, inclusive), without the final newline."""
+    end = offsets[last] - 1 if last < len(offsets) else len(code)
+    return offsets[first - 1], end
+
+def _documentation_size(doc: Documentation) -> int:
+    """Rough in-memory footprint of a Documentation, used for the result cache byte budget."""
+    size = len(doc.title or '') + len(doc.description or '')
+    size += sum(block.char_count + 64 for block in doc.code_blocks)
+    ai_doc = getattr(doc, 'ai_enhanced', None)
+    if ai_doc:
+        size += len(json.dumps(ai_doc, default=str))
+    return size + 512
+
 class DocumentationGenerator:
     def __init__(self, use_ai=True):
         # Add RADON_AVAILABLE as class attribute
@@ -90,56 +295,106 @@ class DocumentationGenerator:
             'pdf': self._export_pdf,
             'docx': self._export_docx
         }
+        # Formats export_stream produces piece by piece rather than rendered whole
+        self.streamers = {
+            'markdown': self._iter_markdown,
+            'html': self._iter_html
+        }
         self.supported_languages = {
             'python': self._parse_python,
             'javascript': self._parse_javascript,
-            'typescript': self._parse_javascript,
+            'typescript': self._parse_typescript,
             'java': self._parse_java,
             'cpp': self._parse_cpp,
             'csharp': self._parse_csharp
         }
-        self.templates = {
-            'default': {
-                'title': '# {title}',
-                'description': '{description}',
-                'code_blocks': '## Code\n```{language}\n{content}\n```',
-                'metrics': '## Metrics\n{metrics}'
-            },
-            'detailed': {
-                'title': '# {title}\n\n_Generated at: {generated_at}_',
-                'description': '## Overview\n\n{description}',
-                'code_blocks': '## Code Blocks\n\n### Block at line {line_number}\n```{language}\n{content}\n```\n\n**Analysis:**\n- Lines of code: {loc}\n- Complexity: {complexity}',
-                'metrics': '## Project Metrics\n\n```json\n{metrics}\n```',
-                'toc': '## Table of Contents\n\n{toc}'
-            }
-        }
+        # Export templates, compiled once; user templates are <name>.json files in TEMPLATES_DIR
+        self.templates = TemplateRegistry()
+        if Config.TEMPLATES_DIR:
+            self.templates.load_directory(Config.TEMPLATES_DIR)
         self.supported_formats = {
             'markdown': self._export_markdown,
             'html': self._export_html,
             'json': self._export_json
         }
         self.logger = logging.getLogger(__name__)
-        
-        # Initialize Gemini model if available
-        if self.use_ai:
-            try:
-                self.gemini_model = genai.GenerativeModel('gemini-2.5-flash-lite')
-                self.logger.info("Gemini AI initialized for enhanced documentation")
-            except Exception as e:
-                self.logger.warning(f"Failed to initialize Gemini: {e}")
-                self.use_ai = False
+        self.model_name = 'gemini-2.5-flash-lite'
+        self.generation_config = {
+            'temperature': 0.7,
+            'top_p': 0.95,
+            'top_k': 40,
+            'max_output_tokens': 2048,
+        }
+        if Config.AI_STRUCTURED_OUTPUT and _structured_output_supported():
+            # Schema-constrained JSON, so replies parse without repair
+            self.generation_config.update(response_mime_type='application/json', response_schema=AI_RESPONSE_SCHEMA)
+        # How Gemini replies parsed: as JSON, after repair, or not at all (kept as plain text)
+        self.ai_parsing = {'parsed': 0, 'repaired': 0, 'failed': 0, 'repair_ms': 0.0}
+        self._ai_parsing_lock = threading.Lock()
 
-    def _generate_ai_documentation(self, code: str, language: str) -> Dict[str, str]:
-        """Generate professional documentation using Gemini AI with retry logic"""
-        if not self.use_ai:
-            return None
-            
-        max_retries = 2
-        retry_delay = 1
-        
-        for attempt in range(max_retries):
-            try:
-                prompt = f"""You are a technical documentation expert. Analyze the following {language} code and generate comprehensive, professional documentation.
+        # Identical generate() calls are served from here instead of re-parsing / re-prompting
+        self.result_cache = LRUCache(
+            max_entries=Config.DOC_CACHE_MAX_ENTRIES,
+            max_bytes=Config.DOC_CACHE_MAX_BYTES,
+            ttl=Config.DOC_CACHE_TTL,
+            sizeof=_documentation_size
+        )
+        # Syntax trees keyed by source hash, so one parse serves blocks, metrics and exports
+        self.parse_cache = LRUCache(max_entries=32, ttl=Config.DOC_CACHE_TTL)
+        # Per-block metrics keyed by block hash, so unchanged blocks are not re-measured
+        self.metrics_cache = LRUCache(max_entries=4096, ttl=Config.DOC_CACHE_TTL)
+        # Parsed Gemini responses, persisted across worker restarts
+        self.ai_cache = PersistentCache(
+            Config.AI_CACHE_PATH,
+            max_bytes=Config.AI_CACHE_MAX_BYTES,
+            ttl=Config.AI_CACHE_TTL
+        ) if Config.AI_CACHE_ENABLED else None
+        # Rendered exports, so repeat exports of the same document are served as stored bytes
+        self.export_cache = ArtifactCache(
+            Config.EXPORT_CACHE_DIR,
+            max_bytes=Config.EXPORT_CACHE_MAX_BYTES,
+            max_entries=Config.EXPORT_CACHE_MAX_ENTRIES
+        ) if Config.EXPORT_CACHE_ENABLED else None
+        # Pygments output per block content + lexer, so a re-export only highlights changed blocks
+        self.highlight_cache = LRUCache(
+            max_entries=Config.HIGHLIGHT_CACHE_MAX_ENTRIES,
+            max_bytes=Config.HIGHLIGHT_CACHE_MAX_BYTES,
+            ttl=Config.DOC_CACHE_TTL,
+            sizeof=len
+        )
+        # PDF/DOCX rendering runs in worker processes so it cannot block request threads
+        self.render_pool = RenderPool(
+            workers=Config.RENDER_POOL_WORKERS,
+            max_queue=Config.RENDER_QUEUE_MAX,
+            timeout=Config.RENDER_TIMEOUT
+        )
+
+        # The Gemini model is created on first use (see gemini_model)
+        self._gemini_model = None
+        self._gemini_lock = threading.Lock()
+
+    @property
+    def gemini_model(self):
+        """Gemini model, created on the first AI request so worker boot skips the SDK import."""
+        if self._gemini_model is None:
+            with self._gemini_lock:
+                if self._gemini_model is None:
+                    try:
+                        self._gemini_model = _load_genai().GenerativeModel(self.model_name)
+                        self.logger.info("Gemini AI initialized for enhanced documentation")
+                    except Exception as e:
+                        self.logger.warning(f"Failed to initialize Gemini: {e}")
+                        self.use_ai = False
+                        raise
+        return self._gemini_model
+
+    @gemini_model.setter
+    def gemini_model(self, model) -> None:
+        self._gemini_model = model
+
+    def _build_ai_prompt(self, code: str, language: str) -> str:
+        """Build the Gemini documentation prompt for a piece of code"""
+        return f"""You are a technical documentation expert. Analyze the following {language} code and generate comprehensive, professional documentation.
 
 Code:
 ```{language}
@@ -162,177 +417,413 @@ Do NOT wrap the JSON in markdown code blocks. Return only the raw JSON.
 Keep string values concise - use \\n for line breaks within strings instead of actual newlines. Do NOT use actual newlines inside JSON string values.
 Make it professional, clear, and detailed like official library documentation."""
 
-                # Configure generation parameters
-                generation_config = {
-                    'temperature': 0.7,
-                    'top_p': 0.95,
-                    'top_k': 40,
-                    'max_output_tokens': 2048,
-                }
-                
+    def _build_ai_summary_prompt(self, outline: str, language: str) -> str:
+        """Build the file-level prompt used by fan-out mode (title, overview, purpose)"""
+        return f"""You are a technical documentation expert. Below is the outline of a {language} file: its top-level code and the declaration of every class, function and method, with bodies omitted.
+
+Outline:
+```{language}
+{outline}
+```
+
+Generate documentation with the following sections. Each section MUST be concise (no more than 5 lines per section).
+1. **Title**: A clear, concise title for this code module
+2. **Overview**: A brief summary (2-3 sentences) of what this code does
+3. **Purpose**: Detailed explanation of the purpose and use case
+
+IMPORTANT: Format the response as a valid JSON object with these keys: title, overview, purpose.
+Do NOT wrap the JSON in markdown code blocks. Return only the raw JSON.
+Keep string values concise - use \\n for line breaks within strings instead of actual newlines. Do NOT use actual newlines inside JSON string values."""
+
+    def _build_ai_chunk_prompt(self, chunk: str, language: str) -> str:
+        """Build the per-chunk prompt used by fan-out mode (everything but the file summary)"""
+        return f"""You are a technical documentation expert. The following {language} code is an excerpt from a larger file. Document the classes, functions and methods it contains.
+
+Code:
+```{language}
+{chunk}
+```
+
+Generate documentation with the following sections. Each section MUST be concise (no more than 5 lines per section, no more than 10 items per list, no deeply nested objects).
+1. **Components**: List and explain each class, function or method in this excerpt (max 10 items)
+2. **Parameters/Attributes**: Document their parameters and attributes (max 10 items)
+3. **Return Values**: Explain what is returned (if applicable)
+4. **Usage Examples**: Provide practical usage examples (max 2 examples)
+5. **Best Practices**: Recommendations for using this code (max 3 items)
+6. **Notes**: Any important caveats or warnings (max 3 items)
+
+IMPORTANT: Format the response as a valid JSON object with these keys: components, parameters, returns, examples, best_practices, notes.
+Do NOT wrap the JSON in markdown code blocks. Return only the raw JSON.
+Keep string values concise - use \\n for line breaks within strings instead of actual newlines. Do NOT use actual newlines inside JSON string values."""
+
+    def _generate_ai_documentation(self, code: str, language: str,
+                                   deadline: Optional[Deadline] = None) -> Dict[str, str]:
+        """Generate professional documentation using Gemini AI with retry logic"""
+        if not self.use_ai:
+            return None
+        return self._request_ai_json(self._build_ai_prompt(code, language), deadline)
+
+    def _generate_ai_documentation_fanout(self, code: str, language: str, code_blocks: List[CodeBlock],
+                                          deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
+        """
+        Document a large file as one outline prompt plus one prompt per chunk of blocks.
+
+        The prompts run concurrently (at most ``AI_FANOUT_CONCURRENCY`` at a time), so wall
+        time follows the slowest chunk rather than the file size. Each prompt is cached on its
+        own, so after an edit only the chunk holding the changed block goes back to Gemini.
+        The result is marked ``partial`` when some prompt failed or ran out of ``deadline``.
+        """
+        if not self.use_ai:
+            return None
+
+        headers, outside = self._outline(code, language, code_blocks)
+        outline = '\n'.join(outside + headers)[:Config.AI_CHUNK_MAX_CHARS]
+        prompts = [self._build_ai_summary_prompt(outline, language)]
+        prompts.extend(
+            self._build_ai_chunk_prompt('\n\n'.join(block.content for block in chunk), language)
+            for chunk in self._chunk_blocks(code_blocks)
+        )
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(prompts)
+        with ThreadPoolExecutor(max_workers=max(1, min(Config.AI_FANOUT_CONCURRENCY, len(prompts)))) as executor:
+            futures = {executor.submit(self._request_ai_json, prompt, deadline): i for i, prompt in enumerate(prompts)}
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
+
+        if not any(results):
+            return None
+        merged = self._merge_ai_sections(results[0], results[1:])
+        if not all(results):
+            self.logger.warning(f"{results.count(None)} of {len(prompts)} AI prompts failed; documentation is partial")
+            merged['partial'] = True
+        return merged
+
+    def _chunk_blocks(self, code_blocks: List[CodeBlock]) -> List[List[CodeBlock]]:
+        """
+        Pack blocks into prompt-sized chunks, in source order.
+
+        Once a chunk holds a quarter of ``AI_CHUNK_MAX_CHARS`` it also ends after any block
+        whose hash ends in 0-3. Boundaries then follow block content rather than position, so
+        growing one block does not shift every later chunk and invalidate its cached response.
+        """
+        limit = Config.AI_CHUNK_MAX_CHARS
+        chunks: List[List[CodeBlock]] = []
+        current: List[CodeBlock] = []
+        size = 0
+        for block in code_blocks:
+            if current and size + block.char_count > limit:
+                chunks.append(current)
+                current, size = [], 0
+            current.append(block)
+            size += block.char_count
+            if size >= limit // 4 and block.hash and block.hash[-1] in '0123':
+                chunks.append(current)
+                current, size = [], 0
+        if current:
+            chunks.append(current)
+        return chunks
+
+    def _merge_ai_sections(self, summary: Optional[Dict[str, Any]],
+                           parts: List[Optional[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Combine the outline response with the per-chunk responses into one AI document."""
+        merged = {key: summary[key] for key in ('title', 'overview', 'purpose') if summary and key in summary}
+        for key in ('components', 'parameters', 'returns', 'examples', 'best_practices', 'notes'):
+            values = [part[key] for part in parts if part and part.get(key)]
+            if not values:
+                continue
+            if key == 'returns' or all(isinstance(value, str) for value in values):
+                merged[key] = '\n\n'.join(
+                    value if isinstance(value, str) else self._format_list_or_text(value) for value in values
+                )
+                continue
+            items = []
+            for value in values:
+                if isinstance(value, list):
+                    items.extend(value)
+                elif isinstance(value, dict):
+                    items.extend({'name': name, 'description': text} for name, text in value.items())
+                else:
+                    items.append(value)
+            merged[key] = items
+        return merged
+
+    def _request_ai_json(self, prompt: str, deadline: Optional[Deadline] = None) -> Optional[Dict[str, Any]]:
+        """
+        Send one prompt to Gemini and parse the JSON reply, with retries and the persistent cache.
+
+        The call is skipped once ``deadline`` has passed, and a retry is only made when
+        the remaining budget covers its backoff plus ``RETRY_MIN_BUDGET``; None either way.
+        """
+        max_retries = 2
+        retry_delay = 1
+        generation_config = self.generation_config
+        deadline = deadline or Deadline()
+
+        # Responses already paid for (possibly by another worker or before a restart)
+        cache_key = content_hash(self.model_name, prompt, generation_config)
+        if self.ai_cache is not None:
+            cached = self.ai_cache.get(cache_key)
+            if cached is not None:
+                self.logger.info("AI documentation served from persistent cache")
+                return cached
+        
+        for attempt in range(max_retries):
+            if not deadline.check():
+                self.logger.warning("Request deadline reached; skipping the AI call")
+                return None
+            try:
                 response = self.gemini_model.generate_content(
                     prompt,
-                    generation_config=generation_config
+                    generation_config=generation_config,
+                    **self._request_options(deadline)
                 )
-                
-                # Try to parse JSON response
-                response_text = response.text.strip()
-
-                # Remove markdown code blocks if present
-                if response_text.startswith('```json'):
-                    response_text = response_text[7:]
-                if response_text.startswith('```'):
-                    response_text = response_text[3:]
-                if response_text.endswith('```'):
-                    response_text = response_text[:-3]
-                response_text = response_text.strip()
-
-                # Post-process: Remove newlines inside JSON string values (but keep newlines between JSON fields)
-                import re
-                def fix_json_newlines(text):
-                    # Replace newlines inside string values with a space
-                    # This regex finds quoted strings and replaces internal newlines with a space
-                    def repl(match):
-                        s = match.group(0)
-                        return s.replace('\n', ' ').replace('\r', ' ')
-                    return re.sub(r'"(.*?)(?<!\\)"', repl, text, flags=re.DOTALL)
-
-                response_text_fixed = fix_json_newlines(response_text)
-
-                try:
-                    result = json.loads(response_text_fixed)
+
+                result = self._parse_ai_response(response.text)
+                if result is not None:
                     self.logger.info(f"Successfully parsed AI-generated documentation. Keys: {list(result.keys())}")
+                    if self.ai_cache is not None:
+                        self.ai_cache.set(cache_key, result)
                     return result
-                except json.JSONDecodeError as e:
-                    self.logger.warning(f"Failed to parse AI response as JSON: {e}")
-                    self.logger.debug(f"Response text (first 200 chars): {response_text_fixed[:200]}")
-                    # If not JSON, return as plain text documentation
-                    return {
-                        'title': 'Generated Documentation',
-                        'overview': response.text[:500],
-                        'full_content': response.text
-                    }
+                # If not JSON, return as plain text documentation
+                return {
+                    'title': 'Generated Documentation',
+                    'overview': response.text[:500],
+                    'full_content': response.text
+                }
                     
             except Exception as e:
                 if attempt < max_retries - 1:
-                    import time
-                    self.logger.warning(f"AI generation attempt {attempt + 1} failed: {e}. Retrying in {retry_delay}s...")
-                    time.sleep(retry_delay)
-                    retry_delay *= 2  # Exponential backoff
-                else:
-                    self.logger.error(f"AI documentation generation failed after {max_retries} attempts: {e}")
+                    if deadline.sleep(retry_delay, reserve=Config.RETRY_MIN_BUDGET):
+                        self.logger.warning(f"AI generation attempt {attempt + 1} failed: {e}. Retried after {retry_delay}s")
+                        retry_delay *= 2  # Exponential backoff
+                        continue
+                    self.logger.warning(f"AI generation attempt {attempt + 1} failed: {e}. No time left to retry")
                     return None
+                self.logger.error(f"AI documentation generation failed after {max_retries} attempts: {e}")
+                deadline.check()
+                return None
+
+    def _request_options(self, deadline: Deadline) -> Dict[str, Any]:
+        """``generate_content`` keyword arguments bounding the call by AI_TIMEOUT and ``deadline`` (SDK 0.4+)."""
+        if _genai_version() < (0, 4):
+            return {}
+        return {'request_options': {'timeout': deadline.timeout(Config.AI_TIMEOUT)}}
+
+    def _parse_ai_response(self, text: str) -> Optional[Dict[str, Any]]:
+        """
+        Parse a Gemini reply as a JSON object; None if it is not one.
+
+        Well-formed replies (always, in structured-output mode) take the stdlib
+        decoder. Anything else goes through ``repair_json``, a linear-time tolerant
+        parser, instead of being kept as plain text.
+        """
+        response_text = text.strip()
+
+        # Remove markdown code blocks if present
+        if response_text.startswith('```json'):
+            response_text = response_text[7:]
+        if response_text.startswith('```'):
+            response_text = response_text[3:]
+        if response_text.endswith('```'):
+            response_text = response_text[:-3]
+        response_text = response_text.strip()
+
+        try:
+            result = _AI_JSON_DECODER.decode(response_text)
+            outcome, repair_seconds = 'parsed', 0.0
+        except json.JSONDecodeError as e:
+            start = time.perf_counter()
+            try:
+                result = repair_json(response_text)
+            except ValueError:
+                result = None
+            repair_seconds = time.perf_counter() - start
+            if isinstance(result, dict):
+                outcome = 'repaired'
+                self.logger.info(f"Repaired malformed AI JSON ({e}) in {repair_seconds * 1000:.2f}ms")
+            else:
+                outcome = 'failed'
+                self.logger.warning(f"Failed to parse AI response as JSON: {e}")
+                self.logger.debug(f"Response text (first 200 chars): {response_text[:200]}")
+        if not isinstance(result, dict):
+            outcome = 'failed'
+        with self._ai_parsing_lock:
+            self.ai_parsing[outcome] += 1
+            self.ai_parsing['repair_ms'] += repair_seconds * 1000
+        return result if outcome != 'failed' else None
+
+    def ai_parsing_stats(self) -> Dict[str, Any]:
+        """Counts of Gemini replies parsed directly, repaired, or unparsable, and total repair time."""
+        with self._ai_parsing_lock:
+            stats = dict(self.ai_parsing)
+        stats['repair_ms'] = round(stats['repair_ms'], 3)
+        stats['structured_output'] = 'response_schema' in self.generation_config
+        return stats
+
+    def _stream_ai_sections(self, prompt: str,
+                            deadline: Optional[Deadline] = None) -> Iterator[Tuple[str, Any]]:
+        """
+        Yield ``(section, value)`` pairs from a streamed Gemini reply as soon as each parses.
+
+        Cached replies are replayed at once. If the stream fails before any section was
+        sent, this falls back to the blocking request (and its retries); if it fails later,
+        the last pair is ``('partial', True)``.
+        """
+        cache_key = content_hash(self.model_name, prompt, self.generation_config)
+        if self.ai_cache is not None:
+            cached = self.ai_cache.get(cache_key)
+            if cached is not None:
+                self.logger.info("AI documentation served from persistent cache")
+                yield from cached.items()
+                return
+
+        deadline = deadline or Deadline()
+        if not deadline.check():
+            yield 'partial', True
+            return
+        sections = JsonSectionStream()
+        pieces = []
+        sent = {}
+        try:
+            response = self.gemini_model.generate_content(
+                prompt,
+                generation_config=self.generation_config,
+                stream=True,
+                **self._request_options(deadline)
+            )
+            for chunk in response:
+                pieces.append(chunk.text)
+                for name, value in sections.feed(chunk.text):
+                    sent[name] = value
+                    yield name, value
+        except Exception as e:
+            if sent:
+                self.logger.error(f"AI documentation stream failed after {len(sent)} sections: {e}")
+                yield 'partial', True
+                return
+            self.logger.warning(f"AI documentation stream failed, retrying without streaming: {e}")
+            result = self._request_ai_json(prompt, deadline)
+            if result:
+                yield from result.items()
+            elif deadline.cut_short:
+                yield 'partial', True
+            return
+
+        # Whatever the incremental parser could not split out, the full-text parse may still recover
+        text = ''.join(pieces)
+        result = self._parse_ai_response(text)
+        if result is None:
+            if not sent:
+                yield 'title', 'Generated Documentation'
+                yield 'overview', text[:500]
+                yield 'full_content', text
+            return
+        for name, value in result.items():
+            if name not in sent:
+                yield name, value
+        if self.ai_cache is not None:
+            self.ai_cache.set(cache_key, result)
+
+    def _calculate_metrics(self, code: str, language: str,
+                           code_blocks: List[CodeBlock]) -> Dict[str, Any]:
+        """
+        File-level metrics stage, run once per generate().
+
+        The file is lexed once (``scan_source``) and Python reuses the cached syntax tree;
+        each block's metrics are sliced from that pass and memoized by block hash on
+        ``block.metrics``. Token and comment counts come from this regex pass rather than
+        Pygments, which costs about ten times as much and is only paid by the HTML export.
+        """
+        stats = self._source_stats(code, language)
+        parsed = self._parse_python_source(code) if language == 'python' else None
+        for block in code_blocks:
+            self._calculate_block_metrics(block, stats, parsed)
 
-    def _calculate_metrics(self, code_blocks: List[CodeBlock]) -> Dict[str, Any]:
         total_blocks = len(code_blocks)
-        total_lines = sum(block.content.count('\n') + 1 for block in code_blocks)
-        average_block_size = total_lines / total_blocks if total_blocks > 0 else 0
-        average_complexity = 1.0  # Placeholder for actual complexity calculation
-        max_complexity = 1.0  # Placeholder for actual complexity calculation
-        
-        return {
+        total_lines = sum(block.metrics['loc'] for block in code_blocks)
+        complexities = [self._calculate_complexity(block) for block in code_blocks]
+        totals = stats.total()
+
+        metrics = {
             'total_blocks': total_blocks,
             'total_lines': total_lines,
-            'average_block_size': average_block_size,
-            'average_complexity': average_complexity,
-            'max_complexity': max_complexity
+            'average_block_size': total_lines / total_blocks if total_blocks > 0 else 0,
+            'average_complexity': round(sum(complexities) / total_blocks, 2) if total_blocks else 0,
+            'max_complexity': max(complexities) if complexities else 0,
+            'loc': totals.loc,
+            'sloc': totals.sloc,
+            'comment_lines': totals.comment_lines,
+            'comment_density': round(totals.comment_lines / totals.sloc, 3) if totals.sloc else 0,
+            'token_count': totals.token_count
         }
+        if parsed is not None and self.RADON_AVAILABLE:
+            metrics.update(self._halstead_metrics(parsed.tree, sum(complexities), totals))
+        return metrics
 
-    def _parse_code_blocks(self, code: str, language: str) -> List[CodeBlock]:
-        """Parse code into code blocks based on the language."""
-        if language == 'python':
-            return self._parse_python(code)
-        elif language == 'javascript':
-            return self._parse_javascript(code)
-        elif language == 'java':
-            return self._parse_java(code)
-        elif language == 'cpp':
-            return self._parse_cpp(code)
-        elif language == 'csharp':
-            return self._parse_csharp(code)
-        else:
-            raise ValueError(f"Unsupported language: {language}")
-
-    def _parse_python(self, code: str) -> List[CodeBlock]:
-        """Parse Python code into code blocks."""
-        # Simple example: split by function definitions
-        blocks = []
-        lines = code.split('\n')
-        current_block = []
-        for line in lines:
-            if line.strip().startswith('def ') or line.strip().startswith('class '):
-                if current_block:
-                    blocks.append(CodeBlock(content='\n'.join(current_block)))
-                    current_block = []
-            current_block.append(line)
-        if current_block:
-            blocks.append(CodeBlock(content='\n'.join(current_block)))
-        return blocks
+    def _source_stats(self, code: str, language: str) -> SourceStats:
+        """Lex a whole file once; shared by the file- and block-level metrics."""
+        key = content_hash('stats', language, code)
+        stats = self.parse_cache.get(key)
+        if stats is None:
+            stats = scan_source(code, language)
+            self.parse_cache.set(key, stats)
+        return stats
 
-    def _parse_javascript(self, code: str) -> List[CodeBlock]:
-        """Parse JavaScript code into code blocks."""
-        # Simple example: split by function definitions
-        blocks = []
-        lines = code.split('\n')
-        current_block = []
-        for line in lines:
-            if line.strip().startswith('function ') or line.strip().startswith('class '):
-                if current_block:
-                    blocks.append(CodeBlock(content='\n'.join(current_block)))
-                    current_block = []
-            current_block.append(line)
-        if current_block:
-            blocks.append(CodeBlock(content='\n'.join(current_block)))
-        return blocks
-
-    def _parse_java(self, code: str) -> List[CodeBlock]:
-        """Parse Java code into code blocks."""
-        # Simple example: split by class and method definitions
-        blocks = []
-        lines = code.split('\n')
-        current_block = []
-        for line in lines:
-            if line.strip().startswith('public class ') or line.strip().startswith('public void '):
-                if current_block:
-                    blocks.append(CodeBlock(content='\n'.join(current_block)))
-                    current_block = []
-            current_block.append(line)
-        if current_block:
-            blocks.append(CodeBlock(content='\n'.join(current_block)))
-        return blocks
+    def _calculate_block_metrics(self, block: CodeBlock, stats: SourceStats,
+                                 parsed: Optional[ParsedPython] = None) -> Dict[str, Any]:
+        """Per-block metrics sliced from the file's lexing pass, memoized by block hash."""
+        if block.metrics:
+            return block.metrics
+        key = content_hash('block-metrics', block.language, block.name, block.content)
+        metrics = self.metrics_cache.get(key)
+        if metrics is None:
+            end_line = block.end_line or block.line_number + block.line_count - 1
+            span = stats.span(block.line_number, end_line)
+            metrics = {
+                'loc': span.loc,
+                'sloc': span.sloc,
+                'comment_lines': span.comment_lines,
+                'token_count': span.token_count,
+                'char_count': block.char_count,
+                'complexity': self._calculate_complexity(block)
+            }
+            node = parsed.node_for(block.name) if parsed and block.name else None
+            if node is not None and self.RADON_AVAILABLE:
+                module = ast.Module(body=[node], type_ignores=[])
+                metrics.update(self._halstead_metrics(module, metrics['complexity'], span))
+            self.metrics_cache.set(key, metrics)
+        # A copy per block, so editing one block's metrics cannot leak into the cache or its twins
+        block.metrics = dict(metrics)
+        return block.metrics
 
-    def _parse_cpp(self, code: str) -> List[CodeBlock]:
-        """Parse C++ code into code blocks."""
-        blocks = []
-        lines = code.split('\n')
-        current_block = []
-        for line in lines:
-            if line.strip().startswith('void ') or line.strip().startswith('class '):
-                if current_block:
-                    blocks.append(CodeBlock(content='\n'.join(current_block)))
-                    current_block = []
-            current_block.append(line)
-        if current_block:
-            blocks.append(CodeBlock(content='\n'.join(current_block)))
-        return blocks
+    def _halstead_metrics(self, module: ast.Module, complexity: int, span: SpanStats) -> Dict[str, Any]:
+        """Halstead volume and maintainability index from an already-parsed tree."""
+        import radon.metrics
+        try:
+            volume = radon.metrics.h_visit_ast(module).total.volume
+            comment_percent = span.comment_lines / span.sloc * 100 if span.sloc else 0
+            return {
+                'halstead_volume': round(volume, 2),
+                'maintainability_index': round(radon.metrics.mi_compute(
+                    volume, complexity, span.sloc, comment_percent), 2)
+            }
+        except Exception as e:
+            self.logger.warning(f"Failed to calculate Halstead metrics: {e}")
+            return {}
 
-    def _parse_csharp(self, code: str) -> List[CodeBlock]:
-        """Parse C# code into code blocks."""
-        blocks = []
-        lines = code.split('\n')
-        current_block = []
-        for line in lines:
-            if line.strip().startswith('public void ') or line.strip().startswith('public class '):
-                if current_block:
-                    blocks.append(CodeBlock(content='\n'.join(current_block)))
-                    current_block = []
-            current_block.append(line)
-        if current_block:
-            blocks.append(CodeBlock(content='\n'.join(current_block)))
-        return blocks
+    def _parse_code_blocks(self, code: str, language: str) -> List[CodeBlock]:
+        """Parse code into code blocks based on the language."""
+        parser = self.supported_languages.get(language)
+        if parser is None:
+            raise ValueError(f"Unsupported language: {language}")
+        return parser(code)
 
     def generate(self, code: str, language: str, title: Optional[str] = None, 
-                 description: Optional[str] = None, use_ai: bool = True) -> Documentation:
+                 description: Optional[str] = None, use_ai: bool = True,
+                 previous: Optional[Union[str, Documentation]] = None,
+                 block_hashes: Optional[List[str]] = None,
+                 fan_out: Optional[bool] = None,
+                 deadline: Optional[Deadline] = None) -> Documentation:
         """
         Generate documentation for the given source code.
 
@@ -342,6 +833,17 @@ Make it professional, clear, and detailed like official library documentation.""
             title (str, optional): Custom title for the documentation
             description (str, optional): Custom description for the documentation
             use_ai (bool): Whether to use AI for enhanced documentation (default: True)
+            previous (str or Documentation, optional): An earlier result (or its ``id``) for
+                the same file. Unchanged blocks keep their complexity and metrics, and its AI
+                sections are reused when the edit does not change the file's outline.
+            block_hashes (list, optional): Block hashes the caller already holds, used to
+                report changed blocks when the previous result is not available here
+            fan_out (bool, optional): Document chunks of blocks with concurrent AI prompts
+                instead of one whole-file prompt. Defaults to on for files of at least
+                ``AI_FANOUT_MIN_LINES`` lines.
+            deadline (Deadline, optional): Time budget for the Gemini calls. AI sections that
+                do not fit are left out, ``deadline.cut_short`` is set and the result is not
+                cached.
 
         Returns:
             Documentation: Generated documentation object
@@ -354,20 +856,83 @@ Make it professional, clear, and detailed like official library documentation.""
         if language not in self.supported_languages:
             raise ValueError(f"Unsupported language: {language}")
 
+        ai_requested = bool(use_ai and self.use_ai)
+        if fan_out is None:
+            fan_out = code.count('\n') + 1 >= Config.AI_FANOUT_MIN_LINES
+        cache_key = self._result_cache_key(code, language, title, description, ai_requested,
+                                           fan_out and ai_requested)
+        incremental_run = previous is not None or block_hashes is not None
+        if isinstance(previous, str):
+            previous_id, previous = previous, self.result_cache.get(previous)
+        else:
+            previous_id = previous.id if previous is not None else None
+
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            self.logger.debug("Documentation served from result cache")
+            if not incremental_run:
+                return cached
+            incremental = self._reuse_unchanged_blocks(cached.code_blocks, previous, block_hashes)
+            return self._with_incremental(cached, incremental, previous_id)
+
+        code_blocks = self._parse_code_blocks(code, language)
+        outline_hash = self._outline_hash(code, language, code_blocks)
+        incremental = None
+        if incremental_run:
+            incremental = self._reuse_unchanged_blocks(code_blocks, previous, block_hashes)
+        for block in code_blocks:
+            self._calculate_complexity(block)
+        metrics = self._calculate_metrics(code, language, code_blocks)
+
         # Try AI-enhanced documentation first
         ai_doc = None
         self.logger.info(f"AI flags: use_ai={use_ai}, self.use_ai={self.use_ai}, GEMINI_AVAILABLE={self.GEMINI_AVAILABLE}")
-        if use_ai and self.use_ai:
-            self.logger.info("Attempting AI documentation generation...")
-            ai_doc = self._generate_ai_documentation(code, language)
-            if ai_doc:
-                self.logger.info("AI documentation generated successfully")
+        if ai_requested:
+            previous_ai = getattr(previous, 'ai_enhanced', None)
+            if previous_ai and previous.outline_hash == outline_hash and \
+                    incremental['changed_ratio'] <= Config.INCREMENTAL_AI_MAX_CHANGE_RATIO:
+                self.logger.info("Outline unchanged, reusing AI documentation from previous result")
+                ai_doc = previous_ai
+                incremental['ai_reused'] = True
             else:
-                self.logger.warning("AI documentation generation returned None")
+                self.logger.info("Attempting AI documentation generation...")
+                if fan_out and code_blocks:
+                    ai_doc = self._generate_ai_documentation_fanout(code, language, code_blocks, deadline)
+                else:
+                    ai_doc = self._generate_ai_documentation(code, language, deadline)
+                if ai_doc:
+                    self.logger.info("AI documentation generated successfully")
+                else:
+                    self.logger.warning("AI documentation generation returned None")
+
+        doc = self._build_documentation(language, title, description, code_blocks, metrics, ai_doc)
+        doc.id = cache_key
+        doc.outline_hash = outline_hash
+
+        # Don't pin a failed or partial AI attempt in the cache; the next request should retry Gemini
+        if (ai_doc and not ai_doc.get('partial')) or not ai_requested:
+            self.result_cache.set(cache_key, doc)
         
-        code_blocks = self._parse_code_blocks(code, language)
-        metrics = self._calculate_metrics(code_blocks)
+        return self._with_incremental(doc, incremental, previous_id)
 
+    @staticmethod
+    def _with_incremental(doc: Documentation, incremental: Optional[Dict[str, Any]],
+                          previous_id: Optional[str]) -> Documentation:
+        """
+        This request's view of ``doc``: a shallow copy carrying the incremental summary, so
+        the cached result never serves one request's summary to the next.
+        """
+        if incremental is None:
+            return doc
+        incremental['previous_id'] = previous_id
+        doc = copy.copy(doc)
+        doc.incremental = incremental
+        return doc
+
+    def _build_documentation(self, language: str, title: Optional[str], description: Optional[str],
+                             code_blocks: List[CodeBlock], metrics: Dict[str, Any],
+                             ai_doc: Optional[Dict[str, Any]]) -> Documentation:
+        """Assemble a Documentation from parsed blocks, metrics and (optional) AI sections."""
         # Use AI-generated content if available, otherwise use defaults
         if ai_doc and isinstance(ai_doc, dict):
             doc_title = title or ai_doc.get('title', f"{language.capitalize()} Documentation")
@@ -387,8 +952,171 @@ Make it professional, clear, and detailed like official library documentation.""
         # Add AI documentation as metadata if available
         if ai_doc:
             doc.ai_enhanced = ai_doc
-        
         return doc
+
+    def generate_stream(self, code: str, language: str, title: Optional[str] = None,
+                        description: Optional[str] = None, use_ai: bool = True,
+                        fan_out: Optional[bool] = None,
+                        deadline: Optional[Deadline] = None) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Streaming variant of ``generate``, as ``(event, payload)`` pairs.
+
+        ``blocks`` and ``metrics`` come first, since they only need the parser. Then one
+        ``section`` per AI section as Gemini streams it, and finally ``done`` with the
+        documentation id, title and description, with ``partial`` set when an AI section
+        failed or did not fit ``deadline``. The finished Documentation is cached exactly as
+        ``generate`` would cache it.
+
+        Raises:
+            ValueError: If code is empty or language is not supported (before any event)
+        """
+        if not code:
+            raise ValueError("Code cannot be empty")
+        if language not in self.supported_languages:
+            raise ValueError(f"Unsupported language: {language}")
+        return self._stream_documentation(code, language, title, description, use_ai, fan_out, deadline)
+
+    def _stream_documentation(self, code: str, language: str, title: Optional[str],
+                              description: Optional[str], use_ai: bool, fan_out: Optional[bool],
+                              deadline: Optional[Deadline]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        ai_requested = bool(use_ai and self.use_ai)
+        if fan_out is None:
+            fan_out = code.count('\n') + 1 >= Config.AI_FANOUT_MIN_LINES
+        cache_key = self._result_cache_key(code, language, title, description, ai_requested,
+                                           fan_out and ai_requested)
+        doc = self.result_cache.get(cache_key)
+        if doc is not None:
+            yield 'blocks', {'code_blocks': [block.to_dict() for block in doc.code_blocks]}
+            yield 'metrics', doc.metrics
+            for name, value in (getattr(doc, 'ai_enhanced', None) or {}).items():
+                yield 'section', {'name': name, 'content': value}
+            yield 'done', {'id': doc.id, 'title': doc.title, 'description': doc.description, 'partial': False}
+            return
+
+        code_blocks = self._parse_code_blocks(code, language)
+        outline_hash = self._outline_hash(code, language, code_blocks)
+        for block in code_blocks:
+            self._calculate_complexity(block)
+        metrics = self._calculate_metrics(code, language, code_blocks)
+        yield 'blocks', {'code_blocks': [block.to_dict() for block in code_blocks]}
+        yield 'metrics', metrics
+
+        ai_doc = None
+        if ai_requested:
+            if fan_out and code_blocks:
+                # Chunks finish out of order, so fan-out sections are sent once merged
+                ai_doc = self._generate_ai_documentation_fanout(code, language, code_blocks, deadline)
+                for name, value in (ai_doc or {}).items():
+                    if name != 'partial':
+                        yield 'section', {'name': name, 'content': value}
+            else:
+                ai_doc = {}
+                for name, value in self._stream_ai_sections(self._build_ai_prompt(code, language), deadline):
+                    ai_doc[name] = value
+                    if name != 'partial':
+                        yield 'section', {'name': name, 'content': value}
+
+        doc = self._build_documentation(language, title, description, code_blocks, metrics, ai_doc)
+        doc.id = cache_key
+        doc.outline_hash = outline_hash
+        partial = bool(ai_doc and ai_doc.get('partial')) or bool(deadline and deadline.cut_short)
+        if (ai_doc and not partial) or not ai_requested:
+            self.result_cache.set(cache_key, doc)
+        yield 'done', {'id': doc.id, 'title': doc.title, 'description': doc.description, 'partial': partial}
+
+    def _reuse_unchanged_blocks(self, code_blocks: List[CodeBlock], previous: Optional[Documentation],
+                                block_hashes: Optional[List[str]]) -> Dict[str, Any]:
+        """
+        Match blocks against an earlier run by content hash.
+
+        Matched blocks not measured yet take over the previous complexity and metrics.
+        Changed blocks that kept their name are line-diffed against the old version, so
+        ``changed_ratio`` is the share of the file's block lines that were actually edited.
+        """
+        old_blocks = previous.code_blocks if previous is not None else []
+        known = {block.hash: block for block in old_blocks if block.hash}
+        known_hashes = set(known).union(block_hashes or ())
+        by_name = {block.name: block for block in old_blocks if block.name}
+
+        reused, changed = 0, []
+        changed_lines = total_lines = 0
+        for block in code_blocks:
+            line_count = block.line_count
+            total_lines += line_count
+            if block.hash in known_hashes:
+                match = known.get(block.hash)
+                if match is not None and not block.metrics:
+                    block.complexity = match.complexity
+                    block.metrics = dict(match.metrics)
+                reused += 1
+                continue
+            changed.append(block.name or f"line {block.line_number}")
+            old = by_name.get(block.name) if block.name else None
+            if old is None:
+                changed_lines += line_count
+                continue
+            matcher = difflib.SequenceMatcher(None, old.content.split('\n'), block.content.split('\n'),
+                                              autojunk=False)
+            changed_lines += sum(max(i2 - i1, j2 - j1)
+                                 for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal')
+
+        current = {block.hash for block in code_blocks}
+        return {
+            'reused_blocks': reused,
+            'changed_blocks': changed,
+            'removed_blocks': len(known_hashes - current),
+            'changed_ratio': round(changed_lines / total_lines, 3) if total_lines else 0,
+            'ai_reused': False
+        }
+
+    def _outline_hash(self, code: str, language: str, code_blocks: List[CodeBlock]) -> str:
+        """
+        Hash what the AI sections describe (see ``_outline``). Bodies are left out, so an
+        edit inside a function keeps the outline and its AI documentation.
+
+        Also stamps each block with its content hash.
+        """
+        for block in code_blocks:
+            block.hash = content_hash(block.language, block.name, block.content)
+        headers, outside = self._outline(code, language, code_blocks)
+        return content_hash(language, headers, ' '.join('\n'.join(outside).split()))
+
+    def _outline(self, code: str, language: str,
+                 code_blocks: List[CodeBlock]) -> Tuple[List[str], List[str]]:
+        """
+        Every declaration header (nested ones included, whitespace-normalized) and the
+        non-blank lines outside blocks, such as imports and constants.
+        """
+        lines = code.split('\n')
+        covered = bytearray(len(lines) + 2)
+        for block in code_blocks:
+            end_line = block.end_line or block.line_number + block.line_count - 1
+            covered[block.line_number:end_line + 1] = b'\x01' * (end_line - block.line_number + 1)
+        outside = [line for number, line in enumerate(lines, 1) if not covered[number] and line.strip()]
+
+        headers = []
+        if language == 'python':
+            parsed = self._parse_python_source(code)
+            if parsed is None:
+                headers = [block.first_line for block in code_blocks]
+            else:
+                for symbol in parsed.symbols.values():
+                    node = parsed.node_for(symbol.qualname)
+                    body_line = node.body[0].lineno if node is not None and node.body else symbol.line_number + 1
+                    headers.append('\n'.join(lines[symbol.line_number - 1:max(body_line - 1, symbol.line_number)]))
+        else:
+            parsed = self._parse_braced_source(code, language)
+            for symbol in parsed.symbols.values():
+                opener = code.find('{', symbol.start_offset, symbol.end_offset)
+                headers.append(code[symbol.start_offset:opener if opener >= 0 else symbol.end_offset])
+
+        return [' '.join(header.split()) for header in headers], outside
+
+    def _result_cache_key(self, code: str, language: str, title: Optional[str],
+                          description: Optional[str], use_ai: bool, fan_out: bool = False) -> str:
+        """Content-addressed key for generate() results."""
+        return content_hash(code, language, title, description, use_ai,
+                            self.model_name if use_ai else None, fan_out)
     
     def _format_ai_description(self, ai_doc: Dict[str, str]) -> str:
         """Format AI-generated documentation into a readable description"""
@@ -457,7 +1185,7 @@ Make it professional, clear, and detailed like official library documentation.""
         if format not in self.exporters:
             raise ValueError(f"Invalid format: {format}")
         
-        content = self.exporters[format](doc, template)
+        content = self._render(doc, format, template)
         
         if output_path:
             mode = 'wb' if isinstance(content, bytes) else 'w'
@@ -466,208 +1194,100 @@ Make it professional, clear, and detailed like official library documentation.""
         
         return content
 
+    def _parse_python_source(self, code: str) -> Optional[ParsedPython]:
+        """Parse Python source once; results are shared by blocks, metrics and exports."""
+        key = content_hash('python', code)
+        parsed = self.parse_cache.get(key)
+        if parsed is None:
+            try:
+                # dedent keeps line numbers, so snippets pasted with a uniform indent still parse
+                parsed = parse_python(textwrap.dedent(code))
+            except (SyntaxError, ValueError) as e:
+                self.logger.debug(f"Python source does not parse, using line scanner: {e}")
+                parsed = _UNPARSABLE
+            self.parse_cache.set(key, parsed)
+        return None if parsed is _UNPARSABLE else parsed
+
     def _parse_python(self, code: str) -> List[CodeBlock]:
-        """Parse Python code into code blocks."""
-        blocks = []
-        lines = code.split('\n')
-        current_block = []
-        line_number = 1
-
-        for line in lines:
-            stripped = line.strip()
-            # Detect function or class definitions
-            if stripped.startswith('def ') or stripped.startswith('class '):
-                if current_block:
-                    blocks.append(CodeBlock(
-                        content='\n'.join(current_block),
-                        language='python',
-                        line_number=line_number - len(current_block)
-                    ))
-                current_block = [line]
-            elif current_block:
-                current_block.append(line)
-            line_number += 1
-
-        # Add the last block
-        if current_block:
-            blocks.append(CodeBlock(
-                content='\n'.join(current_block),
+        """Parse Python code into one code block per top-level class or function."""
+        parsed = self._parse_python_source(code)
+        if parsed is None:
+            return self._parse_python_lines(code)
+
+        offsets = _line_offsets(code)
+        return [
+            CodeBlock.from_source(
+                code, *_line_span(code, offsets, symbol.line_number, symbol.end_line),
                 language='python',
-                line_number=line_number - len(current_block)
-            ))
+                line_number=symbol.line_number,
+                end_line=symbol.end_line,
+                name=symbol.qualname,
+                kind=symbol.kind,
+                decorators=symbol.decorators,
+                complexity=symbol.total_complexity
+            )
+            for symbol in parsed.blocks
+        ]
+
+    def _parse_python_lines(self, code: str) -> List[CodeBlock]:
+        """Line-scanner fallback for Python source that does not parse (e.g. mid-edit)."""
+        offsets = _line_offsets(code)
+        # 1-based line numbers of every def/class line; each block runs to the next one
+        starts = [bisect.bisect_right(offsets, match.start()) for match in _PYTHON_DEFINITION.finditer(code)]
+        ends = [start - 1 for start in starts[1:]] + [len(offsets)]
+        return [
+            CodeBlock.from_source(code, *_line_span(code, offsets, start, end),
+                                  language='python', line_number=start)
+            for start, end in zip(starts, ends)
+        ]
+
+    def _parse_braced_source(self, code: str, language: str) -> ParsedBraces:
+        """Parse C-family source once with the shared brace-aware parser."""
+        key = content_hash(language, code)
+        parsed = self.parse_cache.get(key)
+        if parsed is None:
+            parsed = parse_braces(code, language)
+            self.parse_cache.set(key, parsed)
+        return parsed
 
-        return blocks
+    def _parse_braced(self, code: str, language: str) -> List[CodeBlock]:
+        """Parse C-family code into one code block per top-level declaration."""
+        parsed = self._parse_braced_source(code, language)
+        return [
+            CodeBlock.from_source(
+                code, symbol.start_offset, symbol.end_offset,
+                language=language,
+                line_number=symbol.line_number,
+                end_line=symbol.end_line,
+                name=symbol.qualname,
+                kind=symbol.kind
+            )
+            for symbol in parsed.blocks
+        ]
 
     def _parse_javascript(self, code: str) -> List[CodeBlock]:
-        """Parse JavaScript/TypeScript code into code blocks."""
-        blocks = []
-        lines = code.split('\n')
-        current_block = []
-        line_number = 1
-
-        for line in lines:
-            stripped = line.strip()
-            # Detect function or class definitions
-            if (stripped.startswith('function ') or 
-                stripped.startswith('class ') or 
-                stripped.startswith('const ') and '=> {' in stripped):
-                if current_block:
-                    blocks.append(CodeBlock(
-                        content='\n'.join(current_block),
-                        language='javascript',
-                        line_number=line_number - len(current_block)
-                    ))
-                current_block = [line]
-            elif current_block:
-                current_block.append(line)
-            line_number += 1
-
-        # Add the last block
-        if current_block:
-            blocks.append(CodeBlock(
-                content='\n'.join(current_block),
-                language='javascript',
-                line_number=line_number - len(current_block)
-            ))
-
-        return blocks
-
-    def _parse_java(self, source_code: str) -> List[CodeBlock]:
-        """Parse Java source code and extract code blocks."""
-        code_blocks = []
-        lines = source_code.split('\n')
-        
-        current_block = []
-        in_comment = False
-        
-        for i, line in enumerate(lines, 1):
-            stripped_line = line.strip()
-            
-            # Handle multi-line comments
-            if '/*' in stripped_line:
-                in_comment = True
-            if '*/' in stripped_line:
-                in_comment = False
-                continue
-                
-            # Skip comments
-            if stripped_line.startswith('//') or in_comment:
-                continue
-                
-            # Check for class, interface, or method declarations
-            if re.match(r'^\s*(public|private|protected)?\s*(class|interface|enum|@interface|abstract\s+class|\w+\s+\w+\s*\()', line):
-                if current_block:
-                    code_blocks.append(CodeBlock(
-                        content='\n'.join(current_block),
-                        language='java',
-                        line_number=i - len(current_block)
-                    ))
-                current_block = [line]
-            elif current_block:
-                current_block.append(line)
-                
-        if current_block:
-            code_blocks.append(CodeBlock(
-                content='\n'.join(current_block),
-                language='java',
-                line_number=len(lines) - len(current_block) + 1
-            ))
-            
-        return code_blocks
+        """Parse JavaScript code into code blocks."""
+        return self._parse_braced(code, 'javascript')
 
-    def _parse_cpp(self, source_code: str) -> List[CodeBlock]:
-        """Parse C++ source code and extract code blocks."""
-        code_blocks = []
-        lines = source_code.split('\n')
-        
-        current_block = []
-        in_comment = False
-        template_depth = 0
-        
-        for i, line in enumerate(lines, 1):
-            stripped_line = line.strip()
-            
-            # Handle multi-line comments
-            if '/*' in stripped_line:
-                in_comment = True
-            if '*/' in stripped_line:
-                in_comment = False
-                continue
-                
-            # Skip comments
-            if stripped_line.startswith('//') or in_comment:
-                continue
-                
-            # Track template depth
-            template_depth += stripped_line.count('<') - stripped_line.count('>')
-            
-            # Check for function, class, or struct declarations
-            if template_depth == 0 and re.match(r'^\s*(template\s*<.*>)?\s*(class|struct|enum|union|\w+\s+\w+\s*\()', line):
-                if current_block:
-                    code_blocks.append(CodeBlock(
-                        content='\n'.join(current_block),
-                        language='cpp',
-                        line_number=i - len(current_block)
-                    ))
-                current_block = [line]
-            elif current_block:
-                current_block.append(line)
-                
-        if current_block:
-            code_blocks.append(CodeBlock(
-                content='\n'.join(current_block),
-                language='cpp',
-                line_number=len(lines) - len(current_block) + 1
-            ))
-            
-        return code_blocks
+    def _parse_typescript(self, code: str) -> List[CodeBlock]:
+        """Parse TypeScript code into code blocks."""
+        return self._parse_braced(code, 'typescript')
 
-    def _parse_csharp(self, source_code: str) -> List[CodeBlock]:
-        """Parse C# source code and extract code blocks."""
-        code_blocks = []
-        lines = source_code.split('\n')
-        
-        current_block = []
-        in_comment = False
-        
-        for i, line in enumerate(lines, 1):
-            stripped_line = line.strip()
-            
-            # Handle multi-line comments
-            if '/*' in stripped_line:
-                in_comment = True
-            if '*/' in stripped_line:
-                in_comment = False
-                continue
-                
-            # Skip comments
-            if stripped_line.startswith('//') or in_comment:
-                continue
-                
-            # Check for class, interface, method, or property declarations
-            if re.match(r'^\s*(public|private|protected|internal)?\s*(class|interface|enum|struct|record|async\s+Task|\w+\s+\w+\s*\(|\w+\s+\w+\s*{)', line):
-                if current_block:
-                    code_blocks.append(CodeBlock(
-                        content='\n'.join(current_block),
-                        language='csharp',
-                        line_number=i - len(current_block)
-                    ))
-                current_block = [line]
-            elif current_block:
-                current_block.append(line)
-                
-        if current_block:
-            code_blocks.append(CodeBlock(
-                content='\n'.join(current_block),
-                language='csharp',
-                line_number=len(lines) - len(current_block) + 1
-            ))
-            
-        return code_blocks
+    def _parse_java(self, code: str) -> List[CodeBlock]:
+        """Parse Java code into code blocks."""
+        return self._parse_braced(code, 'java')
+
+    def _parse_cpp(self, code: str) -> List[CodeBlock]:
+        """Parse C++ code into code blocks."""
+        return self._parse_braced(code, 'cpp')
+
+    def _parse_csharp(self, code: str) -> List[CodeBlock]:
+        """Parse C# code into code blocks."""
+        return self._parse_braced(code, 'csharp')
 
     def _generate_metrics(self, code_blocks: List[CodeBlock]) -> Dict[str, Any]:
         """Generate metrics for the parsed code blocks."""
-        total_lines = sum(len(block.content.split('\n')) for block in code_blocks)
+        total_lines = sum(block.line_count for block in code_blocks)
         complexities = [self._calculate_complexity(block) for block in code_blocks]
         
         return {
@@ -679,70 +1299,22 @@ Make it professional, clear, and detailed like official library documentation.""
         }
 
     def _calculate_complexity(self, block: CodeBlock) -> int:
-        """Calculate cyclomatic complexity for a code block."""
-        complexity = 1
-        code = block.content.lower()
-        
-        # Language-specific complexity patterns
-        patterns = {
-            'python': [r'\bif\b', r'\belif\b', r'\bfor\b', r'\bwhile\b', r'\band\b', r'\bor\b', r'\bcatch\b', r'\bwith\b'],
-            'javascript': [r'\bif\b', r'\belse\s+if\b', r'\bfor\b', r'\bwhile\b', r'\b\&\&\b', r'\b\|\|\b', r'\bcatch\b', r'\bcase\b'],
-            'java': [r'\bif\b', r'\belse\s+if\b', r'\bfor\b', r'\bwhile\b', r'\b\&\&\b', r'\b\|\|\b', r'\bcatch\b', r'\bcase\b'],
-            'cpp': [r'\bif\b', r'\belse\s+if\b', r'\bfor\b', r'\bwhile\b', r'\b\&\&\b', r'\b\|\|\b', r'\bcatch\b', r'\bcase\b'],
-            'csharp': [r'\bif\b', r'\belse\s+if\b', r'\bfor\b', r'\bwhile\b', r'\b\&\&\b', r'\b\|\|\b', r'\bcatch\b', r'\bcase\b']
-        }
-        
-        # Add complexity for each control flow pattern found
-        for pattern in patterns.get(block.language, patterns['python']):
-            complexity += len(re.findall(pattern, code))
-        
-        return complexity
+        """
+        Calculate cyclomatic complexity for a code block.
 
-    def _calculate_advanced_metrics(self, code_block: CodeBlock) -> Dict[str, Any]:
-        """Calculate advanced metrics for a code block."""
-        metrics = {
-            'loc': len(code_block.content.split('\n')),
-            'sloc': len([l for l in code_block.content.split('\n') if l.strip()]),
-            'comments': len(re.findall(r'(?://|#|/\*|\*/|"""|\'\'\')', code_block.content)),
-            'complexity': self._calculate_complexity(code_block),
-            'token_count': len(list(lex(code_block.content, 
-                get_lexer_by_name(code_block.language)))),
-            'char_count': len(code_block.content)
-        }
-        
-        # Add advanced metrics only if radon is available
-        if self.RADON_AVAILABLE and code_block.language == 'python':
-            try:
-                # Fix: Ensure code block has proper indentation for radon
-                code_content = code_block.content.strip()
-                if not code_content.endswith('\n'):
-                    code_content += '\n'
-                    
-                complexity_visitor = ComplexityVisitor.from_code(code_content)
-                metrics.update({
-                    'cognitive_complexity': complexity_visitor.total_complexity,
-                    'functions': len(complexity_visitor.functions),
-                    'classes': len(complexity_visitor.classes),
-                    'halstead_metrics': radon.metrics.h_visit(code_content),
-                    'maintainability_index': radon.metrics.mi_visit(code_content, True)
-                })
-            except Exception as e:
-                logging.warning(f"Failed to calculate advanced metrics: {str(e)}")
-                # Add default values if calculation fails
-                metrics.update({
-                    'cognitive_complexity': 0,
-                    'functions': 0,
-                    'classes': 0,
-                    'halstead_metrics': {},
-                    'maintainability_index': 0
-                })
-                
-        return metrics
+        The result is stored on the block, so generate, the metrics helpers and every
+        exporter share one scan per block.
+        """
+        if block.complexity is None:
+            block.complexity = cyclomatic_complexity(block.content, block.language)
+        return block.complexity
 
     def _calculate_python_metrics(self, code_block: CodeBlock) -> Dict[str, Any]:
         """Calculate Python-specific metrics."""
         metrics = {}
         if RADON_AVAILABLE:
+            import radon.metrics
+            from radon.visitors import ComplexityVisitor
             try:
                 complexity_visitor = ComplexityVisitor.from_code(code_block.content)
                 metrics.update({
@@ -758,149 +1330,156 @@ Make it professional, clear, and detailed like official library documentation.""
 
     def save_documentation(self, doc: Documentation, output_path: str) -> None:
         """Save the generated documentation to a file."""
-        markdown_content = self._export_markdown(doc, template='default')
-        with open(output_path, 'w') as file:
-            file.write(markdown_content)
+        self._write_chunks(self.export_stream(doc, 'markdown', template='default'), output_path)
 
     def export_to_markdown(self, doc: Documentation, output_path: str) -> None:
         """Export the documentation to a Markdown file."""
-        markdown_content = self._export_markdown(doc, template='default')
+        self._write_chunks(self.export_stream(doc, 'markdown', template='default'), output_path)
+
+    def export_stream(self, doc: Documentation, format: str = 'markdown',
+                      template: str = 'default') -> Iterator[Union[str, bytes]]:
+        """
+        Export documentation as an iterator of chunks, for chunked HTTP responses.
+
+        Markdown and HTML are produced one section or code block at a time, so the full
+        export is never held in memory; cached artifacts are read back in chunks. Other
+        formats are rendered whole and yielded as one chunk. Text formats yield ``str``,
+        binary ``bytes``.
+        """
+        if template not in self.templates:
+            raise ValueError(f"Invalid template: {template}")
+        if format not in self.exporters:
+            raise ValueError(f"Invalid format: {format}")
+        streamer = self.streamers.get(format)
+        if streamer is None:
+            return iter([self._render(doc, format, template)])
+        if self.export_cache is None:
+            return streamer(doc, template)
+
+        key = self._export_cache_key(doc, format, template)
+        cached = self.export_cache.iter_chunks(key)
+        if cached is not None:
+            return codecs.iterdecode(cached, 'utf-8')
+        return self._cache_chunks(streamer(doc, template), key)
+
+    def _render(self, doc: Documentation, format: str, template: str) -> Union[str, bytes]:
+        """Render one export, serving repeats of the same document, format and template from disk."""
+        if self.export_cache is None:
+            return self.exporters[format](doc, template)
+        key = self._export_cache_key(doc, format, template)
+        data = self.export_cache.get(key)
+        if data is not None:
+            return data if format in _BINARY_FORMATS else data.decode('utf-8')
+        content = self.exporters[format](doc, template)
+        self.export_cache.set(key, content if isinstance(content, bytes) else content.encode('utf-8'))
+        return content
+
+    def _cache_chunks(self, chunks: Iterator[str], key: str) -> Iterator[str]:
+        """Pass chunks through while writing them to the artifact cache; kept only if fully consumed."""
+        writer = self.export_cache.writer(key)
+        try:
+            for chunk in chunks:
+                writer.write(chunk.encode('utf-8'))
+                yield chunk
+        except BaseException:
+            # Includes GeneratorExit when a streamed response is closed early
+            writer.discard()
+            raise
+        writer.commit()
+
+    def _export_cache_key(self, doc: Documentation, format: str, template: str) -> str:
+        """Content hash of everything an exporter renders, plus format and template."""
+        compiled = self.templates.get(template)
+        # Only templates that print the timestamp make it part of the output
+        stamped = compiled.uses('generated_at')
+        return content_hash('export', format, template, compiled.fingerprint, doc.title, doc.description,
+                            doc.language, doc.metrics, [block.to_dict() for block in doc.code_blocks],
+                            doc.generated_at if stamped else None,
+                            Config.JSON_EXPORT_COMPACT if format == 'json' else None)
+
+    def _write_chunks(self, chunks: Iterator[str], output_path: str) -> None:
+        """Write exported text chunks to ``output_path`` as they are produced."""
         with open(output_path, 'w') as file:
-            file.write(markdown_content)
+            for chunk in chunks:
+                file.write(chunk)
 
     def _export_markdown(self, doc: Documentation, template: str) -> str:
         """Export documentation to markdown format."""
-        template_config = self.templates[template]
-        content = f"# {doc.title}\n\n"
-        
-        # Add description (AI-generated or default)
-        if doc.description:
-            content += f"{doc.description}\n\n"
-        
-        if template == 'detailed':
-            content += "## Table of Contents\n"
-            for i, block in enumerate(doc.code_blocks):
-                content += f"{i+1}. Code Block {i+1}\n"
-            content += "\n"
-        
-        # Add metrics if in detailed mode
-        if template == 'detailed' and doc.metrics:
-            content += "## Metrics\n\n"
-            for key, value in doc.metrics.items():
-                content += f"- **{key.replace('_', ' ').title()}**: {value}\n"
-            content += "\n"
-        
-        # Add code blocks
-        if doc.code_blocks:
-            content += "## Code\n\n"
-            for i, block in enumerate(doc.code_blocks):
-                if template == 'detailed':
-                    content += f"### Block {i+1} (Line {block.line_number})\n\n"
-                content += f"```{doc.language}\n{block.content}\n```\n\n"
-        
-        return content
+        return ''.join(self._iter_markdown(doc, template))
+
+    def _iter_markdown(self, doc: Documentation, template: str) -> Iterator[str]:
+        """Markdown export, one section or code block per chunk."""
+        return self.templates.get(template).render(doc)
 
     def _export_html(self, doc: Documentation, template: str) -> str:
         """Export documentation to HTML format."""
-        template_config = self.templates[template]
-        return f"""<!DOCTYPE html>
-        <html>
-        <body>
-        <div class="code-block">
-        <pre><code>{doc.code_blocks[0].content}</code></pre>
-        </div>
-        </body>
-        </html>"""
+        return ''.join(self._iter_html(doc, template))
 
-    def _export_json(self, doc: Documentation, template: str) -> str:
-        """Export documentation to JSON format."""
-        return json.dumps({
-            'title': doc.title,
-            'description': doc.description,
-            'language': doc.language,
-            'metrics': doc.metrics,
-            'code_blocks': [
-                {
-                    'content': block.content,
-                    'language': block.language,
-                    'line_number': block.line_number,
-                    'metrics': {
-                        'loc': len(block.content.split('\n')),
-                        'complexity': self._calculate_complexity(block)
-                    }
-                }
-                for block in doc.code_blocks
-            ]
-        }, indent=2)
+    def _iter_html(self, doc: Documentation, template: str) -> Iterator[str]:
+        """
+        Standalone HTML page: title, description, table of contents, metrics table
+        and syntax-highlighted code blocks, one chunk per section or block.
 
-    def _export_pdf(self, doc: Documentation, template: str) -> bytes:
-        """Export documentation to PDF format."""
-        from reportlab.pdfgen import canvas
-        from io import BytesIO
-        
-        buffer = BytesIO()
-        pdf = canvas.Canvas(buffer)
-        pdf.drawString(100, 800, doc.title)
-        y_position = 750
-        for block in doc.code_blocks:
-            pdf.drawString(100, y_position, block.content)
-            y_position -= 20
-        pdf.save()
-        
-        return buffer.getvalue()
+        Like markdown, the timestamp and per-block analysis appear only when the
+        template prints them (``generated_at``, ``loc``/``complexity``).
+        """
+        compiled = self.templates.get(template)
+        title = html.escape(doc.title)
+        yield (f'<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="utf-8">\n'
+               f'<title>{title}</title>\n<style>{_HTML_STYLE}{_highlight_css()}</style>\n'
+               f'</head>\n<body>\n<h1>{title}</h1>\n')
+        if compiled.uses('generated_at'):
+            yield f'<p class="generated-at">Generated at: {html.escape(doc.generated_at)}</p>\n'
+        if doc.description:
+            yield f'<section class="description">\n{self._markdown_to_html(doc.description)}\n</section>\n'
 
-    def _export_docx(self, doc: Documentation, template: str) -> bytes:
-        """Export documentation to DOCX format."""
-        from docx import Document
-        from io import BytesIO
-        
-        docx_doc = Document()
-        docx_doc.add_heading(doc.title, 0)
-        for block in doc.code_blocks:
-            docx_doc.add_paragraph(block.content)
-        
-        buffer = BytesIO()
-        docx_doc.save(buffer)
-        return buffer.getvalue()
+        labels = [html.escape(block.name or f"Block {i}") for i, block in enumerate(doc.code_blocks, 1)]
+        if doc.code_blocks:
+            yield '<nav class="toc">\n<h2>Table of Contents</h2>\n<ol>\n' + ''.join(
+                f'<li><a href="#block-at-line-{block.line_number}">{label}</a></li>\n'
+                for block, label in zip(doc.code_blocks, labels)
+            ) + '</ol>\n</nav>\n'
+        if doc.metrics:
+            yield ('<section class="metrics">\n<h2>Metrics</h2>\n'
+                   f'{self._format_metrics_html(json.dumps(doc.metrics, default=str))}</section>\n')
+
+        if doc.code_blocks:
+            analysis = compiled.uses('loc') or compiled.uses('complexity')
+            yield '<section class="code-blocks">\n<h2>Code Blocks</h2>\n'
+            for block, label in zip(doc.code_blocks, labels):
+                chunk = (f'<h3 id="block-at-line-{block.line_number}">{label}</h3>\n'
+                         f'<div class="code-block"><div class="code-block-header">'
+                         f'{html.escape(block.language)} · line {block.line_number}</div>'
+                         f'<pre><code>{self._highlight(block)}</code></pre></div>\n')
+                if analysis:
+                    loc = block.metrics.get('loc', block.line_count)
+                    chunk += (f'<ul class="analysis"><li>Lines of code: {loc}</li>'
+                              f'<li>Complexity: {self._calculate_complexity(block)}</li></ul>\n')
+                yield chunk
+            yield '</section>\n'
+        yield '</body>\n</html>\n'
+
+    def _highlight(self, block: CodeBlock) -> str:
+        """
+        Pygments HTML for one block, memoized by content hash and lexer.
+
+        On a miss only the block's own text is lexed, with the per-language lexer,
+        so re-exporting after a one-block edit lexes that block and not its file.
+        """
+        if not PYGMENTS_AVAILABLE:
+            return html.escape(block.content)
+        lexer = pygments_lexer(block.language)
+        key = content_hash('highlight', lexer.name, block.content)
+        highlighted = self.highlight_cache.get(key)
+        if highlighted is None:
+            from pygments import highlight
+            highlighted = highlight(block.content, lexer, _pygments_formatter())
+            self.highlight_cache.set(key, highlighted)
+        return highlighted
 
     def _markdown_to_html(self, markdown_content: str) -> str:
-        """Convert markdown to HTML with basic formatting."""
-        # Convert headers
-        content = re.sub(r'^# (.*?)$', r'<h1>\1</h1>', markdown_content, flags=re.MULTILINE)
-        content = re.sub(r'^## (.*?)$', r'<h2>\1</h2>', content, flags=re.MULTILINE)
-        content = re.sub(r'^### (.*?)$', r'<h3>\1</h3>', content, flags=re.MULTILINE)
-        
-        # Convert code blocks
-        content = re.sub(
-            r'```(\w+)\n(.*?)\n```',
-            lambda m: f'<div class="code-block"><div class="code-block-header">{m.group(1)}</div><pre><code>{m.group(2)}</code></pre></div>',
-            content,
-            flags=re.DOTALL
-        )
-        
-        # Convert inline code
-        content = re.sub(r'`(.*?)`', r'<code>\1</code>', content)
-        
-        # Convert bold and italic
-        content = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', content)
-        content = re.sub(r'\*(.*?)\*', r'<em>\1</em>', content)
-        
-        # Convert lists
-        content = re.sub(r'^\- (.*?)$', r'<li>\1</li>', content, flags=re.MULTILINE)
-        content = content.replace('<li>', '<ul><li>').replace('</li>\n\n', '</li></ul>\n\n')
-        
-        # Convert metrics JSON blocks
-        content = re.sub(
-            r'```json\n(.*?)\n```',
-            lambda m: f'<div class="metrics">{self._format_metrics_html(m.group(1))}</div>',
-            content,
-            flags=re.DOTALL
-        )
-        
-        # Convert paragraphs
-        content = re.sub(r'\n\n(.*?)\n\n', r'\n\n<p>\1</p>\n\n', content)
-        
-        return content
+        """Convert markdown to HTML in one linear pass; ```json blocks become metrics tables."""
+        return markdown_to_html(markdown_content, render_json=self._format_metrics_html)
 
     def _format_metrics_html(self, metrics_json: str) -> str:
         """Format metrics JSON as an HTML table."""
@@ -914,8 +1493,8 @@ Make it professional, clear, and detailed like official library documentation.""
                     formatted_value = f"{value:.2f}" if isinstance(value, float) else str(value)
                 else:
                     formatted_value = str(value)
-                rows.append(f"<tr><th>{formatted_key}</th><td>{formatted_value}</td></tr>")
-                
+                rows.append(f"<tr><th>{html.escape(formatted_key)}</th><td>{html.escape(formatted_value)}</td></tr>")
+
             return f"""
                 <table class="metrics-table">
                     <tbody>
@@ -923,8 +1502,9 @@ Make it professional, clear, and detailed like official library documentation.""
                     </tbody>
                 </table>
             """
-        except json.JSONDecodeError:
-            return f"<pre>{metrics_json}</pre>"
+        except (json.JSONDecodeError, AttributeError):
+            # Not a metrics object (e.g. another JSON fence in an AI description)
+            return f"<pre>{html.escape(metrics_json)}</pre>"
 
     def _generate_toc(self, doc: Documentation) -> str:
         """Generate table of contents for detailed template."""
@@ -934,7 +1514,7 @@ Make it professional, clear, and detailed like official library documentation.""
         ]
         
         for i, block in enumerate(doc.code_blocks, 1):
-            first_line = block.content.split('\n')[0].strip()
+            first_line = block.first_line.strip()
             toc_items.append(f"  - [Block {i}: {first_line}](#block-at-line-{block.line_number})")
             
         if doc.metrics:
@@ -944,7 +1524,7 @@ Make it professional, clear, and detailed like official library documentation.""
 
     def _export_json(self, doc: Documentation, template: str) -> str:
         """Export documentation to JSON format."""
-        return json.dumps({
+        return codec.dumps_str({
             'title': doc.title,
             'description': doc.description,
             'language': doc.language,
@@ -954,47 +1534,27 @@ Make it professional, clear, and detailed like official library documentation.""
                     'content': block.content,
                     'language': block.language,
                     'line_number': block.line_number,
-                    'metrics': {
-                        'loc': len(block.content.split('\n')),
+                    'metrics': block.metrics or {
+                        'loc': block.line_count,
                         'complexity': self._calculate_complexity(block)
                     }
                 }
                 for block in doc.code_blocks
             ]
-        }, indent=2)
+        }, pretty=not Config.JSON_EXPORT_COMPACT)
 
     def _export_pdf(self, doc: Documentation, template: str) -> bytes:
-        """Export documentation to PDF format using reportlab."""
-        buffer = BytesIO()
-        doc_pdf = SimpleDocTemplate(buffer, pagesize=letter)
-        styles = getSampleStyleSheet()
-        
-        # Create content
-        content = []
-        
-        # Add title
-        content.append(Paragraph(f"# {doc.language} Documentation", styles['Heading1']))
-        content.append(Spacer(1, 12))
-        
-        # Add code blocks with syntax highlighting
-        for block in doc.code_blocks:
-            content.append(Paragraph("Code:", styles['Heading2']))
-            content.append(Preformatted(block.content, styles['Code']))
-            content.append(Spacer(1, 12))
-        
-        doc_pdf.build(content)
-        return buffer.getvalue()
+        """Export documentation to PDF format using reportlab, in the render pool."""
+        return self.render_pool.render('pdf', self._render_payload(doc))
 
     def _export_docx(self, doc: Documentation, template: str) -> bytes:
-        """Export documentation to DOCX format."""
-        docx_document = Document()
-        docx_document.add_heading(f"{doc.language} Documentation", 0)
-        
-        for block in doc.code_blocks:
-            docx_document.add_heading("Code:", level=2)
-            docx_document.add_paragraph(block.content, style='Normal')
-        
-        buffer = BytesIO()
-        docx_document.save(buffer)
-        buffer.seek(0)
-        return buffer.read()
\ No newline at end of file
+        """Export documentation to DOCX format, in the render pool."""
+        return self.render_pool.render('docx', self._render_payload(doc))
+
+    def _render_payload(self, doc: Documentation) -> Dict[str, Any]:
+        """The parts of a document the binary renderers use, as plain data for the worker process."""
+        return {
+            'title': doc.title,
+            'language': doc.language,
+            'blocks': [block.content for block in doc.code_blocks]
+        }
\ No newline at end of file
@@ -12,6 +12,9 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import secrets
 from urllib.parse import urlencode  # Add this import
 from flask import jsonify  # Add this import
+from utils.deadline import Deadline
+from utils.file_scanner import DEFAULT_SKIP_DIRS, FileScanner, ScannedFile
+from utils.validators import LANGUAGE_BY_EXTENSION
 
 @dataclass
 class CachedResponse:
@@ -46,6 +49,12 @@ class GitHubService:
 
         self._cache: Dict[str, CachedResponse] = {}
         self.cache_ttl = cache_ttl
+        self.scanner = FileScanner(
+            extensions=LANGUAGE_BY_EXTENSION,
+            skip_dirs=DEFAULT_SKIP_DIRS.union(Config.SCAN_SKIP_DIRS),
+            max_file_bytes=Config.SCAN_MAX_FILE_BYTES,
+            workers=Config.SCAN_WORKERS
+        )
 
     def _validate_credentials(self) -> bool:
         """Validate GitHub credentials by making a test API call"""
@@ -62,6 +71,18 @@ class GitHubService:
         except requests.exceptions.RequestException:
             return False
 
+    def _get(self, url: str, deadline: Optional[Deadline] = None) -> requests.Response:
+        """GET ``url`` with a timeout no longer than what is left of ``deadline``."""
+        if deadline is None:
+            return requests.get(url, headers=self.headers, timeout=Config.GITHUB_TIMEOUT)
+        if not deadline.check():
+            raise requests.exceptions.Timeout("Request deadline reached")
+        try:
+            return requests.get(url, headers=self.headers, timeout=deadline.timeout(Config.GITHUB_TIMEOUT))
+        except requests.exceptions.Timeout:
+            deadline.check()  # Flags the request as cut short if it was the deadline that ran out
+            raise
+
     def _check_rate_limit(self) -> bool:
         """Check if we're within GitHub's rate limits"""
         if time.time() < self.rate_limit_reset:
@@ -102,14 +123,18 @@ class GitHubService:
         Returns:
             List[str]: List of file paths that need documentation
         """
-        files_to_document = []
-        for root, _, files in os.walk(repo_path):
-            for file in files:
-                if file.endswith(('.py', '.js', '.java', '.cpp', '.cs')):
-                    files_to_document.append(os.path.join(root, file))
-        return files_to_document
+        return [scanned.path for scanned in self.scan_repository_files(repo_path)]
 
-    def get_repository_info(self, owner: str, repo: str) -> Dict[str, Any]:
+    def scan_repository_files(self, repo_path: str) -> List[ScannedFile]:
+        """
+        Scan the repository for source files in a supported language, with size and mtime.
+
+        Ignored (.gitignore/.ignore), vendored, virtualenv and build directories are
+        pruned without being walked; files over SCAN_MAX_FILE_BYTES are left out.
+        """
+        return self.scanner.scan(repo_path)
+
+    def get_repository_info(self, owner: str, repo: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """Get repository information with caching"""
         if not self.token:
             return {'error': 'GitHub token not configured'}
@@ -127,7 +152,7 @@ class GitHubService:
         repo_url = f"{self.base_url}/repos/{owner}/{repo}"
         
         try:
-            response = requests.get(repo_url, headers=self.headers, timeout=10)
+            response = self._get(repo_url, deadline)
             if response.status_code == 401:
                 return {'error': 'Invalid GitHub credentials'}
             response.raise_for_status()
@@ -144,20 +169,25 @@ class GitHubService:
         except requests.exceptions.RequestException as e:
             return {'error': f'Failed to fetch repository: {str(e)}'}
 
-    def analyze_repository(self, owner: str, repo: str) -> Dict[str, Any]:
-        """Advanced repository analysis"""
+    def analyze_repository(self, owner: str, repo: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """
+        Advanced repository analysis.
+
+        Sections that fail or do not fit ``deadline`` hold an error and mark the
+        analysis ``partial``; a partial analysis is not cached.
+        """
         try:
             # Get basic repo info
-            repo_info = self.get_repository_info(owner, repo)
+            repo_info = self.get_repository_info(owner, repo, deadline)
             if 'error' in repo_info:
                 return repo_info
 
             # Get additional data in parallel
             with ThreadPoolExecutor(max_workers=3) as executor:
                 futures = {
-                    'contributors': executor.submit(self._get_contributors, owner, repo),
-                    'languages': executor.submit(self._get_languages, owner, repo),
-                    'activity': executor.submit(self._get_activity_metrics, owner, repo)
+                    'contributors': executor.submit(self._get_contributors, owner, repo, deadline),
+                    'languages': executor.submit(self._get_languages, owner, repo, deadline),
+                    'activity': executor.submit(self._get_activity_metrics, owner, repo, deadline)
                 }
                 
                 results = {}
@@ -175,6 +205,9 @@ class GitHubService:
                 'activity': results['activity'],
                 'analyzed_at': time.time()
             }
+            if any('error' in result for result in results.values()) or (deadline and deadline.cut_short):
+                analysis['partial'] = True
+                return analysis
 
             # Cache the analysis
             cache_key = f"{owner}/{repo}/analysis"
@@ -189,14 +222,15 @@ class GitHubService:
             logging.error(f"Repository analysis failed: {str(e)}")
             return {'error': f'Analysis failed: {str(e)}'}
 
-    def batch_process_repositories(self, repos: List[Dict[str, str]]) -> Dict[str, Any]:
-        """Process multiple repositories in parallel"""
+    def batch_process_repositories(self, repos: List[Dict[str, str]],
+                                   deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+        """Process multiple repositories in parallel, all within one ``deadline``"""
         results = {}
         errors = []
         
         with ThreadPoolExecutor(max_workers=5) as executor:
             future_to_repo = {
-                executor.submit(self.analyze_repository, repo['owner'], repo['name']): repo
+                executor.submit(self.analyze_repository, repo['owner'], repo['name'], deadline): repo
                 for repo in repos
             }
             
@@ -219,10 +253,10 @@ class GitHubService:
             'failed': len(errors)
         }
 
-    def _get_contributors(self, owner: str, repo: str) -> Dict[str, Any]:
+    def _get_contributors(self, owner: str, repo: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """Get repository contributors with statistics"""
         url = f"{self.base_url}/repos/{owner}/{repo}/contributors"
-        response = requests.get(url, headers=self.headers)
+        response = self._get(url, deadline)
         if response.status_code == 200:
             contributors = response.json()
             return {
@@ -231,10 +265,10 @@ class GitHubService:
             }
         return {'error': f'Failed to fetch contributors: {response.status_code}'}
 
-    def _get_languages(self, owner: str, repo: str) -> Dict[str, Any]:
+    def _get_languages(self, owner: str, repo: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """Get repository language statistics"""
         url = f"{self.base_url}/repos/{owner}/{repo}/languages"
-        response = requests.get(url, headers=self.headers)
+        response = self._get(url, deadline)
         if response.status_code == 200:
             languages = response.json()
             total = sum(languages.values())
@@ -244,15 +278,15 @@ class GitHubService:
             }
         return {'error': f'Failed to fetch languages: {response.status_code}'}
 
-    def _get_activity_metrics(self, owner: str, repo: str) -> Dict[str, Any]:
+    def _get_activity_metrics(self, owner: str, repo: str, deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """Get repository activity metrics"""
         # Get commit activity
         commit_url = f"{self.base_url}/repos/{owner}/{repo}/stats/commit_activity"
-        commit_response = requests.get(commit_url, headers=self.headers)
+        commit_response = self._get(commit_url, deadline)
         
         # Get code frequency
         frequency_url = f"{self.base_url}/repos/{owner}/{repo}/stats/code_frequency"
-        frequency_response = requests.get(frequency_url, headers=self.headers)
+        frequency_response = self._get(frequency_url, deadline)
         
         metrics = {
             'commit_activity': commit_response.json() if commit_response.status_code == 200 else None,
@@ -318,7 +352,8 @@ class GitHubService:
         }
         response = requests.post(f"{self.oauth_url}/access_token", 
                                  headers={"Accept": "application/json"},
-                                 data=data)
+                                 data=data,
+                                 timeout=Config.GITHUB_TIMEOUT)
         if response.status_code != 200:
             raise Exception("Failed to get access token")
         return response.json()['access_token']
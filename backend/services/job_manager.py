@@ -0,0 +1,191 @@
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from utils.persistent_cache import PersistentCache
+
+JobHandler = Callable[..., Any]
+ProgressReporter = Callable[[Dict[str, Any]], None]
+JobValidator = Callable[[Dict[str, Any]], None]
+
+
+class JobQueueFull(RuntimeError):
+    """Raised when ``max_pending`` jobs are already queued or running in this worker."""
+
+
+class JobManager:
+    """
+    Runs slow requests (AI generation, batch GitHub analysis) as background jobs.
+
+    ``submit`` validates the parameters, stores a ``queued`` record and hands
+    the job to a thread pool of ``max_concurrent`` threads, so the request
+    returns at once with the job id. Records, results included, live in a
+    ``PersistentCache`` for ``ttl`` seconds, so any gunicorn worker can
+    answer a status poll, not only the one running the job. ``get`` can
+    long-poll: it waits on the job's completion event when the job runs in
+    this process and re-reads the store otherwise. At most ``max_pending``
+    jobs are accepted per worker; past that ``submit`` raises ``JobQueueFull``.
+    Handlers registered with ``reports_progress`` also get a ``report``
+    callable whose dict is stored as the record's ``progress``.
+    """
+
+    TERMINAL = ('succeeded', 'failed')
+
+    def __init__(self, store: PersistentCache, max_concurrent: int = 4, max_pending: int = 64,
+                 ttl: float = 3600, poll_interval: float = 0.5):
+        self.store = store
+        self.max_concurrent = max_concurrent
+        self.max_pending = max_pending
+        self.ttl = ttl
+        self.poll_interval = poll_interval
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.rejected = 0
+        self._handlers: Dict[str, JobHandler] = {}
+        self._validators: Dict[str, Optional[JobValidator]] = {}
+        self._reports_progress: Dict[str, bool] = {}
+        # job id -> completion event, for jobs queued or running in this process
+        self._events: Dict[str, threading.Event] = {}
+        self._running = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(__name__)
+
+    def register(self, job_type: str, handler: JobHandler, validate: Optional[JobValidator] = None,
+                 reports_progress: bool = False) -> None:
+        """Add a job type; ``validate`` runs at submit time and raises ValueError on bad params."""
+        self._handlers[job_type] = handler
+        self._validators[job_type] = validate
+        self._reports_progress[job_type] = reports_progress
+
+    @property
+    def job_types(self):
+        return sorted(self._handlers)
+
+    def submit(self, job_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        if job_type not in self._handlers:
+            raise ValueError(f"Unknown job type: {job_type}. Supported: {', '.join(self.job_types)}")
+        if not isinstance(params, dict):
+            raise ValueError("params must be an object")
+        validate = self._validators[job_type]
+        if validate is not None:
+            validate(params)
+
+        with self._lock:
+            if len(self._events) >= self.max_pending:
+                self.rejected += 1
+                raise JobQueueFull(f"Too many pending jobs ({self.max_pending})")
+            job_id = uuid.uuid4().hex
+            self._events[job_id] = threading.Event()
+            self.submitted += 1
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_concurrent,
+                                                    thread_name_prefix='job')
+            executor = self._executor
+
+        record = {
+            'id': job_id,
+            'type': job_type,
+            'status': 'queued',
+            'created_at': time.time(),
+            'started_at': None,
+            'finished_at': None
+        }
+        self._save(record)
+        executor.submit(self._run, record, params)
+        return record
+
+    def _run(self, record: Dict[str, Any], params: Dict[str, Any]) -> None:
+        with self._lock:
+            self._running += 1
+        record = dict(record, status='running', started_at=time.time())
+        self._save(record)
+        try:
+            handler = self._handlers[record['type']]
+            if self._reports_progress[record['type']]:
+                result = handler(params, self._reporter(record))
+            else:
+                result = handler(params)
+            record.update(status='succeeded', result=result)
+        except Exception as e:
+            self._logger.exception(f"Job {record['id']} ({record['type']}) failed")
+            record.update(status='failed', error=str(e))
+        record['finished_at'] = time.time()
+
+        if not self._save(record) and record['status'] == 'succeeded':
+            # Result too large for the store or not JSON serializable
+            record.pop('result')
+            record.update(status='failed', error='Job result could not be stored')
+            self._save(record)
+
+        with self._lock:
+            self._running -= 1
+            if record['status'] == 'succeeded':
+                self.succeeded += 1
+            else:
+                self.failed += 1
+            event = self._events.pop(record['id'], None)
+        if event is not None:
+            event.set()
+
+    def _reporter(self, record: Dict[str, Any], interval: float = 0.5) -> ProgressReporter:
+        last_saved = [0.0]
+
+        def report(progress: Dict[str, Any]) -> None:
+            record['progress'] = progress
+            # Throttled: a job over thousands of items must not write the store per item
+            now = time.monotonic()
+            if now - last_saved[0] >= interval:
+                last_saved[0] = now
+                self._save(record)
+        return report
+
+    def _save(self, record: Dict[str, Any]) -> bool:
+        return self.store.set(self._key(record['id']), record, ttl=self.ttl)
+
+    @staticmethod
+    def _key(job_id: str) -> str:
+        return f"job:{job_id}"
+
+    def get(self, job_id: str, wait: float = 0) -> Optional[Dict[str, Any]]:
+        """Job record, or None if unknown or expired; with ``wait`` blocks until it finishes or time is up."""
+        record = self.store.get(self._key(job_id))
+        if record is None or record['status'] in self.TERMINAL or wait <= 0:
+            return record
+
+        deadline = time.monotonic() + wait
+        event = self._events.get(job_id)
+        if event is not None:
+            event.wait(wait)
+        else:
+            # Running in another worker; only the store is shared
+            while time.monotonic() < deadline:
+                time.sleep(min(self.poll_interval, max(0.0, deadline - time.monotonic())))
+                record = self.store.get(self._key(job_id))
+                if record is None or record['status'] in self.TERMINAL:
+                    return record
+        return self.store.get(self._key(job_id))
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'max_concurrent': self.max_concurrent,
+                'max_pending': self.max_pending,
+                'pending': len(self._events),
+                'running': self._running,
+                'submitted': self.submitted,
+                'succeeded': self.succeeded,
+                'failed': self.failed,
+                'rejected': self.rejected,
+                'ttl': self.ttl
+            }
@@ -0,0 +1,13 @@
+# backend/services/parsers/__init__.py
+from .python_parser import PythonSymbol, ParsedPython, parse_python
+from .brace_parser import BraceSymbol, ParsedBraces, parse_braces, BRACE_LANGUAGES
+from .complexity import cyclomatic_complexity
+from .source_stats import SourceStats, SpanStats, scan_source
+from .source_tokens import pygments_lexer
+
+__all__ = [
+    'PythonSymbol', 'ParsedPython', 'parse_python',
+    'BraceSymbol', 'ParsedBraces', 'parse_braces', 'BRACE_LANGUAGES',
+    'cyclomatic_complexity', 'SourceStats', 'SpanStats', 'scan_source',
+    'pygments_lexer'
+]
@@ -0,0 +1,549 @@
+"""
+Brace-aware block parser shared by the C-family front ends (Java, C++, C#,
+JavaScript and TypeScript).
+
+A single compiled regex per language streams over the source and only stops
+on structural events: braces, comments, string literals and (C++/C#)
+preprocessor lines. Comments and strings are consumed whole, so braces inside
+them are never counted. Declaration headers (the text between the previous
+statement boundary and an opening brace) are classified by a regex fast path
+for the common shapes and a small token scan otherwise, and function bodies
+are matched whole by a second regex where their nesting allows, which keeps
+the whole parse linear in the size of the input.
+"""
+
+import re
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+
+@dataclass(**({'slots': True} if sys.version_info >= (3, 10) else {}))
+class BraceSymbol:
+    name: str
+    qualname: str
+    kind: str  # 'class', 'interface', 'struct', 'enum', 'namespace', 'function' or 'method'
+    start_offset: int
+    end_offset: int  # one past the closing brace
+    line_number: int
+    end_line: int
+    parent: Optional[str] = None
+
+
+@dataclass
+class ParsedBraces:
+    language: str
+    symbols: Dict[str, BraceSymbol]
+    blocks: List[BraceSymbol]  # top-level declarations (namespaces are transparent)
+
+
+BRACE_LANGUAGES = ('java', 'cpp', 'csharp', 'javascript', 'typescript')
+
+_CONTAINERS = {
+    'java': {'class': 'class', 'interface': 'interface', 'enum': 'enum', 'record': 'class'},
+    'cpp': {'class': 'class', 'struct': 'struct', 'union': 'struct', 'enum': 'enum', 'namespace': 'namespace'},
+    'csharp': {'class': 'class', 'interface': 'interface', 'struct': 'struct', 'enum': 'enum',
+               'record': 'class', 'namespace': 'namespace'},
+    'javascript': {'class': 'class'},
+    'typescript': {'class': 'class', 'interface': 'interface', 'enum': 'enum',
+                   'namespace': 'namespace', 'module': 'namespace'},
+}
+
+_CONTROL_KEYWORDS = frozenset({
+    'if', 'else', 'for', 'foreach', 'while', 'do', 'switch', 'case', 'catch', 'try', 'finally',
+    'synchronized', 'using', 'lock', 'fixed', 'unsafe', 'checked', 'unchecked', 'with',
+    'return', 'throw', 'new', 'await', 'yield', 'typeof', 'sizeof', 'delete', 'in', 'of',
+})
+
+_ACCESS_LABELS = frozenset({'public', 'private', 'protected', 'internal', 'signals', 'slots'})
+
+_HEADER_TOKEN = re.compile(
+    r'"(?:\\.|[^"\\])*"'
+    r"|'(?:\\.|[^'\\])*'"
+    r'|@?[A-Za-z_$~][\w$]*(?:\s*::\s*~?[A-Za-z_$][\w$]*)*'
+    r'|::|=>|->|==|!=|<=|>=|[=(){}<>\[\]:,@.*&!+\-/%|^]'
+)
+
+_MEMBER_OWNERS = ('class', 'interface', 'struct', 'enum')
+
+_WORD_START = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ_$~')
+
+
+def _is_name(token: str) -> bool:
+    return token[0] in _WORD_START
+
+
+# Comments and string literals, written as unrolled loops ("normal* (special normal*)*") so the
+# engine runs through their ordinary characters without trying an alternation per character.
+# Unterminated block comments run to the end of input, unterminated strings to the end of the line
+_COMMENT = r'//[^\n]*|/\*[^*]*(?:\*+[^*/][^*]*)*(?:\*+/)?'
+_PREPROC = r'\#[^\n\\]*(?:\\[\s\S][^\n\\]*)*'
+
+
+def _strings(language: str) -> str:
+    strings = r'"[^"\\\n]*(?:\\.[^"\\\n]*)*"?|\'[^\'\\\n]*(?:\\.[^\'\\\n]*)*\'?'
+    if language in ('javascript', 'typescript'):
+        strings += r'|`[^`\\]*(?:\\[\s\S][^`\\]*)*`?'
+    return strings
+
+
+@lru_cache(maxsize=None)
+def _event_pattern(language: str) -> 're.Pattern':
+    """
+    One alternation per language; everything that is not an event is skipped
+    inside the regex engine. Each match starts with a run of ordinary characters
+    (a tight loop in ``re``) and always ends on an event, a lone '/' or the end of
+    input, so matches tile the source and the engine never rescans a run.
+    Parentheses and semicolons are deliberately not events: they are counted with
+    ``str.count``/``str.rfind`` only when a brace needs its header, which keeps the
+    Python-level loop short.
+    """
+    first = '{}/"\'' + ('`' if language in ('javascript', 'typescript') else '')
+    parts = [
+        r'(?P<open>\{)',
+        r'(?P<close>\})',
+        rf'(?P<comment>{_COMMENT})',
+        rf'(?P<string>{_strings(language)})',
+    ]
+    if language in ('cpp', 'csharp'):
+        # Preprocessor lines may contain unbalanced braces (#define BEGIN {); outside strings
+        # and comments '#' only ever starts a directive in these languages
+        parts.insert(0, rf'(?P<preproc>{_PREPROC})')
+        first += '#'
+    parts.append(r'(?P<other>/|\Z)')
+    return re.compile(f"[^{re.escape(first)}]*(?:{'|'.join(parts)})")
+
+
+# Nesting handled inside the body-skip regex; deeper bodies fall back to the event loop
+_BODY_SKIP_DEPTH = 4
+_ATOMIC_GROUPS = sys.version_info >= (3, 11)
+
+
+@lru_cache(maxsize=None)
+def _body_pattern(language: str) -> 're.Pattern':
+    """
+    Match a whole function body (everything after its opening brace up to and including
+    the matching closing brace) inside the regex engine.
+
+    The tokens are the same strings and comments ``_event_pattern`` skips, so the end
+    found here is the one the event loop would find. Every token is atomic (an atomic
+    group and possessive runs on 3.11+, the ``(?=(?P<x>...))(?P=x)`` idiom before), so a
+    body the pattern cannot match (nested deeper than ``_BODY_SKIP_DEPTH``, or holding
+    a preprocessor line) fails in linear time instead of backtracking.
+    """
+    special = '{}/"\'' + ('`' if language in ('javascript', 'typescript') else '')
+    if language in ('cpp', 'csharp'):
+        special += '#'
+    run = f'[^{re.escape(special)}]'
+    common = rf'{_COMMENT}|{_strings(language)}|/(?![/*])'
+    body = ''
+    for level in range(_BODY_SKIP_DEPTH, 0, -1):
+        nested = rf'|\{{{body}\}}' if body else ''
+        if _ATOMIC_GROUPS:
+            body = f'{run}*+(?>(?:{common}{nested}){run}*+)*+'
+        else:
+            token = f'{run}+|{common}{nested}'
+            body = f'(?:(?=(?P<token{level}>{token}))(?P=token{level}))*'
+    return re.compile(rf'{body}\}}')
+
+
+_FIRST_WORD = re.compile(r'[\s,;)]*([A-Za-z_$][\w$]*)')
+
+
+def _strip_annotations(tokens: List[str]) -> List[str]:
+    """Drop Java/TS annotations and their arguments (@Foo, @a.b.Bar(x = 1))."""
+    kept = []
+    i, count = 0, len(tokens)
+    while i < count:
+        token = tokens[i]
+        if token[0] != '@' or len(token) == 1:
+            kept.append(token)
+            i += 1
+            continue
+        if token == '@interface':
+            kept.append('interface')
+            i += 1
+            continue
+        i += 1
+        while i + 1 < count and tokens[i] == '.':
+            i += 2
+        if i < count and tokens[i] == '(':
+            depth = 0
+            while i < count:
+                if tokens[i] == '(':
+                    depth += 1
+                elif tokens[i] == ')':
+                    depth -= 1
+                    if depth == 0:
+                        i += 1
+                        break
+                i += 1
+    return kept
+
+
+# Argument-free annotations (@Override) and C# attributes ([Serializable], [Route("x")])
+_FAST_DECORATIONS = r'(?:@[\w$.]+\s+|\[[^\[\]]*\]\s*)*'
+# Generic parameter and parameter lists with one level of nesting: <K, List<V>>, ({ a, b }: Props),
+# (cb: (x) => void); anything deeper is left to the token scan
+_FAST_GENERICS = r'<[^<>(){};]*(?:<[^<>(){};]*>[^<>(){};]*)*>'
+_FAST_PARAMS = r'\([^()]*(?:\([^()]*\)[^()]*)*\)'
+# Return types, const/throws/where clauses, and C++/C# constructor initializers (: base(x), value_(0))
+_FAST_SIGNATURE_TAIL = (
+    r'[^(){};=@\[\]"\']*'
+    r'(?::\s*[\w$:.<>]+\s*\([^()]*\)(?:\s*,\s*[\w$:.<>]+\s*\([^()]*\))*\s*)?'
+)
+
+_FAST_ACCESS_LABEL = re.compile(r'\s*(?:public|private|protected|internal|signals|slots)\s*:(?!:)')
+# Header characters that cannot appear in the tail of a declaration the fast path accepts
+_FAST_TAIL = r'''[^(){};=@\[\]"']'''
+
+
+def _not_one_of(words) -> str:
+    """Lookahead rejecting a whole word from ``words`` at the current position."""
+    return rf"(?!(?:{'|'.join(sorted(words, key=len, reverse=True))})(?![\w$]))"
+
+
+@lru_cache(maxsize=None)
+def _fast_patterns(language: str) -> Tuple['re.Pattern', Optional['re.Pattern'], 're.Pattern']:
+    """
+    Function, arrow function (JS/TS only) and container header regexes for ``language``.
+
+    Control-flow and container keywords are rejected inside the patterns, both as
+    prefix words and as names, so a match needs no further checks.
+    """
+    containers = _CONTAINERS[language]
+    prefix_word = _not_one_of(_CONTROL_KEYWORDS | set(containers))
+    function_name = _not_one_of(_CONTROL_KEYWORDS | set(containers) | {'function'})
+    function = re.compile(
+        rf'(?P<lead>\s*)(?=[\w$@~\[]){_FAST_DECORATIONS}(?P<prefix>(?:{prefix_word}[\w$<>,.*&?\[\]]+\s+)*)'
+        rf'{function_name}(?P<name>~?[A-Za-z_$][\w$]*)\s*(?:{_FAST_GENERICS}\s*)?{_FAST_PARAMS}'
+        rf'{_FAST_SIGNATURE_TAIL}'
+    )
+    arrow = re.compile(
+        rf'(?P<lead>\s*)(?=[\w$])(?P<prefix>(?:{prefix_word}[\w$]+\s+)*){function_name}(?P<name>[A-Za-z_$][\w$]*)'
+        rf'\s*=\s*(?:async\s*)?(?:{_FAST_GENERICS}\s*)?(?:{_FAST_PARAMS}|[A-Za-z_$][\w$]*)\s*'
+        rf'(?::{_FAST_TAIL}*)?=>\s*'
+    ) if language in ('javascript', 'typescript') else None
+    container = re.compile(
+        rf'(?P<lead>\s*)(?=[\w$@~\[]){_FAST_DECORATIONS}(?P<prefix>(?:{prefix_word}[\w$<>,*&]+\s+)*)'
+        rf"(?P<keyword>{'|'.join(containers)})\s+(?!(?:class|struct)(?![\w$]))"
+        r'(?P<name>[A-Za-z_$][\w$]*(?:\s*(?:::|\.)\s*~?[A-Za-z_$][\w$]*)*)'
+        rf'(?:{_FAST_TAIL}|new\s*\(\s*\))*'
+    )
+    return function, arrow, container
+
+
+def _classify_fast(header: str, language: str) -> Optional[Tuple[str, str, int]]:
+    """
+    Regex fast path for the common declaration shapes: classes (with C# attributes
+    and generic constraints), functions and methods (with generic parameters,
+    destructured or function-typed parameters and constructor initializers), and
+    JS/TS arrow functions bound to a name. A leading access label ("public:") is
+    skipped.
+
+    Returns None whenever the header is not one of those shapes; the caller then
+    falls back to the full token scan, which gives the same answer for every
+    header this path accepts.
+    """
+    if 'operator' in header:
+        return None
+    start = 0
+    if ':' in header:
+        label = _FAST_ACCESS_LABEL.match(header)
+        if label is not None:
+            start = label.end()
+    function, arrow, container = _fast_patterns(language)
+    if '(' in header:
+        match = function.fullmatch(header, start)
+        if match is None and arrow is not None and '=' in header:
+            match = arrow.fullmatch(header, start)
+        if match is not None:
+            return 'function', match.group('name'), match.end('lead')
+        # Otherwise possibly a container: "class Repo<T> where T : new()"
+    match = container.fullmatch(header, start)
+    if match is None:
+        return None
+    kind, name = _CONTAINERS[language][match.group('keyword')], match.group('name')
+    if '.' in name and kind != 'namespace':
+        return None
+    return kind, ''.join(name.split()), match.end('lead')
+
+
+def _classify_tokens(header: str, language: str) -> Optional[Tuple[str, str, int]]:
+    """Token scan for the headers ``_classify_fast`` does not accept; same result shape."""
+    if not any(marker in header for marker in '(=@"') and not any(
+            keyword in header for keyword in _CONTAINERS[language]):
+        # Without a parameter list, assignment, annotation, extern "C" or container keyword
+        # nothing below can match (e.g. C# properties, initializer lists)
+        return None
+    tokens = _HEADER_TOKEN.findall(header)
+    count = len(tokens)
+
+    # Drop separators left over from object literals/decorator calls and C++/Qt access labels ("public:")
+    start = position = 0
+    while start < count:
+        token = tokens[start]
+        if token in (',', ')'):
+            step = 1
+        elif token in _ACCESS_LABELS and start + 1 < count and tokens[start + 1] == ':':
+            step = 2
+        else:
+            break
+        for skipped in tokens[start:start + step]:
+            position = header.index(skipped, position) + len(skipped)
+        start += step
+    if start >= count:
+        return None
+    leading = header.index(tokens[start], position)
+    if start:
+        tokens = tokens[start:]
+
+    if '@' in header:
+        tokens = _strip_annotations(tokens)
+    for token in tokens:
+        if _is_name(token):
+            if token in _CONTROL_KEYWORDS:
+                return None
+            break
+    count = len(tokens)
+    if not count:
+        return None
+
+    if '[' in tokens:
+        # Attributes/indexers ([Serializable], int[] ...) may contain parentheses of their own
+        depth = 0
+        first_paren = assign = -1
+        for i, token in enumerate(tokens):
+            if token == '(' or token == '[':
+                if depth == 0 and token == '(' and first_paren < 0:
+                    first_paren = i
+                depth += 1
+            elif token == ')' or token == ']':
+                depth = max(depth - 1, 0)
+            elif token == '=' and depth == 0 and assign < 0 and (i == 0 or tokens[i - 1] != 'operator'):
+                assign = i
+    else:
+        first_paren = tokens.index('(') if '(' in tokens else -1
+        assign = tokens.index('=') if '=' in tokens else -1
+        if (first_paren >= 0 and assign > first_paren) or (assign > 0 and tokens[assign - 1] == 'operator'):
+            # Default parameter values and "operator=" are not assignments
+            assign = -1
+
+    if assign >= 0:
+        if language not in ('javascript', 'typescript'):
+            return None
+        rhs = tokens[assign + 1:]
+        is_function = 'function' in rhs or '=>' in rhs
+        if not is_function and 'class' not in rhs:
+            return None
+        names = [t for t in tokens[:assign] if _is_name(t)]
+        if not names:
+            return None
+        return ('function' if is_function else 'class'), names[-1], leading
+
+    containers = _CONTAINERS[language]
+    limit = first_paren if first_paren >= 0 else count
+    angle_depth = 0
+    for i in range(limit):
+        token = tokens[i]
+        if token not in containers:
+            if token == '<':
+                angle_depth += 1
+            elif token == '>' and angle_depth:
+                angle_depth -= 1
+            elif language == 'cpp' and token[0] == '"' and i > 0 and tokens[i - 1] == 'extern':
+                return 'namespace', f'extern {token}', leading
+            continue
+        if angle_depth or (i > 0 and tokens[i - 1] == '.'):
+            # "template <class T>" parameters and member access are not declarations
+            continue
+        if token == 'module' and (i == 0 or tokens[i - 1] not in ('declare', 'export')):
+            continue
+        name_index = next((j for j in range(i + 1, count)
+                           if (_is_name(tokens[j]) or tokens[j][0] in '"\'')
+                           and tokens[j] not in ('class', 'struct')), None)
+        if first_paren >= 0 and name_index is not None and name_index + 1 < first_paren:
+            between = tokens[name_index + 1:first_paren]
+            if not {':', 'where', 'extends', 'implements'} & set(between) and _is_name(tokens[first_paren - 1]):
+                # "struct Foo make(...)": a function returning a tagged type
+                break
+        name = tokens[name_index] if name_index is not None else '<anonymous>'
+        if containers[token] == 'namespace' and name_index is not None:
+            # Dotted namespaces (namespace App.Area) are one name
+            while name_index + 2 < count and tokens[name_index + 1] == '.' and _is_name(tokens[name_index + 2]):
+                name_index += 2
+                name = f'{name}.{tokens[name_index]}'
+        return containers[token], ''.join(name.split()), leading
+
+    if first_paren > 0:
+        before = tokens[first_paren - 1]
+        if before == '>' and (first_paren < 2 or tokens[first_paren - 2] != 'operator'):
+            # Generic parameters between the name and its parameter list: Find<TKey>(...)
+            depth, i = 0, first_paren - 1
+            while i >= 0:
+                if tokens[i] == '>':
+                    depth += 1
+                elif tokens[i] == '<':
+                    depth -= 1
+                    if not depth:
+                        break
+                i -= 1
+            if i < 1:
+                return None
+            before = tokens[i - 1]
+        if before == 'function':
+            # Anonymous function, optionally bound to an object key ("key: function () {")
+            if first_paren >= 3 and tokens[first_paren - 2] == ':' and _is_name(tokens[first_paren - 3]):
+                return 'function', tokens[first_paren - 3], leading
+            return 'function', '<anonymous>', leading
+        if _is_name(before):
+            return 'function', ''.join(before.split()), leading
+        if first_paren >= 2 and tokens[first_paren - 2] == 'operator':
+            return 'function', f'operator{before}', leading
+    return None
+
+
+def _declaration(header: str, language: str) -> Optional[Tuple[str, str, int]]:
+    """
+    Decide whether a header introduces a declaration.
+
+    Returns (kind, name, leading_offset) where leading_offset is where the
+    declaration starts inside ``header``, or None for control-flow blocks,
+    initializers and other anonymous braces.
+    """
+    declaration = _classify_fast(header, language)
+    if declaration is not None:
+        # The fast path rejects control-flow keywords itself
+        return declaration
+    first = _FIRST_WORD.match(header)
+    if first is not None and first.group(1) in _CONTROL_KEYWORDS:
+        return None
+    return _classify_tokens(header, language)
+
+
+def parse_braces(source: str, language: str) -> ParsedBraces:
+    """Parse a C-family source file into declarations with exact offsets."""
+    if language not in _CONTAINERS:
+        raise ValueError(f"Unsupported language: {language}")
+
+    symbols: Dict[str, BraceSymbol] = {}
+    blocks: List[BraceSymbol] = []
+    # Each frame: (symbol or None, enclosing symbol, open-paren balance carried from its header,
+    # start of the statement whose parameter list the brace is in, for braces inside parentheses)
+    frames: List[Tuple[Optional[BraceSymbol], Optional[BraceSymbol], int, Optional[int]]] = []
+    enclosing: Optional[BraceSymbol] = None
+    carry = 0  # unclosed '(' from before the last brace event, e.g. foo(function () {...}, ...)
+    header_start = 0
+    # Set after a brace inside parentheses closes, e.g. the destructuring in "function f({ a }) {":
+    # the header then starts before that brace rather than after it
+    paren_start: Optional[int] = None
+    end = len(source)
+    # Function bodies are opaque: only their brace depth matters, nested closures and local
+    # classes are part of the enclosing block rather than symbols of their own
+    body_depth = 0
+    shorthand_methods = language in ('javascript', 'typescript')
+
+    # Line numbers are counted incrementally between the (almost always increasing) offsets
+    # at which symbols start and end
+    line, counted = 1, 0
+
+    def line_at(offset: int) -> int:
+        nonlocal line, counted
+        if offset >= counted:
+            line += source.count('\n', counted, offset)
+        else:
+            line -= source.count('\n', offset, counted)
+        counted = offset
+        return line
+
+    next_event = _event_pattern(language).match
+    skip_body = _body_pattern(language).match
+    position = 0
+    while position < end:
+        match = next_event(source, position)
+        position = match.end()
+        event = match.lastgroup
+        if event == 'other':
+            continue
+        if body_depth:
+            if event == 'open':
+                body_depth += 1
+            elif event == 'close':
+                body_depth -= 1
+                if not body_depth:
+                    symbol, enclosing, carry, paren_start = frames.pop()
+                    symbol.end_offset = header_start = position
+                    symbol.end_line = line_at(position)
+            continue
+        if event == 'open':
+            segment = source[header_start:position - 1]
+            balance = carry + segment.count('(') - segment.count(')')
+            symbol = None
+            boundary = segment.rfind(';') + 1
+            # Braces inside an argument list are callbacks, lambdas or initializers, never declarations
+            if balance <= 0:
+                declaration = _declaration(segment[boundary:], language)
+                start = header_start + boundary
+                if declaration is None and paren_start is not None:
+                    declaration = _declaration(source[paren_start:position - 1], language)
+                    start = paren_start
+                if declaration is not None and shorthand_methods and declaration[0] == 'function' and (
+                        enclosing is None or enclosing.kind != 'class' or frames[-1][0] is not enclosing):
+                    # Method shorthand ("name() {") only declares something directly in a class body;
+                    # elsewhere it is an object literal member
+                    header = source[start:position - 1]
+                    if 'function' not in header and '=>' not in header:
+                        declaration = None
+                if declaration is not None:
+                    kind, name, leading = declaration
+                    if kind == 'function' and enclosing is not None and enclosing.kind in _MEMBER_OWNERS:
+                        kind = 'method'
+                    qualname = f"{enclosing.qualname}.{name}" if enclosing else name
+                    if qualname in symbols:
+                        # Overloads share a name; keep every one of them addressable
+                        overload = 2
+                        while f"{qualname}#{overload}" in symbols:
+                            overload += 1
+                        qualname = f"{qualname}#{overload}"
+                    start += leading
+                    symbol = BraceSymbol(name, qualname, kind, start, end, line_at(start), 0,
+                                         enclosing.qualname if enclosing else None)
+                    symbols[qualname] = symbol
+                    if (enclosing is None or enclosing.kind == 'namespace') and kind != 'namespace':
+                        blocks.append(symbol)
+                statement_start = None
+            else:
+                statement_start = header_start + boundary if paren_start is None else paren_start
+            carry = 0
+            paren_start = None
+            header_start = position
+            if symbol is not None and symbol.kind in ('function', 'method'):
+                # Most bodies are matched whole by the regex engine; the rest are walked event by event
+                body = skip_body(source, position)
+                if body is not None:
+                    symbol.end_offset = header_start = position = body.end()
+                    symbol.end_line = line_at(position)
+                    continue
+                body_depth = 1
+            frames.append((symbol, enclosing, balance if balance > 0 else 0, statement_start))
+            if symbol is not None:
+                enclosing = symbol
+        elif event == 'close':
+            if frames:
+                symbol, enclosing, carry, paren_start = frames.pop()
+                if symbol is not None:
+                    symbol.end_offset = position
+                    symbol.end_line = line_at(position)
+            header_start = position
+        elif event != 'string':
+            # Comments (and preprocessor lines) directly before a declaration are not part of its header
+            if not source[header_start:match.start(event)].strip():
+                header_start = position
+
+    # Unclosed blocks run to EOF
+    for symbol, _, _, _ in frames:
+        if symbol is not None:
+            symbol.end_line = line_at(end)
+
+    return ParsedBraces(language=language, symbols=symbols, blocks=blocks)
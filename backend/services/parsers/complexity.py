@@ -0,0 +1,64 @@
+"""
+Single-scan cyclomatic complexity for code blocks.
+
+Each language's decision points are compiled once into one alternation
+together with its comment and string syntax. Comments and strings match
+first and are skipped, so keywords inside them are never counted, and the
+whole block is scanned exactly once.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, Tuple
+
+_C_FAMILY_POINTS = (('if', 'for', 'foreach', 'while', 'case', 'catch'), ('&&', '||', '??'))
+
+# (keywords, operators) that each add one decision point
+_DECISION_POINTS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    'python': (('if', 'elif', 'for', 'while', 'and', 'or', 'except', 'with', 'case'), ()),
+    'javascript': _C_FAMILY_POINTS,
+    'typescript': _C_FAMILY_POINTS,
+    'java': _C_FAMILY_POINTS,
+    'cpp': _C_FAMILY_POINTS,
+    'csharp': _C_FAMILY_POINTS,
+}
+
+_SKIPPED: Dict[str, str] = {
+    'python': r'#[^\n]*|"""[\s\S]*?(?:"""|\Z)|\'\'\'[\s\S]*?(?:\'\'\'|\Z)'
+              r'|"(?:\\.|[^"\\\n])*"?|\'(?:\\.|[^\'\\\n])*\'?',
+    'c_family': r'//[^\n]*|/\*[\s\S]*?(?:\*/|\Z)|"(?:\\.|[^"\\\n])*"?|\'(?:\\.|[^\'\\\n])*\'?',
+    'js_family': r'//[^\n]*|/\*[\s\S]*?(?:\*/|\Z)|"(?:\\.|[^"\\\n])*"?|\'(?:\\.|[^\'\\\n])*\'?'
+                 r'|`(?:\\[\s\S]|[^`\\])*`?',
+}
+
+
+@lru_cache(maxsize=None)
+def _complexity_pattern(language: str) -> 're.Pattern':
+    """
+    Compile the skip-or-count alternation for ``language`` (unknown languages use Python's).
+
+    The leading lookahead lists every character a match can start with, so the regex
+    engine rejects ordinary characters without trying each branch.
+    """
+    if language not in _DECISION_POINTS:
+        language = 'python'
+    if language == 'python':
+        skipped, first = _SKIPPED['python'], '#"\''
+    elif language in ('javascript', 'typescript'):
+        skipped, first = _SKIPPED['js_family'], '/"\'`'
+    else:
+        skipped, first = _SKIPPED['c_family'], '/"\''
+    keywords, operators = _DECISION_POINTS[language]
+    points = [r'\b(?:' + '|'.join(sorted(keywords, key=len, reverse=True)) + r')\b']
+    points.extend(re.escape(operator) for operator in operators)
+    first += ''.join(sorted({token[0] for token in keywords + operators}))
+    return re.compile(f"(?=[{re.escape(first)}])(?:(?P<skip>{skipped})|(?P<point>{'|'.join(points)}))")
+
+
+def cyclomatic_complexity(code: str, language: str) -> int:
+    """Count decision points in ``code`` in one pass; a block with none has complexity 1."""
+    complexity = 1
+    for match in _complexity_pattern(language).finditer(code):
+        if match.lastgroup == 'point':
+            complexity += 1
+    return complexity
@@ -0,0 +1,133 @@
+"""
+Single-pass Python front end built on the standard library ``ast`` module.
+
+One ``ast.parse`` + one tree walk yields everything the generator needs:
+top-level blocks with exact line spans (decorators included), a symbol table
+covering nested classes/methods/closures, and McCabe-style complexity for
+every function and every block.
+"""
+
+import ast
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class PythonSymbol:
+    name: str
+    qualname: str
+    kind: str  # 'class', 'function' or 'method'
+    line_number: int  # first line, including decorators
+    end_line: int
+    decorators: List[str] = field(default_factory=list)
+    parent: Optional[str] = None
+    is_async: bool = False
+    docstring: Optional[str] = None
+    complexity: int = 1  # own decision points, nested definitions excluded
+    total_complexity: int = 1  # everything inside the definition's span
+
+
+@dataclass
+class ParsedPython:
+    tree: ast.Module
+    symbols: Dict[str, PythonSymbol]
+    blocks: List[PythonSymbol]  # top-level definitions, in source order
+    nodes: Dict[str, ast.AST]  # qualname -> definition node
+
+    def node_for(self, qualname: str) -> Optional[ast.AST]:
+        return self.nodes.get(qualname)
+
+
+_MATCH_CASE = getattr(ast, 'match_case', None)
+
+
+class _FrontEndVisitor(ast.NodeVisitor):
+    def __init__(self):
+        self.symbols: Dict[str, PythonSymbol] = {}
+        self.nodes: Dict[str, ast.AST] = {}
+        self.blocks: List[PythonSymbol] = []
+        self._stack: List[PythonSymbol] = []
+
+    def _visit_definition(self, node, kind: str) -> None:
+        parent = self._stack[-1] if self._stack else None
+        if kind == 'function' and parent is not None and parent.kind == 'class':
+            kind = 'method'
+        qualname = f"{parent.qualname}.{node.name}" if parent else node.name
+        if qualname in self.symbols:
+            # Property setters and redefinitions share a name; keep every one of them addressable
+            duplicate = 2
+            while f"{qualname}#{duplicate}" in self.symbols:
+                duplicate += 1
+            qualname = f"{qualname}#{duplicate}"
+        symbol = PythonSymbol(
+            name=node.name,
+            qualname=qualname,
+            kind=kind,
+            line_number=min([node.lineno] + [d.lineno for d in node.decorator_list]),
+            end_line=node.end_lineno or node.lineno,
+            decorators=[ast.unparse(d) for d in node.decorator_list],
+            parent=parent.qualname if parent else None,
+            is_async=isinstance(node, ast.AsyncFunctionDef),
+            docstring=ast.get_docstring(node)
+        )
+        self.symbols[qualname] = symbol
+        self.nodes[qualname] = node
+        if parent is None:
+            self.blocks.append(symbol)
+
+        # Decorators are evaluated in the enclosing scope
+        for expr in node.decorator_list:
+            self.visit(expr)
+        self._stack.append(symbol)
+        for child in node.body:
+            self.visit(child)
+        self._stack.pop()
+
+        if kind == 'class':
+            symbol.complexity = symbol.total_complexity
+        if parent is not None:
+            parent.total_complexity += symbol.total_complexity - 1
+
+    def visit_FunctionDef(self, node):
+        self._visit_definition(node, 'function')
+
+    def visit_AsyncFunctionDef(self, node):
+        self._visit_definition(node, 'function')
+
+    def visit_ClassDef(self, node):
+        self._visit_definition(node, 'class')
+
+    def _add(self, points: int) -> None:
+        if self._stack and points > 0:
+            current = self._stack[-1]
+            current.complexity += points
+            current.total_complexity += points
+
+    def generic_visit(self, node):
+        if isinstance(node, (ast.If, ast.IfExp, ast.Assert)):
+            self._add(1)
+        elif isinstance(node, (ast.For, ast.AsyncFor, ast.While)):
+            self._add(1 + bool(node.orelse))
+        elif isinstance(node, ast.Try):
+            self._add(len(node.handlers) + bool(node.orelse))
+        elif isinstance(node, ast.BoolOp):
+            self._add(len(node.values) - 1)
+        elif isinstance(node, ast.comprehension):
+            self._add(1 + len(node.ifs))
+        elif _MATCH_CASE is not None and isinstance(node, _MATCH_CASE):
+            self._add(1)
+        super().generic_visit(node)
+
+
+def parse_python(source: str) -> ParsedPython:
+    """
+    Parse Python source once and extract blocks, symbols and complexity.
+
+    Raises:
+        SyntaxError: If the source is not valid Python
+    """
+    tree = ast.parse(source)
+    visitor = _FrontEndVisitor()
+    for statement in tree.body:
+        visitor.visit(statement)
+    return ParsedPython(tree=tree, symbols=visitor.symbols, blocks=visitor.blocks, nodes=visitor.nodes)
@@ -0,0 +1,104 @@
+"""
+Line-level lexical statistics for a whole source file.
+
+One compiled regex per language walks the file once, classifying every
+token as comment, string or code and counting tokens per line. The results
+are kept as prefix sums, so LOC/SLOC/comment/token counts for any line span
+(a code block) are O(1) lookups instead of another pass over its text.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List
+
+_COMMENTS: Dict[str, str] = {
+    'python': r'#[^\n]*',
+    'c_family': r'//[^\n]*|/\*[\s\S]*?(?:\*/|\Z)',
+}
+
+_STRINGS: Dict[str, str] = {
+    'python': r'[rRbBuUfF]{0,2}(?:"""[\s\S]*?(?:"""|\Z)|\'\'\'[\s\S]*?(?:\'\'\'|\Z)'
+              r'|"(?:\\.|[^"\\\n])*"?|\'(?:\\.|[^\'\\\n])*\'?)',
+    'c_family': r'"(?:\\.|[^"\\\n])*"?|\'(?:\\.|[^\'\\\n])*\'?',
+    'js_family': r'"(?:\\.|[^"\\\n])*"?|\'(?:\\.|[^\'\\\n])*\'?|`(?:\\[\s\S]|[^`\\])*`?',
+}
+
+
+@dataclass
+class SpanStats:
+    loc: int
+    sloc: int  # lines with at least one code token
+    comment_lines: int
+    token_count: int
+
+
+@dataclass
+class SourceStats:
+    language: str
+    line_count: int
+    # Prefix sums over lines: entry i covers lines 1..i
+    sloc_prefix: List[int]
+    comment_prefix: List[int]
+    token_prefix: List[int]
+
+    def span(self, first_line: int, last_line: int) -> SpanStats:
+        """Statistics for lines ``first_line``..``last_line`` (1-based, inclusive)."""
+        first = min(max(first_line, 1), self.line_count + 1)
+        last = min(max(last_line, first - 1), self.line_count)
+        return SpanStats(
+            loc=last - first + 1,
+            sloc=self.sloc_prefix[last] - self.sloc_prefix[first - 1],
+            comment_lines=self.comment_prefix[last] - self.comment_prefix[first - 1],
+            token_count=self.token_prefix[last] - self.token_prefix[first - 1]
+        )
+
+    def total(self) -> SpanStats:
+        return self.span(1, self.line_count)
+
+
+@lru_cache(maxsize=None)
+def _token_pattern(language: str) -> 're.Pattern':
+    if language == 'python':
+        comments, strings = _COMMENTS['python'], _STRINGS['python']
+    elif language in ('javascript', 'typescript'):
+        comments, strings = _COMMENTS['c_family'], _STRINGS['js_family']
+    else:
+        comments, strings = _COMMENTS['c_family'], _STRINGS['c_family']
+    return re.compile(
+        f"(?P<nl>\\n)|(?P<comment>{comments})|(?P<string>{strings})"
+        r"|(?P<code>[A-Za-z_$][\w$]*|\d[\w.]*|[^\s\w])"
+    )
+
+
+def scan_source(source: str, language: str) -> SourceStats:
+    """Lex ``source`` once and build per-line prefix sums of code, comment and token counts."""
+    line_count = source.count('\n') + 1
+    sloc = bytearray(line_count + 1)
+    comments = bytearray(line_count + 1)
+    tokens = [0] * (line_count + 1)
+
+    line = 1
+    for match in _token_pattern(language).finditer(source):
+        kind = match.lastgroup
+        if kind == 'nl':
+            line += 1
+            continue
+        tokens[line] += 1
+        if kind == 'code':
+            sloc[line] = 1
+            continue
+        text = match.group()
+        span = text.count('\n')
+        flags = comments if kind == 'comment' else sloc
+        for covered in range(line, line + span + 1):
+            flags[covered] = 1
+        line += span
+
+    sloc_prefix, comment_prefix, token_prefix = [0], [0], [0]
+    for i in range(1, line_count + 1):
+        sloc_prefix.append(sloc_prefix[-1] + sloc[i])
+        comment_prefix.append(comment_prefix[-1] + comments[i])
+        token_prefix.append(token_prefix[-1] + tokens[i])
+
+    return SourceStats(language, line_count, sloc_prefix, comment_prefix, token_prefix)
@@ -0,0 +1,20 @@
+"""
+Pygments lexers for highlighting, created once per language.
+
+``get_lexer_by_name`` walks the lexer registry and builds a new lexer on every
+call; code blocks are highlighted one at a time, so the lexer is looked up once
+per language and shared by every block. Pygments is imported on first use.
+"""
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=64)
+def pygments_lexer(language: str):
+    """Pygments lexer for ``language`` (plain text if unknown), created once per language."""
+    from pygments.lexers import get_lexer_by_name
+    from pygments.util import ClassNotFound
+    try:
+        return get_lexer_by_name(language, stripnl=False, ensurenl=False)
+    except ClassNotFound:
+        return get_lexer_by_name('text', stripnl=False, ensurenl=False)
@@ -0,0 +1,218 @@
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from io import BytesIO
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+def render_pdf(payload: Dict[str, Any]) -> bytes:
+    """PDF export of ``payload`` (see ``DocumentationGenerator._render_payload``) using reportlab."""
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Preformatted
+
+    buffer = BytesIO()
+    doc_pdf = SimpleDocTemplate(buffer, pagesize=letter)
+    styles = getSampleStyleSheet()
+
+    content = [Paragraph(f"# {payload['language']} Documentation", styles['Heading1']), Spacer(1, 12)]
+    for block in payload['blocks']:
+        content.append(Paragraph("Code:", styles['Heading2']))
+        content.append(Preformatted(block, styles['Code']))
+        content.append(Spacer(1, 12))
+
+    doc_pdf.build(content)
+    return buffer.getvalue()
+
+
+def render_docx(payload: Dict[str, Any]) -> bytes:
+    """DOCX export of ``payload`` using python-docx."""
+    from docx import Document
+
+    docx_document = Document()
+    docx_document.add_heading(f"{payload['language']} Documentation", 0)
+    for block in payload['blocks']:
+        docx_document.add_heading("Code:", level=2)
+        docx_document.add_paragraph(block, style='Normal')
+
+    buffer = BytesIO()
+    docx_document.save(buffer)
+    return buffer.getvalue()
+
+
+RENDERERS: Dict[str, Callable[[Dict[str, Any]], bytes]] = {
+    'pdf': render_pdf,
+    'docx': render_docx
+}
+
+
+def _timed(renderer: Callable[[Dict[str, Any]], bytes], payload: Dict[str, Any]) -> Tuple[bytes, float]:
+    # Runs in the worker process, so the time excludes queueing and pickling
+    started = time.perf_counter()
+    return renderer(payload), time.perf_counter() - started
+
+
+class RenderQueueFull(RuntimeError):
+    """Raised when ``max_queue`` renders are already queued or running."""
+
+
+class RenderTimeout(TimeoutError):
+    """Raised when a render does not finish within the pool's timeout."""
+
+
+class RenderPool:
+    """
+    Renders binary exports (PDF/DOCX) in a separate process pool.
+
+    reportlab and python-docx are CPU-bound and hold the GIL, so rendering
+    in the request thread stalls every other request on the worker. Jobs
+    are admitted up to ``max_queue`` at once (running plus waiting); past
+    that ``render`` raises ``RenderQueueFull`` instead of piling up. A
+    caller waits at most ``timeout`` seconds. A job still running then is
+    hung as far as the pool is concerned: its worker processes are
+    terminated, which frees its queue slot, and the next render starts a
+    fresh pool. Renders in flight on the terminated pool fail with it.
+    Processes are started on first use, with ``spawn`` so they do not
+    inherit the server's threads and locks. ``workers=0`` renders inline,
+    for tests and single-process tools.
+    """
+
+    def __init__(self, workers: int = 2, max_queue: int = 8, timeout: float = 60,
+                 renderers: Optional[Dict[str, Callable[[Dict[str, Any]], bytes]]] = None):
+        self.workers = workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.renderers = renderers if renderers is not None else RENDERERS
+        self.rendered = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.failures = 0
+        self._depth = 0
+        self._render_seconds: List[float] = []
+        self._wait_seconds: List[float] = []
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(__name__)
+
+    def render(self, format: str, payload: Dict[str, Any]) -> bytes:
+        renderer = self.renderers.get(format)
+        if renderer is None:
+            raise ValueError(f"No renderer for format: {format}")
+
+        with self._lock:
+            if self._depth >= self.max_queue:
+                self.rejected += 1
+                raise RenderQueueFull(f"Render queue is full ({self.max_queue} jobs)")
+            self._depth += 1
+
+        submitted = time.perf_counter()
+        if self.workers <= 0:
+            try:
+                content, render_seconds = _timed(renderer, payload)
+            except Exception:
+                self._finished(failed=True)
+                raise
+            self._finished(render_seconds=render_seconds, wait_seconds=0.0)
+            return content
+
+        executor = self._get_executor()
+        try:
+            future = executor.submit(_timed, renderer, payload)
+        except BrokenProcessPool:
+            self._reset(executor)
+            self._finished(failed=True)
+            raise RuntimeError(f"{format} render worker exited unexpectedly")
+        # Cleared by whichever releases the job's queue slot first: its completion or its timeout
+        slot = [True]
+        future.add_done_callback(lambda done: self._on_done(done, submitted, slot))
+
+        try:
+            content, _ = future.result(timeout=self.timeout)
+        except FutureTimeout:
+            with self._lock:
+                self.timeouts += 1
+            if self._claim(slot):
+                self._finished()
+            if not future.cancel():
+                # cancel() cannot stop a running job; the hung process has to go
+                self._reset(executor, terminate=True)
+            raise RenderTimeout(f"{format} export did not finish within {self.timeout}s")
+        except BrokenProcessPool:
+            self._reset(executor)
+            raise RuntimeError(f"{format} render worker exited unexpectedly")
+        return content
+
+    def _claim(self, slot: List[bool]) -> bool:
+        with self._lock:
+            claimed, slot[0] = slot[0], False
+            return claimed
+
+    def _on_done(self, future, submitted: float, slot: List[bool]) -> None:
+        if not self._claim(slot):
+            return  # timed out; the slot was released then
+        if future.cancelled() or future.exception() is not None:
+            self._finished(failed=not future.cancelled())
+            return
+        _, render_seconds = future.result()
+        elapsed = time.perf_counter() - submitted
+        self._finished(render_seconds=render_seconds, wait_seconds=max(0.0, elapsed - render_seconds))
+
+    def _finished(self, render_seconds: Optional[float] = None, wait_seconds: float = 0.0,
+                  failed: bool = False) -> None:
+        with self._lock:
+            self._depth -= 1
+            if failed:
+                self.failures += 1
+            elif render_seconds is not None:
+                self.rendered += 1
+                # Recent samples only; enough for averages without unbounded growth
+                self._render_seconds = self._render_seconds[-99:] + [render_seconds]
+                self._wait_seconds = self._wait_seconds[-99:] + [wait_seconds]
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+    def _reset(self, executor: ProcessPoolExecutor, terminate: bool = False) -> None:
+        # A crashed (or terminated) worker breaks the whole pool; the next render starts a fresh one
+        self._logger.warning("Render pool %s, restarting", 'timed out' if terminate else 'broken')
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        if terminate:
+            # ProcessPoolExecutor has no public way to stop a running job (until 3.14's
+            # terminate_workers); its pending futures then fail with BrokenProcessPool
+            for process in list((getattr(executor, '_processes', None) or {}).values()):
+                process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            samples = list(self._render_seconds)
+            waits = list(self._wait_seconds)
+            return {
+                'workers': self.workers,
+                'queue_depth': self._depth,
+                'max_queue': self.max_queue,
+                'rendered': self.rendered,
+                'rejected': self.rejected,
+                'timeouts': self.timeouts,
+                'failures': self.failures,
+                'avg_render_ms': round(1000 * sum(samples) / len(samples), 2) if samples else 0.0,
+                'max_render_ms': round(1000 * max(samples), 2) if samples else 0.0,
+                'avg_wait_ms': round(1000 * sum(waits) / len(waits), 2) if waits else 0.0
+            }
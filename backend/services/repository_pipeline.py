@@ -0,0 +1,279 @@
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+from utils.cache_manager import content_hash
+from utils.file_index import FileIndex
+from utils.validators import language_for_path
+
+ProgressReporter = Callable[[Dict[str, Any]], None]
+
+
+class FileTask(NamedTuple):
+    path: str
+    rel_path: str  # relative to the repository
+    language: str
+    size: int
+    mtime: float
+    # Content hash from the file index; an unchanged file is not re-documented
+    previous_hash: Optional[str] = None
+
+
+OUTPUT_EXTENSIONS = {
+    'markdown': '.md',
+    'html': '.html',
+    'json': '.json',
+    'pdf': '.pdf',
+    'docx': '.docx'
+}
+
+# One generator per worker process, created on its first batch
+_worker_generator = None
+
+
+def _generator():
+    global _worker_generator
+    if _worker_generator is None:
+        from services.documentation_generator import DocumentationGenerator
+        from services.render_pool import RenderPool
+
+        generator = DocumentationGenerator()
+        # Already running in a pipeline worker; render PDF/DOCX in place
+        generator.render_pool = RenderPool(workers=0)
+        _worker_generator = generator
+    return _worker_generator
+
+
+def _document_batch(batch: List[FileTask], options: Dict[str, Any]) -> List[Dict[str, Any]]:
+    generator = _generator()
+    return [_document_file(generator, task, options) for task in batch]
+
+
+def _document_file(generator, task: FileTask, options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    read → parse → metrics → (AI) → export for one file; failures are reported, not raised.
+
+    The result also carries ``code_blocks`` and ``metrics`` for the file index,
+    or ``unchanged`` when the content hash matches ``task.previous_hash``.
+    """
+    entry: Dict[str, Any] = {'path': task.rel_path, 'language': task.language}
+    try:
+        if os.path.getsize(task.path) > options['max_file_bytes']:
+            entry['skipped'] = 'file too large'
+            return entry
+        with open(task.path, 'rb') as handle:
+            data = handle.read()
+    except OSError as e:
+        entry['error'] = str(e)
+        return entry
+    entry['hash'] = content_hash(data)
+    if entry['hash'] == task.previous_hash:
+        entry['unchanged'] = True
+        return entry
+    try:
+        code = data.decode('utf-8')
+    except UnicodeDecodeError:
+        entry['skipped'] = 'not UTF-8 text'
+        return entry
+    if not code.strip():
+        entry['skipped'] = 'empty file'
+        return entry
+
+    try:
+        doc = generator.generate(code, task.language, title=task.rel_path, use_ai=options['use_ai'])
+        output = task.rel_path + OUTPUT_EXTENSIONS[options['format']]
+        target = os.path.join(options['output_dir'], output)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        generator.export_documentation(doc, options['format'], options['template'], output_path=target)
+    except Exception as e:
+        entry['error'] = str(e)
+        return entry
+
+    entry.update({
+        'output': output,
+        'blocks': len(doc.code_blocks),
+        'loc': doc.metrics.get('loc', 0),
+        'max_complexity': doc.metrics.get('max_complexity', 0),
+        'maintainability_index': doc.metrics.get('maintainability_index'),
+        'ai_enhanced': bool(getattr(doc, 'ai_enhanced', None)),
+        'code_blocks': [block.to_dict() for block in doc.code_blocks],
+        'metrics': doc.metrics
+    })
+    return entry
+
+
+class RepositoryPipeline:
+    """
+    Documents a whole repository: scan → read → parse → metrics → (AI) → export.
+
+    Files are handed out in batches of ``batch_size`` to a process pool of
+    ``workers`` processes, so parsing and metrics use every core instead of one
+    request at a time. Each file's export is written under ``output_dir``
+    mirroring the repository layout, followed by an ``index.md`` and
+    ``index.json``. ``report`` is called with progress counts after each
+    batch. ``workers=0`` (or a repository that fits in one batch) runs in
+    the calling thread.
+
+    With a ``FileIndex``, a rescan only stats files: those whose size and
+    mtime match the index (and whose output still exists) are not read at
+    all, and files that were touched but not modified are hashed and skipped.
+    """
+
+    def __init__(self, scanner: Callable[[str], Iterable[Any]], workers: Optional[int] = None,
+                 batch_size: int = 8, max_file_bytes: int = 1024 * 1024, index: Optional[FileIndex] = None):
+        self.scanner = scanner
+        self.workers = (os.cpu_count() or 1) if workers is None else workers
+        self.batch_size = max(1, batch_size)
+        self.max_file_bytes = max_file_bytes
+        self.index = index
+
+    def tasks(self, repo_path: str) -> List[FileTask]:
+        """Scanned files in a supported language, largest first when the scanner reports sizes."""
+        tasks = []
+        for item in self.scanner(repo_path):
+            path = getattr(item, 'path', item)
+            language = language_for_path(path)
+            if language is None:
+                continue
+            size, mtime = getattr(item, 'size', None), getattr(item, 'mtime', None)
+            if size is None:
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                size, mtime = stat.st_size, stat.st_mtime
+            tasks.append(FileTask(path, os.path.relpath(path, repo_path), language, size, mtime))
+        # Big files first, so the last batches are short and no worker is left with a long tail
+        tasks.sort(key=lambda task: -task.size)
+        return tasks
+
+    def run(self, repo_path: str, output_dir: str, format: str = 'markdown', template: str = 'default',
+            use_ai: bool = False, report: Optional[ProgressReporter] = None, force: bool = False) -> Dict[str, Any]:
+        """Document ``repo_path`` into ``output_dir``; ``force`` ignores the file index."""
+        if format not in OUTPUT_EXTENSIONS:
+            raise ValueError(f"Invalid format: {format}")
+        if not os.path.isdir(repo_path):
+            raise ValueError(f"Not a directory: {repo_path}")
+
+        started = time.perf_counter()
+        repo_key = os.path.abspath(repo_path)
+        options = {
+            'output_dir': output_dir,
+            'format': format,
+            'template': template,
+            'use_ai': use_ai,
+            'max_file_bytes': self.max_file_bytes
+        }
+        # What a file's documentation depends on besides its content
+        options_key = content_hash(os.path.abspath(output_dir), format, template, use_ai, self.max_file_bytes)
+        os.makedirs(output_dir, exist_ok=True)
+
+        tasks = self.tasks(repo_path)
+        indexed = self.index.load(repo_key) if self.index is not None and not force else {}
+        entries: List[Dict[str, Any]] = []
+        pending: List[FileTask] = []
+        for task in tasks:
+            row = indexed.get(task.rel_path)
+            if row is None or row['options'] != options_key or not self._output_exists(output_dir, row['entry']):
+                pending.append(task)
+            elif row['size'] == task.size and row['mtime'] == task.mtime:
+                entries.append(dict(row['entry'], reused=True))
+            else:
+                pending.append(task._replace(previous_hash=row['hash']))
+        if self.index is not None:
+            current = {task.rel_path for task in tasks}
+            self.index.remove(repo_key, [path for path in indexed if path not in current])
+
+        pending_by_path = {task.rel_path: task for task in pending}
+
+        def progress(batch_entries: List[Dict[str, Any]]) -> None:
+            rows, touched = [], []
+            for entry in batch_entries:
+                task = pending_by_path[entry['path']]
+                if entry.pop('unchanged', False):
+                    touched.append({'path': task.rel_path, 'size': task.size, 'mtime': task.mtime})
+                    entry = dict(indexed[task.rel_path]['entry'], reused=True)
+                else:
+                    code_blocks = entry.pop('code_blocks', [])
+                    metrics = entry.pop('metrics', {})
+                    if 'error' not in entry:
+                        rows.append({
+                            'path': task.rel_path, 'size': task.size, 'mtime': task.mtime,
+                            'hash': entry.get('hash', ''), 'options': options_key, 'entry': entry,
+                            'code_blocks': code_blocks, 'metrics': metrics
+                        })
+                entries.append(entry)
+            if self.index is not None:
+                self.index.update(repo_key, rows)
+                self.index.touch(repo_key, touched)
+            if report is not None:
+                report(self._summary(entries, len(tasks)))
+
+        if report is not None and entries:
+            report(self._summary(entries, len(tasks)))
+        batches = [pending[i:i + self.batch_size] for i in range(0, len(pending), self.batch_size)]
+        if self.workers <= 0 or len(batches) <= 1:
+            for batch in batches:
+                progress(_document_batch(batch, options))
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.workers, len(batches)),
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                futures = [executor.submit(_document_batch, batch, options) for batch in batches]
+                for future in as_completed(futures):
+                    progress(future.result())
+
+        entries.sort(key=lambda entry: entry['path'])
+        summary = self._summary(entries, len(tasks))
+        self._write_index(repo_path, output_dir, entries, summary)
+        summary.update({
+            'repo_path': repo_path,
+            'output_dir': output_dir,
+            'index': 'index.md',
+            'elapsed_seconds': round(time.perf_counter() - started, 3),
+            'files': entries
+        })
+        return summary
+
+    @staticmethod
+    def _output_exists(output_dir: str, entry: Dict[str, Any]) -> bool:
+        return 'output' not in entry or os.path.exists(os.path.join(output_dir, entry['output']))
+
+    @staticmethod
+    def _summary(entries: List[Dict[str, Any]], total: int) -> Dict[str, Any]:
+        return {
+            'total': total,
+            'done': len(entries),
+            'documented': sum(1 for entry in entries if 'output' in entry),
+            'skipped': sum(1 for entry in entries if 'skipped' in entry),
+            'failed': sum(1 for entry in entries if 'error' in entry),
+            'reused': sum(1 for entry in entries if entry.get('reused'))
+        }
+
+    def _write_index(self, repo_path: str, output_dir: str, entries: List[Dict[str, Any]],
+                     summary: Dict[str, Any]) -> None:
+        name = os.path.basename(os.path.abspath(repo_path))
+        lines = [
+            f"# {name} Documentation\n\n",
+            f"{summary['documented']} of {summary['total']} files documented"
+            f" ({summary['skipped']} skipped, {summary['failed']} failed).\n\n",
+            "| File | Language | Blocks | LOC | Max complexity |\n",
+            "|------|----------|--------|-----|----------------|\n"
+        ]
+        for entry in entries:
+            if 'output' in entry:
+                output = entry['output'].replace(os.sep, '/')
+                lines.append(f"| [{entry['path']}]({output}) | {entry['language']} | {entry['blocks']}"
+                             f" | {entry['loc']} | {entry['max_complexity']} |\n")
+        problems = [entry for entry in entries if 'output' not in entry]
+        if problems:
+            lines.append("\n## Not documented\n\n")
+            for entry in problems:
+                lines.append(f"- {entry['path']}: {entry.get('error') or entry.get('skipped')}\n")
+
+        with open(os.path.join(output_dir, 'index.md'), 'w', encoding='utf-8') as handle:
+            handle.writelines(lines)
+        with open(os.path.join(output_dir, 'index.json'), 'w', encoding='utf-8') as handle:
+            json.dump(dict(summary, repository=name, files=entries), handle, indent=2)
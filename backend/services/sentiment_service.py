@@ -4,27 +4,14 @@ Replaces Azure Text Analytics - no API keys required!
 """
 
 import logging
+import threading
 from typing import Dict, Any, List
 
-# Initialize NLTK VADER on first import
-try:
-    from nltk.sentiment.vader import SentimentIntensityAnalyzer
-    import nltk
-    try:
-        nltk.data.find('sentiment/vader_lexicon.zip')
-    except LookupError:
-        nltk.download('vader_lexicon', quiet=True)
-    VADER_AVAILABLE = True
-except ImportError:
-    VADER_AVAILABLE = False
-    logging.warning("NLTK not available. Install with: pip install nltk")
+from utils.optional_imports import module_available
 
-try:
-    from textblob import TextBlob
-    TEXTBLOB_AVAILABLE = True
-except ImportError:
-    TEXTBLOB_AVAILABLE = False
-    logging.warning("TextBlob not available. Install with: pip install textblob")
+# NLTK and TextBlob are imported (and the VADER lexicon fetched) on the first analysis
+VADER_AVAILABLE = module_available('nltk', "NLTK not available. Install with: pip install nltk")
+TEXTBLOB_AVAILABLE = module_available('textblob', "TextBlob not available. Install with: pip install textblob")
 
 
 class SentimentService:
@@ -34,7 +21,8 @@ class SentimentService:
     """
     
     def __init__(self):
-        self.vader = SentimentIntensityAnalyzer() if VADER_AVAILABLE else None
+        self._vader = None
+        self._vader_lock = threading.Lock()
         self.language_map = {
             'python': 'en',
             'javascript': 'en',
@@ -44,6 +32,21 @@ class SentimentService:
             'csharp': 'en'
         }
     
+    @property
+    def vader(self):
+        """VADER analyzer, built on first use; downloads the lexicon if it is missing."""
+        if self._vader is None and VADER_AVAILABLE:
+            with self._vader_lock:
+                if self._vader is None:
+                    import nltk
+                    from nltk.sentiment.vader import SentimentIntensityAnalyzer
+                    try:
+                        nltk.data.find('sentiment/vader_lexicon.zip')
+                    except LookupError:
+                        nltk.download('vader_lexicon', quiet=True)
+                    self._vader = SentimentIntensityAnalyzer()
+        return self._vader
+
     def analyze_sentiment(self, text: str, language: str = 'en') -> Dict[str, Any]:
         """
         Analyze sentiment of text using VADER (better for code comments)
@@ -120,6 +123,8 @@ class SentimentService:
     
     def _analyze_with_textblob(self, text: str) -> Dict[str, Any]:
         """Fallback analysis using TextBlob."""
+        from textblob import TextBlob
+
         blob = TextBlob(text)
         polarity = blob.sentiment.polarity  # -1 to 1
         subjectivity = blob.sentiment.subjectivity  # 0 to 1
@@ -0,0 +1,295 @@
+import json
+import logging
+import os
+import string
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional
+
+from utils.cache_manager import content_hash
+from services.parsers import cyclomatic_complexity
+
+# Placeholders a section may use. Block and metric sections also see the document fields.
+DOCUMENT_FIELDS = frozenset({'title', 'description', 'language', 'generated_at', 'block_count', 'metrics_json'})
+BLOCK_FIELDS = DOCUMENT_FIELDS | {
+    'index', 'line_number', 'end_line', 'name', 'kind', 'block_language', 'content', 'loc', 'complexity'
+}
+METRIC_FIELDS = DOCUMENT_FIELDS | {'key', 'label', 'value'}
+
+# Section -> fields it may use, in output order. ``toc``, ``metrics`` and ``code_blocks`` are
+# headings printed once before their ``*_item``/``code_block`` entries, and only when there are
+# entries; ``description`` is left out when the document has none.
+SECTIONS: Dict[str, frozenset] = {
+    'title': DOCUMENT_FIELDS,
+    'description': DOCUMENT_FIELDS,
+    'toc': DOCUMENT_FIELDS,
+    'toc_item': BLOCK_FIELDS,
+    'metrics': DOCUMENT_FIELDS,
+    'metric_item': METRIC_FIELDS,
+    'code_blocks': DOCUMENT_FIELDS,
+    'code_block': BLOCK_FIELDS,
+    'footer': DOCUMENT_FIELDS
+}
+
+BUILTIN_TEMPLATES: Dict[str, Dict[str, str]] = {
+    'default': {
+        'title': '# {title}\n\n',
+        'description': '{description}\n\n',
+        'code_blocks': '## Code\n\n',
+        'code_block': '```{language}\n{content}\n```\n\n'
+    },
+    'detailed': {
+        'title': '# {title}\n\n_Generated at: {generated_at}_\n\n',
+        'description': '## Overview\n\n{description}\n\n',
+        'toc': '## Table of Contents\n\n',
+        'toc_item': '{index}. [Block at line {line_number}](#block-at-line-{line_number})\n',
+        'metrics': '\n## Project Metrics\n\n',
+        'metric_item': '- **{label}**: {value}\n',
+        'code_blocks': '\n## Code Blocks\n\n',
+        'code_block': (
+            '### Block at line {line_number}\n\n```{language}\n{content}\n```\n\n'
+            '**Analysis:**\n- Lines of code: {loc}\n- Complexity: {complexity}\n\n'
+        )
+    }
+}
+
+_FORMATTER = string.Formatter()
+_CONVERSIONS = {'s': str, 'r': repr, 'a': ascii}
+# Sample values of every type a field can take, to check format specs when a section is compiled
+_INTEGER_FIELDS = frozenset({'index', 'line_number', 'block_count', 'loc', 'complexity'})
+_FIELD_SAMPLES: Dict[str, tuple] = {'end_line': (0, ''), 'value': (0, 0.5)}
+
+Section = Callable[[Mapping[str, Any]], str]
+
+
+class _CompiledSection:
+    """
+    One section as a list of parts: literal strings and ``(field, conversion, spec)``
+    placeholders. Calling it with the field mapping joins the parts.
+    """
+
+    __slots__ = ('parts', 'fields')
+
+    def __init__(self, parts: List[Any], fields: frozenset):
+        self.parts = parts
+        self.fields = fields
+
+    def __call__(self, values: Mapping[str, Any]) -> str:
+        out = []
+        for part in self.parts:
+            if part.__class__ is str:
+                out.append(part)
+                continue
+            field, convert, spec = part
+            value = values[field]
+            out.append(format(convert(value) if convert is not None else value, spec))
+        return ''.join(out)
+
+
+def _compile_section(template: str, section: str, text: str) -> Section:
+    """
+    Turn one ``str.format``-style section into a function of the field mapping.
+
+    The section is parsed here, once; rendering only concatenates literals and
+    formatted fields. Placeholders must be plain field names from
+    ``SECTIONS[section]`` (no attribute or index access), with an optional
+    ``!s``/``!r``/``!a`` conversion and a format spec, without nested fields,
+    that suits the field's values. Anything else raises ValueError.
+    """
+    where = f"Template '{template}', section '{section}'"
+    if not isinstance(text, str):
+        raise ValueError(f"{where}: must be a string")
+    try:
+        parsed = list(_FORMATTER.parse(text))
+    except ValueError as e:
+        raise ValueError(f"{where}: {e}") from None
+
+    parts: List[Any] = []
+    fields = set()
+    for literal, field, spec, conversion in parsed:
+        if literal:
+            parts.append(literal)
+        if field is None:
+            continue
+        if field not in SECTIONS[section]:
+            raise ValueError(f"{where}: unknown placeholder {{{field}}}")
+        if spec and ('{' in spec or '}' in spec):
+            raise ValueError(f"{where}: nested fields are not supported in {{{field}}}")
+        if conversion and conversion not in _CONVERSIONS:
+            raise ValueError(f"{where}: unknown conversion !{conversion} in {{{field}}}")
+        convert = _CONVERSIONS.get(conversion)
+        samples = _FIELD_SAMPLES.get(field, (0,) if field in _INTEGER_FIELDS else ('',))
+        for sample in samples:
+            try:
+                format(convert(sample) if convert is not None else sample, spec)
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"{where}: bad format spec in {{{field}}}: {e}") from None
+        fields.add(field)
+        parts.append((field, convert, spec))
+    return _CompiledSection(parts, frozenset(fields))
+
+
+class CompiledTemplate:
+    """
+    A template whose sections were compiled once by ``_compile_section``.
+
+    ``render`` streams the document section by section (one chunk per heading
+    and per code block) in a single pass. Fields that no section uses, such
+    as ``metrics_json`` or a block's ``loc``, are never computed.
+    ``fingerprint`` changes whenever the section sources do.
+    """
+
+    def __init__(self, name: str, sections: Mapping[str, str]):
+        if not isinstance(sections, Mapping) or not sections:
+            raise ValueError(f"Template '{name}' must be a non-empty object of sections")
+        unknown = sorted(set(sections) - set(SECTIONS))
+        if unknown:
+            raise ValueError(f"Template '{name}': unknown sections {', '.join(unknown)}. "
+                             f"Supported: {', '.join(SECTIONS)}")
+        self.name = name
+        self.sections = dict(sections)
+        self._sections = {section: _compile_section(name, section, text) for section, text in sections.items()}
+        self.fields = frozenset().union(*(render.fields for render in self._sections.values()))
+        self.fingerprint = content_hash('template', self.sections)
+
+    def uses(self, field: str) -> bool:
+        return field in self.fields
+
+    def render(self, doc) -> Iterator[str]:
+        sections = self._sections
+        context = self._document_context(doc)
+        if 'title' in sections:
+            yield sections['title'](context)
+        if doc.description and 'description' in sections:
+            yield sections['description'](context)
+
+        blocks = doc.code_blocks
+        block_contexts = [self._block_context(context, index, block) for index, block in enumerate(blocks, 1)] \
+            if blocks and ('toc_item' in sections or 'code_block' in sections) else []
+        if blocks and ('toc' in sections or 'toc_item' in sections):
+            toc = sections.get('toc')
+            item = sections.get('toc_item')
+            yield (toc(context) if toc else '') + (
+                ''.join(item(block) for block in block_contexts) if item else '')
+
+        if doc.metrics and ('metrics' in sections or 'metric_item' in sections):
+            heading = sections.get('metrics')
+            item = sections.get('metric_item')
+            yield (heading(context) if heading else '') + (
+                ''.join(item(self._metric_context(context, key, value)) for key, value in doc.metrics.items())
+                if item else '')
+
+        if blocks:
+            if 'code_blocks' in sections:
+                yield sections['code_blocks'](context)
+            item = sections.get('code_block')
+            if item is not None:
+                for block in block_contexts:
+                    yield item(block)
+
+        if 'footer' in sections:
+            yield sections['footer'](context)
+
+    def _document_context(self, doc) -> Dict[str, Any]:
+        context = {
+            'title': doc.title,
+            'description': doc.description or '',
+            'language': doc.language,
+            'generated_at': doc.generated_at,
+            'block_count': len(doc.code_blocks)
+        }
+        if 'metrics_json' in self.fields:
+            context['metrics_json'] = json.dumps(doc.metrics, indent=2, default=str)
+        return context
+
+    def _block_context(self, context: Dict[str, Any], index: int, block) -> Dict[str, Any]:
+        fields = self.fields
+        values = dict(
+            context,
+            index=index,
+            line_number=block.line_number,
+            end_line=block.end_line if block.end_line is not None else '',
+            name=block.name or '',
+            kind=block.kind or '',
+            block_language=block.language,
+            content=block.content
+        )
+        if 'loc' in fields:
+            values['loc'] = block.metrics.get('loc', block.line_count)
+        if 'complexity' in fields:
+            complexity = block.complexity if block.complexity is not None else block.metrics.get('complexity')
+            values['complexity'] = complexity if complexity is not None \
+                else cyclomatic_complexity(block.content, block.language)
+        return values
+
+    @staticmethod
+    def _metric_context(context: Dict[str, Any], key: str, value: Any) -> Dict[str, Any]:
+        return dict(context, key=key, label=key.replace('_', ' ').title(), value=value)
+
+
+class TemplateRegistry:
+    """
+    Export templates by name, compiled when they are registered.
+
+    Starts with ``BUILTIN_TEMPLATES``; ``load_directory`` adds user templates
+    from ``<name>.json`` files, each an object of section format strings
+    (see ``SECTIONS``). Built-in names cannot be replaced.
+    """
+
+    def __init__(self, templates: Optional[Mapping[str, Mapping[str, str]]] = None):
+        templates = BUILTIN_TEMPLATES if templates is None else templates
+        self._templates = {name: CompiledTemplate(name, sections) for name, sections in templates.items()}
+        self._builtin = frozenset(templates)
+        self._logger = logging.getLogger(__name__)
+
+    def register(self, name: str, sections: Mapping[str, str]) -> CompiledTemplate:
+        """Compile and add a template; raises ValueError for a bad template or a built-in name."""
+        if name in self._builtin:
+            raise ValueError(f"Template '{name}' is built in and cannot be replaced")
+        compiled = CompiledTemplate(name, sections)
+        self._templates[name] = compiled
+        return compiled
+
+    def load_directory(self, directory: str) -> List[str]:
+        """Register every ``*.json`` template in ``directory``; invalid files are logged and skipped."""
+        loaded = []
+        try:
+            names = sorted(os.listdir(directory))
+        except OSError as e:
+            self._logger.warning(f"Cannot read templates directory {directory}: {e}")
+            return loaded
+        for filename in names:
+            name, extension = os.path.splitext(filename)
+            if extension != '.json':
+                continue
+            try:
+                with open(os.path.join(directory, filename), encoding='utf-8') as handle:
+                    self.register(name, json.load(handle))
+            except (OSError, ValueError) as e:
+                self._logger.warning(f"Skipping template {filename}: {e}")
+                continue
+            loaded.append(name)
+        return loaded
+
+    def get(self, name: str) -> CompiledTemplate:
+        try:
+            return self._templates[name]
+        except KeyError:
+            raise ValueError(f"Invalid template: {name}") from None
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._templates
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._templates)
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def __getitem__(self, name: str) -> Dict[str, str]:
+        """Section sources of a template."""
+        return self._templates[name].sections
+
+    def describe(self) -> List[Dict[str, Any]]:
+        return [
+            {'name': name, 'builtin': name in self._builtin, 'sections': list(compiled.sections)}
+            for name, compiled in self._templates.items()
+        ]
@@ -10,20 +10,17 @@ import time
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-# Free translation libraries
-try:
-    from deep_translator import GoogleTranslator
-    TRANSLATOR_AVAILABLE = True
-except ImportError:
-    TRANSLATOR_AVAILABLE = False
-    logging.warning("deep-translator not available. Install with: pip install deep-translator")
+from config import Config
+from utils.deadline import Deadline
+from utils.optional_imports import module_available
 
-try:
-    from langdetect import detect, detect_langs
-    LANGDETECT_AVAILABLE = True
-except ImportError:
-    LANGDETECT_AVAILABLE = False
-    logging.warning("langdetect not available. Install with: pip install langdetect")
+# Free translation libraries, imported on first use
+TRANSLATOR_AVAILABLE = module_available(
+    'deep_translator', "deep-translator not available. Install with: pip install deep-translator"
+)
+LANGDETECT_AVAILABLE = module_available(
+    'langdetect', "langdetect not available. Install with: pip install langdetect"
+)
 
 
 @dataclass
@@ -88,14 +85,14 @@ class TranslatorService:
                 text = text.replace(source, target)
         return text
     
-    def _rate_limit_wait(self) -> None:
-        """Implement rate limiting."""
+    def _rate_limit_wait(self, deadline: Optional[Deadline] = None) -> None:
+        """Implement rate limiting, waiting no longer than ``deadline`` allows."""
         current_time = time.time()
         elapsed = current_time - self.last_request_time
         min_interval = 1.0 / self.rate_limit.requests_per_second
         
         if elapsed < min_interval:
-            time.sleep(min_interval - elapsed)
+            time.sleep(min(min_interval - elapsed, deadline.remaining()) if deadline else min_interval - elapsed)
         
         self.last_request_time = time.time()
     
@@ -105,6 +102,8 @@ class TranslatorService:
             return {'language': 'en', 'confidence': 0.5}
         
         try:
+            from langdetect import detect, detect_langs
+
             detected = detect(text)
             # Get confidence scores
             lang_probs = detect_langs(text)
@@ -118,7 +117,8 @@ class TranslatorService:
             logging.warning(f"Language detection failed: {e}")
             return {'language': 'en', 'confidence': 0.5}
     
-    def translate(self, text: str, target_lang: str, source_lang: Optional[str] = None) -> Dict[str, Any]:
+    def translate(self, text: str, target_lang: str, source_lang: Optional[str] = None,
+                  deadline: Optional[Deadline] = None) -> Dict[str, Any]:
         """
         Translate text to target language using Google Translate.
         
@@ -126,10 +126,13 @@ class TranslatorService:
             text: Text to translate
             target_lang: Target language code (e.g., 'es', 'fr', 'de')
             source_lang: Source language code (optional, auto-detected if not provided)
+            deadline: Request time budget; once spent, an error is returned without calling out
             
         Returns:
             Dict with translated text and metadata
         """
+        if deadline and not deadline.check():
+            return {'error': 'Translation skipped: request deadline reached', 'skipped': True}
         if not TRANSLATOR_AVAILABLE:
             return {'error': 'Translation library not available. Install with: pip install deep-translator'}
         
@@ -143,7 +146,7 @@ class TranslatorService:
                 return {'error': f'Unsupported target language: {target_lang}'}
         
         try:
-            self._rate_limit_wait()
+            self._rate_limit_wait(deadline)
             
             # Detect source language if not provided
             if not source_lang and LANGDETECT_AVAILABLE:
@@ -155,6 +158,7 @@ class TranslatorService:
                 confidence = 1.0 if source_lang else 0.5
             
             # Translate using Google Translate (free, no API key)
+            from deep_translator import GoogleTranslator
             translator = GoogleTranslator(source='auto', target=target_lang)
             translated_text = translator.translate(text)
             
@@ -176,24 +180,32 @@ class TranslatorService:
             logging.error(f"Translation failed: {str(e)}")
             return {'error': f'Translation failed: {str(e)}'}
     
-    def batch_translate(self, texts: List[str], target_lang: str, source_lang: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Translate multiple texts in parallel with rate limiting."""
+    def batch_translate(self, texts: List[str], target_lang: str, source_lang: Optional[str] = None,
+                        deadline: Optional[Deadline] = None) -> List[Dict[str, Any]]:
+        """
+        Translate multiple texts in parallel with rate limiting.
+
+        A retry only backs off when ``deadline`` leaves room for it; otherwise the text's
+        last error is returned, and texts not started in time come back ``skipped``.
+        """
         if not texts:
             return []
+        deadline = deadline or Deadline()
         
         def translate_single(text: str) -> Dict[str, Any]:
+            result = {'error': 'Max retries exceeded'}
             for attempt in range(self.rate_limit.max_retries):
                 try:
-                    self._rate_limit_wait()
-                    result = self.translate(text, target_lang, source_lang)
-                    if 'error' not in result:
+                    self._rate_limit_wait(deadline)
+                    result = self.translate(text, target_lang, source_lang, deadline)
+                    if 'error' not in result or result.get('skipped'):
                         return result
-                    time.sleep(self.rate_limit.backoff_factor ** attempt)
                 except Exception as e:
-                    if attempt == self.rate_limit.max_retries - 1:
-                        return {'error': str(e)}
-                    time.sleep(self.rate_limit.backoff_factor ** attempt)
-            return {'error': 'Max retries exceeded'}
+                    result = {'error': str(e)}
+                if attempt == self.rate_limit.max_retries - 1 or \
+                        not deadline.sleep(self.rate_limit.backoff_factor ** attempt, reserve=Config.RETRY_MIN_BUDGET):
+                    return result
+            return result
         
         results = []
         with ThreadPoolExecutor(max_workers=5) as executor:
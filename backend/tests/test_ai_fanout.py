@@ -0,0 +1,95 @@
+# tests/test_ai_fanout.py
+
+import time
+import threading
+from unittest.mock import patch
+from config import Config
+
+def make_source(functions=40, body_lines=25):
+    return '\n\n'.join(
+        f'def handler_{i}(value):\n' + ''.join(f'    value = value + {j}\n' for j in range(body_lines)) + '    return value'
+        for i in range(functions)
+    ) + '\n'
+
+def fake_response(prompt, deadline=None):
+    if 'outline of a python file' in prompt:
+        return {'title': 'Handlers', 'overview': 'Many handlers.', 'purpose': 'Testing.'}
+    names = [line.split('(')[0][4:] for line in prompt.split('\n') if line.startswith('def ')]
+    return {
+        'components': [{'name': name, 'description': 'Adds numbers'} for name in names],
+        'returns': 'The value.',
+        'notes': ['Pure function']
+    }
+
+def test_fanout_merges_every_block(generator):
+    source = make_source()
+    with patch.object(generator, '_request_ai_json', side_effect=fake_response) as request:
+        doc = generator.generate(source, 'python')
+
+    assert request.call_count > 2
+    assert doc.title == 'Handlers'
+    names = [component['name'] for component in doc.ai_enhanced['components']]
+    assert names == [f'handler_{i}' for i in range(40)]
+    assert '## Components' in doc.description
+    assert 'partial' not in doc.ai_enhanced
+
+def test_chunks_respect_budget_and_concurrency_cap(generator):
+    source = make_source()
+    in_flight, peak = [0], [0]
+    lock = threading.Lock()
+
+    def slow_response(prompt, deadline=None):
+        with lock:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+        time.sleep(0.05)
+        with lock:
+            in_flight[0] -= 1
+        return fake_response(prompt)
+
+    with patch.object(Config, 'AI_FANOUT_CONCURRENCY', 3), \
+            patch.object(generator, '_request_ai_json', side_effect=slow_response) as request:
+        started = time.perf_counter()
+        generator.generate(source, 'python')
+        elapsed = time.perf_counter() - started
+
+    assert peak[0] == 3
+    assert elapsed < request.call_count * 0.05
+    chunks = generator._chunk_blocks(generator.generate(source, 'python', use_ai=False).code_blocks)
+    assert all(sum(len(block.content) for block in chunk) <= Config.AI_CHUNK_MAX_CHARS for chunk in chunks)
+
+def test_edit_only_reprompts_changed_chunk(generator):
+    source = make_source()
+    prompts = []
+    with patch.object(generator, '_request_ai_json', side_effect=lambda p, deadline=None: prompts.append(p) or fake_response(p)):
+        generator.generate(source, 'python')
+        first = set(prompts)
+        prompts.clear()
+        generator.generate(source.replace('value = value + 3\n', 'value = value + 3 + 1\n', 1), 'python')
+
+    # The outline and every chunk but the edited one are byte-identical prompts (AI cache hits)
+    assert len(set(prompts) - first) == 1
+
+def test_failed_chunk_marks_partial_and_skips_result_cache(generator):
+    source = make_source()
+    calls = []
+
+    def flaky(prompt, deadline=None):
+        calls.append(prompt)
+        return None if 'handler_0(value):\n    value' in prompt else fake_response(prompt)
+
+    with patch.object(generator, '_request_ai_json', side_effect=flaky):
+        doc = generator.generate(source, 'python')
+        generator.generate(source, 'python')
+
+    assert doc.ai_enhanced['partial']
+    assert doc.title == 'Handlers'
+    assert generator.result_cache.stats()['hits'] == 0
+
+def test_small_files_use_single_prompt(generator):
+    with patch.object(generator, '_generate_ai_documentation', return_value={'title': 'One'}) as single, \
+            patch.object(generator, '_generate_ai_documentation_fanout') as fanout:
+        generator.generate('def f():\n    return 1\n', 'python')
+
+    single.assert_called_once()
+    fanout.assert_not_called()
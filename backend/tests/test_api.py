@@ -286,6 +286,17 @@ def test():
     assert data['status'] == 'success'
     assert 'documentation' in data
 
+def test_documentation_endpoint_serializes_blocks_and_ai(client):
+    doc = DocumentationGenerator(use_ai=False).generate('def add(a, b):\n    return a + b\n', 'python', use_ai=False)
+    doc.ai_enhanced = {'title': 'Adder', 'overview': 'Adds numbers.'}
+    with patch('routes.api.doc_generator.generate', return_value=doc):
+        response = client.post('/api/analyze/documentation', json={'code': 'x = 1', 'language': 'python'})
+
+    assert response.status_code == 200
+    documentation = response.get_json()['documentation']
+    assert documentation['ai_enhanced'] == doc.ai_enhanced
+    assert documentation['code_blocks'][0]['name'] == 'add'
+
 def test_documentation_generation(client):
     test_code = '''def hello():
     """Says hello"""
@@ -0,0 +1,100 @@
+# tests/test_artifact_cache.py
+
+import os
+import tempfile
+from unittest.mock import patch
+from utils.artifact_cache import ArtifactCache
+
+SOURCE = '''def greet(name):
+    """Say hello."""
+    return f"Hello, {name}"
+'''
+
+def test_round_trip_and_persistence():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = ArtifactCache(temp_dir)
+        assert cache.get('missing') is None
+        assert cache.set('key', b'rendered')
+        assert cache.get('key') == b'rendered'
+        assert b''.join(cache.iter_chunks('key', chunk_size=3)) == b'rendered'
+
+        # A restarted worker rebuilds the index from the directory
+        restarted = ArtifactCache(temp_dir)
+        assert restarted.get('key') == b'rendered'
+        assert restarted.stats()['entries'] == 1
+        assert restarted.stats()['bytes'] == len(b'rendered')
+
+def test_lru_eviction_by_size_and_count():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = ArtifactCache(temp_dir, max_bytes=100)
+        cache.set('a', b'x' * 40)
+        cache.set('b', b'y' * 40)
+        cache.get('a')  # 'b' becomes the least recently used entry
+        cache.set('c', b'z' * 40)
+
+        assert cache.get('b') is None
+        assert not os.path.exists(os.path.join(temp_dir, 'b'))
+        assert cache.get('a') == b'x' * 40
+        assert cache.stats()['bytes'] <= 100
+        assert cache.set('huge', b'x' * 200) is False
+
+        counted = ArtifactCache(os.path.join(temp_dir, 'counted'), max_entries=2)
+        for key in ('a', 'b', 'c'):
+            counted.set(key, b'data')
+        assert len(counted) == 2 and counted.get('a') is None
+
+def test_file_removed_by_another_worker_is_a_miss():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = ArtifactCache(temp_dir)
+        cache.set('key', b'rendered')
+        os.remove(os.path.join(temp_dir, 'key'))
+
+        assert cache.get('key') is None
+        assert cache.stats()['entries'] == 0
+
+def test_discarded_writer_leaves_nothing_behind():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = ArtifactCache(temp_dir)
+        writer = cache.writer('key')
+        writer.write(b'half')
+        writer.discard()
+
+        assert cache.get('key') is None
+        assert os.listdir(temp_dir) == []
+
+def test_repeat_export_is_served_from_cache(generator):
+    doc = generator.generate(SOURCE, 'python', use_ai=False)
+    first = generator.export_documentation(doc, 'html')
+
+    with patch.object(generator, '_export_html') as exporter:
+        generator.exporters['html'] = exporter
+        again = generator.export_documentation(doc, 'html')
+
+    exporter.assert_not_called()
+    assert again == first
+    assert generator.export_cache.stats()['hits'] == 1
+
+def test_format_and_template_are_part_of_the_key(generator):
+    doc = generator.generate(SOURCE, 'python', use_ai=False)
+    default = generator.export_documentation(doc, 'markdown')
+
+    detailed = generator.export_documentation(doc, 'markdown', template='detailed')
+    assert detailed != default
+    assert generator.export_documentation(doc, 'markdown') == default
+    assert generator.export_documentation(doc, 'json') != default
+    doc.title = 'Renamed'
+    assert generator.export_documentation(doc, 'markdown') != default
+    assert generator.export_cache.stats()['hits'] == 1
+
+def test_streamed_markdown_is_cached_after_full_read(generator):
+    doc = generator.generate(SOURCE, 'python', use_ai=False)
+    partial = generator.export_stream(doc, 'markdown')
+    next(partial)
+    partial.close()
+    assert len(generator.export_cache) == 0
+
+    streamed = ''.join(generator.export_stream(doc, 'markdown'))
+    assert len(generator.export_cache) == 1
+    assert ''.join(generator.export_stream(doc, 'markdown')) == streamed
+    assert generator.export_documentation(doc, 'markdown') == streamed
+    assert generator.export_cache.stats()['hits'] == 2
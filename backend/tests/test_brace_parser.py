@@ -0,0 +1,137 @@
+# tests/test_brace_parser.py
+
+import pytest
+from services.parsers import parse_braces
+from services.documentation_generator import DocumentationGenerator
+
+JAVA_SOURCE = '''/* Not a class { */
+@Component
+public class Service extends Base {
+    private String label = "}{";
+
+    @Override
+    public void run() {
+        if (label != null) { handle(); }
+    }
+
+    int size(int a) { return a; }
+    int size() { return 0; }
+}
+
+interface Handler { void handle(); }
+'''
+
+TS_SOURCE = '''// helpers {
+export interface Props { size: number }
+export const render = (props: Props): string => {
+    return `size ${props.size} }`;
+};
+namespace Utils {
+    export function clamp(value: number) { return value; }
+}
+'''
+
+def test_blocks_have_exact_offsets():
+    parsed = parse_braces(JAVA_SOURCE, 'java')
+
+    assert [block.qualname for block in parsed.blocks] == ['Service', 'Handler']
+    service, handler = parsed.blocks
+    assert JAVA_SOURCE[service.start_offset:service.end_offset].startswith('@Component')
+    assert JAVA_SOURCE[service.start_offset:service.end_offset].endswith('return 0; }\n}')
+    assert (service.line_number, service.end_line) == (2, 13)
+    assert (handler.kind, handler.line_number, handler.end_line) == ('interface', 15, 15)
+
+def test_symbol_table_and_overloads():
+    symbols = parse_braces(JAVA_SOURCE, 'java').symbols
+
+    assert symbols['Service.run'].kind == 'method'
+    assert symbols['Service.run'].parent == 'Service'
+    assert 'Service.size' in symbols and 'Service.size#2' in symbols
+    # Control-flow braces are not declarations
+    assert not any(name.endswith('if') for name in symbols)
+
+def test_typescript_declarations():
+    parsed = parse_braces(TS_SOURCE, 'typescript')
+
+    assert [(block.qualname, block.kind) for block in parsed.blocks] == [
+        ('Props', 'interface'), ('render', 'function'), ('Utils.clamp', 'function')
+    ]
+    render = parsed.blocks[1]
+    assert TS_SOURCE[render.start_offset:render.end_offset].endswith('}`;\n}')
+
+def test_cpp_preprocessor_and_csharp_namespaces():
+    cpp = parse_braces('#define BEGIN {\nclass Widget { int get() const { return 1; } };\n', 'cpp')
+    assert [(block.qualname, block.kind) for block in cpp.blocks] == [('Widget', 'class')]
+    assert cpp.symbols['Widget.get'].kind == 'method'
+
+    csharp = parse_braces('namespace App {\n    public class Repo { public void Save() { } }\n}\n', 'csharp')
+    assert [block.qualname for block in csharp.blocks] == ['App.Repo']
+    assert csharp.symbols['App.Repo.Save'].line_number == 2
+
+def test_unsupported_language_raises():
+    with pytest.raises(ValueError):
+        parse_braces('fn main() {}', 'rust')
+
+def test_generator_parses_typescript():
+    generator = DocumentationGenerator(use_ai=False)
+    doc = generator.generate(TS_SOURCE, 'typescript', use_ai=False)
+
+    assert [block.name for block in doc.code_blocks] == ['Props', 'render', 'Utils.clamp']
+    assert all(block.language == 'typescript' for block in doc.code_blocks)
+    assert doc.code_blocks[2].content.startswith('export function clamp')
+
+def test_template_parameters_are_not_containers():
+    source = 'template <class T>\nclass Box {\n    T get() const { return value; }\n};\n'
+    parsed = parse_braces(source, 'cpp')
+
+    assert [(block.qualname, block.kind) for block in parsed.blocks] == [('Box', 'class')]
+    assert parsed.symbols['Box.get'].kind == 'method'
+
+def test_deeply_nested_bodies_end_at_matching_brace():
+    body = 'if (a) { ' * 8 + 'x("}");' + ' }' * 8
+    source = f'function deep() {{ {body} }}\nfunction next() {{ }}\n'
+    parsed = parse_braces(source, 'javascript')
+
+    deep, following = parsed.blocks
+    assert source[deep.start_offset:deep.end_offset].endswith(' }' * 9)
+    assert following.qualname == 'next'
+
+def test_generic_and_destructured_signatures():
+    typescript = (
+        'export function useThing<T>(x: T): T {\n    return x;\n}\n'
+        'function Comp({ a, b }: Props) {\n    return a;\n}\n'
+        'export default function App({ a }: Props) {\n    return a;\n}\n'
+        'class Store {\n    async load<T>(id) {\n        return id;\n    }\n'
+        '    method<K>(k: K): void {\n        return;\n    }\n}\n'
+    )
+    parsed = parse_braces(typescript, 'typescript')
+    assert [block.qualname for block in parsed.blocks] == ['useThing', 'Comp', 'App', 'Store']
+    assert parsed.symbols['Store.load'].kind == parsed.symbols['Store.method'].kind == 'method'
+    comp = parsed.symbols['Comp']
+    assert typescript[comp.start_offset:comp.end_offset].startswith('function Comp({ a, b }')
+    assert (comp.line_number, comp.end_line) == (4, 6)
+
+    javascript = parse_braces('const g = ({ a }) => {\n    return a;\n};\n', 'javascript')
+    assert [(block.qualname, block.kind) for block in javascript.blocks] == [('g', 'function')]
+
+    csharp = parse_braces('public class Repo {\n    public T Find<TKey>(TKey id) {\n        return default;\n    }\n}\n',
+                          'csharp')
+    assert csharp.symbols['Repo.Find'].kind == 'method'
+
+def test_object_literal_methods_are_not_declarations():
+    source = 'const obj = {\n    m() {\n        return 1;\n    }\n};\nclass C {\n    m() { return 2; }\n}\n'
+    parsed = parse_braces(source, 'javascript')
+
+    assert [block.qualname for block in parsed.blocks] == ['C']
+    assert 'm' not in parsed.symbols and parsed.symbols['C.m'].kind == 'method'
+
+def test_generator_parses_javascript_with_braces():
+    generator = DocumentationGenerator(use_ai=False)
+    source = ('import x from "y";\nexport function a() {\n    const s = "function b() {";\n}\n'
+              '// class C {\nclass B {\n    m() {}\n}\nconst c = () => {\n};\nrun();\n')
+    doc = generator.generate(source, 'javascript', use_ai=False)
+
+    assert [(block.name, block.line_number, block.end_line) for block in doc.code_blocks] == [
+        ('a', 2, 4), ('B', 6, 8), ('c', 9, 10)
+    ]
+    assert doc.code_blocks[1].content == 'class B {\n    m() {}\n}'
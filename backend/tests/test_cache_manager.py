@@ -0,0 +1,53 @@
+# tests/test_cache_manager.py
+
+import time
+from utils.cache_manager import LRUCache, content_hash
+
+def test_lru_eviction_by_entries():
+    cache = LRUCache(max_entries=2, max_bytes=1024, ttl=None, sizeof=lambda v: 1)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    assert cache.get('a') == 1  # 'a' is now most recently used
+    cache.set('c', 3)
+
+    assert 'b' not in cache
+    assert cache.get('a') == 1
+    assert cache.get('c') == 3
+    assert cache.stats()['evictions'] == 1
+
+def test_lru_eviction_by_bytes():
+    cache = LRUCache(max_entries=100, max_bytes=10, ttl=None, sizeof=len)
+    cache.set('a', 'xxxx')
+    cache.set('b', 'yyyy')
+    cache.set('c', 'zzzz')
+
+    assert 'a' not in cache
+    assert cache.stats()['bytes'] == 8
+    # Values larger than the whole budget are rejected outright
+    assert cache.set('big', 'x' * 11) is False
+    assert 'big' not in cache
+
+def test_ttl_expiry():
+    cache = LRUCache(ttl=0.05)
+    cache.set('a', 1)
+    assert cache.get('a') == 1
+    time.sleep(0.06)
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+def test_hit_miss_counters():
+    cache = LRUCache()
+    cache.get('missing')
+    cache.set('a', 1)
+    cache.get('a')
+    cache.get('a')
+
+    stats = cache.stats()
+    assert stats['hits'] == 2
+    assert stats['misses'] == 1
+    assert stats['hit_rate'] == round(2 / 3, 4)
+
+def test_content_hash_is_unambiguous():
+    assert content_hash('ab', 'c') != content_hash('a', 'bc')
+    assert content_hash('code', None) != content_hash('code', 'None')
+    assert content_hash('code', 'python', True) == content_hash('code', 'python', True)
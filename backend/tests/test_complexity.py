@@ -0,0 +1,34 @@
+# tests/test_complexity.py
+
+from services.parsers import cyclomatic_complexity
+from services.documentation_generator import CodeBlock, DocumentationGenerator
+
+def test_counts_each_decision_point_once():
+    code = '''if (a && b) { x(); } else if (c || d) { y(); }
+for (int i = 0; i < n; i++) { while (z) { } }
+switch (v) { case 1: break; case 2: break; }
+try { } catch (Exception e) { }'''
+    # if, &&, else if, ||, for, while, case, case, catch
+    assert cyclomatic_complexity(code, 'java') == 10
+
+def test_ignores_comments_and_strings():
+    java = '// if for while\nString s = "if (a && b)"; /* case */\nif (ok) { }'
+    assert cyclomatic_complexity(java, 'java') == 2
+
+    python = '"""if and or"""\nvalue = "while"  # for\nif value and other:\n    pass'
+    assert cyclomatic_complexity(python, 'python') == 3
+
+    js = 'const t = `if ${a} for`;\nif (t) { }'
+    assert cyclomatic_complexity(js, 'javascript') == 2
+
+def test_generator_memoizes_on_block():
+    generator = DocumentationGenerator(use_ai=False)
+    doc = generator.generate('function f(a) {\n    if (a) { return 1; }\n    return 0;\n}\n',
+                             'javascript', use_ai=False)
+
+    block = doc.code_blocks[0]
+    assert block.complexity == 2
+    block.content = ''
+    # Later callers (metrics, exporters) reuse the stored value
+    assert generator._calculate_complexity(block) == 2
+    assert CodeBlock(content='', language='cpp', line_number=1).complexity is None
@@ -0,0 +1,110 @@
+# tests/test_deadline.py
+
+import math
+import pytest
+from unittest.mock import Mock, patch
+from config import Config
+from services.github_service import GitHubService
+from services.translator import TranslatorService
+from utils.deadline import Deadline
+
+CODE = 'def hello():\n    return "hello"\n'
+
+def test_deadline_budget():
+    unbounded = Deadline()
+    assert unbounded.remaining() == math.inf
+    assert unbounded.timeout(10) == 10
+    assert unbounded.check()
+
+    deadline = Deadline(5)
+    assert 0 < deadline.timeout(10) <= 5
+    with patch('utils.deadline.time.sleep') as sleep:
+        assert not deadline.sleep(4, reserve=2)
+        sleep.assert_not_called()
+        assert deadline.cut_short
+        assert deadline.sleep(1, reserve=2)
+        sleep.assert_called_once_with(1)
+
+    spent = Deadline(0)
+    assert spent.expired and not spent.check() and spent.cut_short
+
+@pytest.fixture
+def generator(generator):
+    generator.gemini_model.generate_content.side_effect = RuntimeError('503 Service Unavailable')
+    return generator
+
+def test_gemini_retry_needs_budget(generator):
+    with patch('utils.deadline.time.sleep') as sleep:
+        deadline = Deadline(1)
+        assert generator._generate_ai_documentation(CODE, 'python', deadline) is None
+        assert generator.gemini_model.generate_content.call_count == 1
+        sleep.assert_not_called()
+        assert deadline.cut_short
+
+        # Without a deadline the backoff and retry still happen
+        generator._generate_ai_documentation(CODE, 'python')
+        assert generator.gemini_model.generate_content.call_count == 3
+        sleep.assert_called_once_with(1)
+
+def test_gemini_call_timeout_capped_by_deadline(generator):
+    generator.gemini_model.generate_content.side_effect = None
+    generator.gemini_model.generate_content.return_value = Mock(text='{"title": "Hello"}')
+    with patch('services.documentation_generator._genai_version', return_value=(0, 8)):
+        generator._generate_ai_documentation(CODE, 'python', Deadline(5))
+        generator._generate_ai_documentation(CODE + '\n', 'python')
+
+    bounded, unbounded = generator.gemini_model.generate_content.call_args_list
+    assert 0 < bounded.kwargs['request_options']['timeout'] <= 5
+    assert unbounded.kwargs['request_options']['timeout'] == Config.AI_TIMEOUT
+
+    with patch('services.documentation_generator._genai_version', return_value=(0, 3)):
+        assert generator._request_options(Deadline(5)) == {}
+
+def test_spent_deadline_returns_uncached_partial_documentation(generator):
+    deadline = Deadline(0)
+    doc = generator.generate(CODE, 'python', deadline=deadline)
+
+    generator.gemini_model.generate_content.assert_not_called()
+    assert deadline.cut_short
+    assert doc.code_blocks
+    assert generator.result_cache.get(doc.id) is None
+
+    events = list(generator.generate_stream(CODE, 'python', deadline=Deadline(0)))
+    assert events[-1][0] == 'done' and events[-1][1]['partial']
+
+def test_batch_translate_skips_backoff_without_budget():
+    translator = TranslatorService()
+    with patch.object(translator, 'translate', return_value={'error': 'Translation failed: 429'}) as translate, \
+            patch('utils.deadline.time.sleep') as sleep:
+        deadline = Deadline(1)
+        results = translator.batch_translate(['one', 'two'], 'fr', deadline=deadline)
+
+    assert results == [{'error': 'Translation failed: 429'}] * 2
+    assert translate.call_count == 2
+    # Only rate limiting waits (under 0.1s); neither text backs off for a retry
+    assert all(call.args[0] < 1 for call in sleep.call_args_list)
+    assert deadline.cut_short
+
+    skipped = translator.translate('one', 'fr', deadline=Deadline(0))
+    assert skipped['skipped']
+
+def test_github_calls_bounded_by_deadline():
+    github = GitHubService()
+    github.token = 'test_token'
+    def response(url, **kwargs):
+        return Mock(status_code=200, json=Mock(return_value=[] if url.endswith('contributors') else {}))
+
+    with patch('services.github_service.requests.get', side_effect=response) as get:
+        github.get_repository_info('octo', 'one')
+        assert get.call_args.kwargs['timeout'] == Config.GITHUB_TIMEOUT
+
+        analysis = github.analyze_repository('octo', 'two', Deadline(3))
+        assert get.call_count == 6
+        assert all(0 < call.kwargs['timeout'] <= 3 for call in get.call_args_list[1:])
+        assert 'partial' not in analysis
+
+        get.reset_mock()
+        deadline = Deadline(0)
+        assert 'error' in github.get_repository_info('octo', 'three', deadline)
+        get.assert_not_called()
+        assert deadline.cut_short
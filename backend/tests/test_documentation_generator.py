@@ -2,7 +2,7 @@
 
 import unittest
 from datetime import datetime
-from unittest.mock import patch
+from unittest.mock import patch, Mock
 import tempfile
 import os
 from services.documentation_generator import DocumentationGenerator, Documentation
@@ -89,24 +89,91 @@ class TestClass:
                 content = file.read()
                 assert "Test Doc" in content
 
+    def test_markdown_export_streams_chunks(self):
+        """The markdown export is produced per block and matches the whole-string export"""
+        doc = self.generator.generate(self.test_code, "python", use_ai=False)
+        chunks = list(self.generator.export_stream(doc, format='markdown', template='detailed'))
+        self.assertGreater(len(chunks), len(doc.code_blocks))
+        self.assertEqual(''.join(chunks), self.generator._export_markdown(doc, 'detailed'))
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, 'doc.md')
+            self.generator.save_documentation(doc, output_path)
+            with open(output_path, 'r') as file:
+                self.assertEqual(file.read(), self.generator._export_markdown(doc, 'default'))
+
+    def test_html_export(self):
+        """The HTML export has every section, highlighted and escaped blocks, and streams per block"""
+        self.generator.export_cache = None
+        doc = self.generator.generate(self.test_code + "\ndef tag():\n    return '<b>'\n", "python",
+                                      description="Greets <everyone>", use_ai=False)
+        output = self.generator.export_documentation(doc, format='html', template='detailed')
+        self.assertIn('<h1>Python Documentation</h1>', output)
+        self.assertIn('Greets &lt;everyone&gt;', output)
+        self.assertIn('<a href="#block-at-line-2">hello_world</a>', output)
+        self.assertIn('<table class="metrics-table">', output)
+        self.assertIn('<span class="k">def</span>', output)
+        self.assertIn('&#39;&lt;b&gt;&#39;', output)
+        self.assertIn('Generated at:', output)
+        self.assertNotIn('Generated at:', self.generator.export_documentation(doc, 'html', 'default'))
+
+        chunks = list(self.generator.export_stream(doc, format='html', template='detailed'))
+        self.assertGreater(len(chunks), len(doc.code_blocks))
+        self.assertEqual(''.join(chunks), output)
+
+    def test_html_highlighting_cached_per_block(self):
+        """Re-exporting after a one-block change highlights only that block"""
+        self.generator.export_cache = None
+        doc = self.generator.generate(self.test_code, "python", use_ai=False)
+        self.generator.export_documentation(doc, format='html')
+        self.assertEqual(self.generator.highlight_cache.misses, len(doc.code_blocks))
+
+        changed = self.generator.generate(self.test_code.replace('Hello World!', 'Hello!'), "python", use_ai=False)
+        with patch('pygments.format', wraps=__import__('pygments').format) as highlight:
+            self.generator.export_documentation(changed, format='html')
+        self.assertEqual(highlight.call_count, 1)
+        self.assertEqual(self.generator.highlight_cache.hits, len(doc.code_blocks) - 1)
+
+    def test_code_blocks_share_the_source(self):
+        """Blocks are offsets into the parsed source; text is sliced only when asked for"""
+        for code, parse in ((self.test_code, self.generator._parse_python),
+                            (self.test_code + "def broken(:\n", self.generator._parse_python_lines)):
+            lines = code.split('\n')
+            blocks = parse(code)
+            # The line scanner runs each block up to the next one
+            next_starts = [block.line_number - 1 for block in blocks[1:]] + [len(lines)]
+            for block, next_start in zip(blocks, next_starts):
+                self.assertIs(block.source, code)
+                end_line = block.end_line or next_start
+                expected = '\n'.join(lines[block.line_number - 1:end_line])
+                self.assertEqual(block.content, expected)
+                self.assertEqual(block.char_count, len(expected))
+                self.assertEqual(block.line_count, len(expected.split('\n')))
+                self.assertEqual(block.first_line, expected.split('\n')[0])
+
+        block = self.generator._parse_python(self.test_code)[0]
+        self.assertFalse(hasattr(block, '__dict__'))
+        block.content = 'def other(): pass'
+        self.assertEqual(block.to_dict()['content'], 'def other(): pass')
+        self.assertEqual(block.line_count, 1)
+
     def test_advanced_metrics(self):
         """Test advanced metrics calculation"""
         doc = self.generator.generate(self.test_code, "python")
         for block in doc.code_blocks:
-            metrics = self.generator._calculate_advanced_metrics(block)
+            metrics = block.metrics
             # Basic metrics should always be present
             self.assertIn('loc', metrics)
             self.assertIn('sloc', metrics)
-            self.assertIn('comments', metrics)
+            self.assertIn('comment_lines', metrics)
             self.assertIn('complexity', metrics)
             self.assertIn('token_count', metrics)
             self.assertIn('char_count', metrics)
             
             # Advanced metrics may be present if radon is available
             if self.generator.RADON_AVAILABLE:
-                self.assertIn('cognitive_complexity', metrics)
                 self.assertIn('maintainability_index', metrics)
-                self.assertIn('halstead_metrics', metrics)
+                self.assertIn('halstead_volume', metrics)
 
     def test_language_specific_parsing(self):
         """Test language-specific parsing features"""
@@ -121,5 +188,88 @@ class TestClass:
             self.assertTrue(len(doc.code_blocks) > 0)
             self.assertEqual(doc.language, lang)
 
+    def test_result_cache_hit(self):
+        """Identical requests are served from the result cache"""
+        generator = DocumentationGenerator(use_ai=False)
+        first = generator.generate(self.test_code, "python", use_ai=False)
+        with patch.object(generator, '_parse_code_blocks') as mock_parse:
+            second = generator.generate(self.test_code, "python", use_ai=False)
+            mock_parse.assert_not_called()
+
+        self.assertIs(first, second)
+        stats = generator.result_cache.stats()
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 1)
+
+    def test_result_cache_key_inputs(self):
+        """Any change to code, title or description is a cache miss"""
+        generator = DocumentationGenerator(use_ai=False)
+        base = generator.generate(self.test_code, "python", use_ai=False)
+        self.assertIsNot(base, generator.generate(self.test_code + "\n# edit", "python", use_ai=False))
+        self.assertIsNot(base, generator.generate(self.test_code, "python", title="Other", use_ai=False))
+        self.assertIsNot(base, generator.generate(self.test_code, "python", description="Other", use_ai=False))
+        self.assertEqual(generator.result_cache.stats()['hits'], 0)
+
+    def test_failed_ai_result_not_cached(self):
+        """A request whose AI step failed is retried rather than cached"""
+        generator = DocumentationGenerator(use_ai=False)
+        generator.use_ai = True
+        with patch.object(generator, '_generate_ai_documentation', return_value=None) as mock_ai:
+            generator.generate(self.test_code, "python")
+            generator.generate(self.test_code, "python")
+        self.assertEqual(mock_ai.call_count, 2)
+
+    def test_ai_response_persisted(self):
+        """Parsed Gemini responses survive a generator (worker) restart"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            cache_path = os.path.join(temp_dir, 'ai.sqlite3')
+            with patch('config.Config.AI_CACHE_PATH', cache_path):
+                first = DocumentationGenerator(use_ai=False)
+                restarted = DocumentationGenerator(use_ai=False)
+
+            for generator in (first, restarted):
+                generator.use_ai = True
+                generator.gemini_model = Mock()
+                generator.gemini_model.generate_content.return_value = Mock(
+                    text='{"title": "Hello", "overview": "Says hello"}'
+                )
+
+            self.assertEqual(first._generate_ai_documentation(self.test_code, 'python')['title'], 'Hello')
+            result = restarted._generate_ai_documentation(self.test_code, 'python')
+
+            self.assertEqual(result, {'title': 'Hello', 'overview': 'Says hello'})
+            restarted.gemini_model.generate_content.assert_not_called()
+
+    def test_malformed_ai_reply_repaired_and_counted(self):
+        """A reply that is almost JSON is repaired instead of kept as plain text"""
+        generator = DocumentationGenerator(use_ai=False)
+        generator.ai_cache = None
+        generator.use_ai = True
+        generator.gemini_model = Mock()
+        generator.gemini_model.generate_content.return_value = Mock(
+            text='```json\n{"title": "Hello", "notes": ["a", "b",], "overview": "Says\nhello'
+        )
+
+        result = generator._generate_ai_documentation(self.test_code, 'python')
+
+        self.assertEqual(result, {'title': 'Hello', 'notes': ['a', 'b'], 'overview': 'Says\nhello'})
+        generator.gemini_model.generate_content.return_value = Mock(text='{"title": "Hi"}')
+        generator._generate_ai_documentation(self.test_code + '\n', 'python')
+        self.assertIsNone(generator._parse_ai_response('No JSON here'))
+        stats = generator.ai_parsing_stats()
+        self.assertEqual((stats['parsed'], stats['repaired'], stats['failed']), (1, 1, 1))
+        self.assertGreater(stats['repair_ms'], 0)
+
+    def test_structured_output_mode(self):
+        """With a recent SDK the reply is requested as schema-constrained JSON"""
+        with patch('services.documentation_generator._structured_output_supported', return_value=True):
+            generator = DocumentationGenerator(use_ai=False)
+        self.assertEqual(generator.generation_config['response_mime_type'], 'application/json')
+        self.assertIn('components', generator.generation_config['response_schema']['properties'])
+        self.assertTrue(generator.ai_parsing_stats()['structured_output'])
+
+        with patch('services.documentation_generator._structured_output_supported', return_value=False):
+            self.assertNotIn('response_schema', DocumentationGenerator(use_ai=False).generation_config)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,73 @@
+# tests/test_documentation_stream.py
+
+import json
+import pytest
+from unittest.mock import Mock
+from utils.json_stream import JsonSectionStream
+
+SOURCE = 'def add(a, b):\n    return a + b\n'
+
+REPLY = ('```json\n{"title": "Adder", "overview": "Adds two\nnumbers.", '
+         '"components": [{"name": "add", "description": "Sum"}], "returns": 3}\n```')
+
+def split(text, size):
+    return [Mock(text=text[i:i + size]) for i in range(0, len(text), size)]
+
+def test_sections_complete_as_soon_as_they_parse():
+    stream = JsonSectionStream()
+    seen = []
+    for piece in split(REPLY, 7):
+        seen.append([name for name, _ in stream.feed(piece.text)])
+
+    names = [name for batch in seen for name in batch]
+    assert names == ['title', 'overview', 'components', 'returns']
+    # "title" is available long before the reply ends
+    assert next(i for i, batch in enumerate(seen) if batch) < len(seen) // 3
+    assert stream.feed('') == []
+
+def test_trailing_number_waits_for_delimiter():
+    stream = JsonSectionStream()
+    assert stream.feed('{"count": 12') == []
+    assert stream.feed('3}') == [('count', 123)]
+
+def test_stream_sends_blocks_first_then_sections(generator):
+    generator.gemini_model.generate_content.return_value = split(REPLY, 11)
+    events = list(generator.generate_stream(SOURCE, 'python'))
+
+    kinds = [event for event, _ in events]
+    assert kinds[:2] == ['blocks', 'metrics']
+    assert kinds[-1] == 'done'
+    sections = {payload['name']: payload['content'] for event, payload in events if event == 'section'}
+    assert sections['overview'] == 'Adds two\nnumbers.'
+    assert events[0][1]['code_blocks'][0]['name'] == 'add'
+    assert generator.gemini_model.generate_content.call_args.kwargs['stream'] is True
+
+    done = events[-1][1]
+    doc = generator.result_cache.get(done['id'])
+    assert doc.title == done['title'] == 'Adder'
+    assert doc.ai_enhanced['components'][0]['name'] == 'add'
+    json.dumps(events)
+
+def test_cached_result_replays_without_gemini(generator):
+    generator.gemini_model.generate_content.return_value = split(REPLY, 50)
+    first = list(generator.generate_stream(SOURCE, 'python'))
+    second = list(generator.generate_stream(SOURCE, 'python'))
+
+    assert generator.gemini_model.generate_content.call_count == 1
+    assert [event for event, _ in second] == [event for event, _ in first]
+
+def test_failure_midway_is_partial_and_not_cached(generator):
+    def broken():
+        yield Mock(text='{"title": "Adder", ')
+        raise RuntimeError("connection reset")
+    generator.gemini_model.generate_content.return_value = broken()
+
+    events = list(generator.generate_stream(SOURCE, 'python'))
+
+    assert [payload['name'] for event, payload in events if event == 'section'] == ['title']
+    assert events[-1][1]['partial']
+    assert generator.result_cache.get(events[-1][1]['id']) is None
+
+def test_invalid_language_raises_before_streaming(generator):
+    with pytest.raises(ValueError):
+        generator.generate_stream(SOURCE, 'cobol')
@@ -0,0 +1,91 @@
+# tests/test_file_scanner.py
+
+import os
+import tempfile
+import pytest
+from utils.file_scanner import DEFAULT_SKIP_DIRS, FileScanner, is_ignored, parse_ignore_lines
+from utils.validators import LANGUAGE_BY_EXTENSION
+
+TREE = {
+    '.gitignore': '# generated\n*.gen.py\n/local/\nlogs/\n!keep.gen.py\ndocs/**/draft_*.py\n',
+    'app.py': 'print(1)\n',
+    'keep.gen.py': '',
+    'skip.gen.py': '',
+    'web/index.tsx': '',
+    'web/util.ts': '',
+    'web/.ignore': 'legacy.ts\n',
+    'web/legacy.ts': '',
+    'web/logs/trace.py': '',
+    'local/scratch.py': '',
+    'src/local/kept.py': '',
+    'docs/a/b/draft_1.py': '',
+    'docs/a/final.py': '',
+    'node_modules/pkg/index.js': '',
+    '.git/hooks/pre-commit.py': '',
+    'tools/env/pyvenv.cfg': '',
+    'tools/env/lib/site.py': '',
+    'big.py': 'x' * 2048,
+    'notes.md': ''
+}
+
+@pytest.fixture
+def repo():
+    with tempfile.TemporaryDirectory() as root:
+        for name, content in TREE.items():
+            path = os.path.join(root, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as handle:
+                handle.write(content)
+        yield root
+
+def _relative(root, scanned):
+    return [os.path.relpath(entry.path, root).replace(os.sep, '/') for entry in scanned]
+
+def test_honors_ignore_files_and_prunes_directories(repo):
+    scanned = FileScanner(extensions=LANGUAGE_BY_EXTENSION, max_file_bytes=1024).scan(repo)
+
+    assert _relative(repo, scanned) == [
+        'app.py', 'docs/a/final.py', 'keep.gen.py', 'src/local/kept.py', 'web/index.tsx', 'web/util.ts'
+    ]
+    app = scanned[0]
+    assert app.size == len('print(1)\n')
+    assert app.mtime == pytest.approx(os.path.getmtime(os.path.join(repo, 'app.py')))
+    assert app.to_dict() == {'path': app.path, 'size': app.size, 'mtime': app.mtime}
+
+def test_parallel_walk_matches_serial(repo):
+    serial = FileScanner(extensions=LANGUAGE_BY_EXTENSION).scan(repo)
+    parallel = FileScanner(extensions=LANGUAGE_BY_EXTENSION, workers=4).scan(repo)
+
+    assert parallel == serial
+    assert 'big.py' in _relative(repo, serial)
+
+def test_build_directories_are_left_to_ignore_files(repo):
+    for name in ('build/gen.py', 'src/bin/tool.py', 'vendor/lib.py'):
+        path = os.path.join(repo, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        open(path, 'w').close()
+
+    listed = _relative(repo, FileScanner(extensions=LANGUAGE_BY_EXTENSION).scan(repo))
+    assert {'build/gen.py', 'src/bin/tool.py', 'vendor/lib.py'} <= set(listed)
+
+    configured = FileScanner(extensions=LANGUAGE_BY_EXTENSION, skip_dirs=DEFAULT_SKIP_DIRS | {'build', 'vendor'})
+    assert set(_relative(repo, configured.scan(repo))) == set(listed) - {'build/gen.py', 'vendor/lib.py'}
+
+def test_ignore_patterns():
+    rules = parse_ignore_lines(['*.log', 'build/', '/root.txt', 'a/**/z', '**/cache', 'file\\ ', 'x[0-9].py'])
+
+    assert is_ignored(rules, 'deep/dir/app.log', False)
+    assert is_ignored(rules, 'src/build', True) and not is_ignored(rules, 'src/build', False)
+    assert is_ignored(rules, 'root.txt', False) and not is_ignored(rules, 'sub/root.txt', False)
+    assert is_ignored(rules, 'a/z', True) and is_ignored(rules, 'a/b/c/z', False)
+    assert is_ignored(rules, 'one/two/cache', True)
+    assert is_ignored(rules, 'file ', False)
+    assert is_ignored(rules, 'x1.py', False) and not is_ignored(rules, 'xa.py', False)
+
+    nested = parse_ignore_lines(['*.py', '!main.py'], base='pkg')
+    assert is_ignored(nested, 'pkg/sub/util.py', False)
+    assert not is_ignored(nested, 'pkg/main.py', False)
+    assert not is_ignored(nested, 'other/util.py', False)
+
+def test_missing_root_returns_nothing():
+    assert FileScanner().scan(os.path.join(tempfile.gettempdir(), 'does-not-exist-scan')) == []
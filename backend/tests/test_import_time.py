@@ -0,0 +1,42 @@
+# tests/test_import_time.py
+
+import os
+import subprocess
+import sys
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Loaded where they are first used; a worker boot must not import any of them
+LAZY_MODULES = (
+    'google.generativeai', 'reportlab', 'docx', 'pygments', 'radon',
+    'nltk', 'textblob', 'deep_translator', 'langdetect'
+)
+
+# Cumulative `python -X importtime` budget for `server:app`, in milliseconds
+IMPORT_BUDGET_MS = float(os.getenv('IMPORT_BUDGET_MS', '1500'))
+
+@pytest.fixture(scope='module')
+def import_times():
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import server'],
+        cwd=BACKEND_DIR, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line.split('|')
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative) / 1000
+    return times
+
+def test_heavy_backends_not_imported_at_boot(import_times):
+    loaded = [name for name in LAZY_MODULES if name in import_times]
+    assert loaded == []
+
+@pytest.mark.benchmark
+def test_server_import_within_budget(import_times):
+    assert import_times['server'] < IMPORT_BUDGET_MS
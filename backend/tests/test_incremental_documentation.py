@@ -0,0 +1,110 @@
+# tests/test_incremental_documentation.py
+
+from unittest.mock import patch
+from services.documentation_generator import DocumentationGenerator
+
+SOURCE = '''import os
+
+def load(path):
+    with open(path) as handle:
+        return handle.read()
+
+def save(path, data):
+    with open(path, "w") as handle:
+        handle.write(data)
+
+class Store:
+    def get(self, key):
+        return os.environ.get(key)
+'''
+
+AI_DOC = {'title': 'Store helpers', 'overview': 'Reads and writes files.'}
+
+def test_body_edit_reuses_blocks_and_ai(generator):
+    with patch.object(generator, '_generate_ai_documentation', return_value=AI_DOC) as ai:
+        first = generator.generate(SOURCE, 'python')
+        edited = SOURCE.replace('return handle.read()', 'return handle.read().strip()')
+        second = generator.generate(edited, 'python', previous=first.id)
+
+    assert ai.call_count == 1
+    assert second.ai_enhanced is AI_DOC
+    assert second.incremental['ai_reused']
+    assert second.incremental['changed_blocks'] == ['load']
+    assert second.incremental['reused_blocks'] == 2
+    store = second.code_blocks[2]
+    assert store.metrics == first.code_blocks[2].metrics
+    assert store.metrics is not first.code_blocks[2].metrics
+    assert store.hash == first.code_blocks[2].hash
+
+def test_signature_edit_calls_ai_again(generator):
+    with patch.object(generator, '_generate_ai_documentation', return_value=AI_DOC) as ai:
+        first = generator.generate(SOURCE, 'python')
+        edited = SOURCE.replace('def save(path, data):', 'def save(path, data, mode="w"):')
+        second = generator.generate(edited, 'python', previous=first)
+
+    assert ai.call_count == 2
+    assert not second.incremental['ai_reused']
+    assert second.incremental['changed_blocks'] == ['save']
+
+def test_top_level_edit_changes_outline(generator):
+    with patch.object(generator, '_generate_ai_documentation', return_value=AI_DOC) as ai:
+        first = generator.generate(SOURCE, 'python')
+        generator.generate(SOURCE.replace('import os', 'import os\nimport sys'), 'python', previous=first)
+
+    assert ai.call_count == 2
+
+def test_nested_method_signature_in_braced_language(generator):
+    java = 'class Repo {\n' + ''.join(
+        f'    int get{i}() {{\n        return {i};\n    }}\n' for i in range(3)
+    ) + '    int size() { return 0; }\n}\n'
+    with patch.object(generator, '_generate_ai_documentation', return_value=AI_DOC) as ai:
+        first = generator.generate(java, 'java')
+        body_edit = generator.generate(java.replace('return 0;', 'return 1;'), 'java', previous=first)
+        renamed = generator.generate(java.replace('size()', 'count()'), 'java', previous=first)
+
+    assert body_edit.incremental['ai_reused']
+    assert not renamed.incremental['ai_reused']
+    assert ai.call_count == 2
+
+def test_block_hashes_without_previous_result():
+    generator = DocumentationGenerator(use_ai=False)
+    first = generator.generate(SOURCE, 'python', use_ai=False)
+    hashes = [block.hash for block in first.code_blocks]
+
+    edited = SOURCE.replace('def save(path, data):', 'def store(path, data):')
+    second = generator.generate(edited, 'python', use_ai=False, block_hashes=hashes)
+
+    assert second.incremental['previous_id'] is None
+    assert second.incremental['changed_blocks'] == ['store']
+    assert second.incremental['removed_blocks'] == 1
+    assert second.to_dict()['code_blocks'][0]['hash'] == hashes[0]
+
+def test_unknown_previous_id_falls_back_to_full_run():
+    generator = DocumentationGenerator(use_ai=False)
+    doc = generator.generate(SOURCE, 'python', use_ai=False, previous='missing')
+
+    assert doc.incremental['reused_blocks'] == 0
+    assert len(doc.incremental['changed_blocks']) == len(doc.code_blocks)
+
+def test_unchanged_code_served_from_cache_still_reports_incremental():
+    generator = DocumentationGenerator(use_ai=False)
+    first = generator.generate(SOURCE, 'python', use_ai=False)
+    again = generator.generate(SOURCE, 'python', use_ai=False, previous=first.id)
+
+    assert generator.result_cache.stats()['hits'] >= 1
+    assert again.incremental['changed_blocks'] == []
+    assert again.incremental['reused_blocks'] == len(first.code_blocks)
+    assert again.incremental['previous_id'] == first.id
+    assert first.incremental is None
+
+def test_plain_request_after_incremental_has_no_summary():
+    generator = DocumentationGenerator(use_ai=False)
+    first = generator.generate(SOURCE, 'python', use_ai=False)
+    edited = SOURCE.replace('import os', 'import os\nimport sys')
+    incremental = generator.generate(edited, 'python', use_ai=False, previous=first)
+    plain = generator.generate(edited, 'python', use_ai=False)
+
+    assert incremental.incremental['previous_id'] == first.id
+    assert plain.incremental is None
+    assert plain.to_dict()['incremental'] is None
+    assert plain.id == incremental.id
@@ -0,0 +1,88 @@
+# tests/test_job_manager.py
+
+import os
+import tempfile
+import threading
+import pytest
+from services.job_manager import JobManager, JobQueueFull
+from utils.persistent_cache import PersistentCache
+
+@pytest.fixture
+def store():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield PersistentCache(os.path.join(temp_dir, 'jobs.sqlite3'))
+
+def _require_name(params):
+    if 'name' not in params:
+        raise ValueError("name is required")
+
+def test_job_runs_in_background_and_result_is_stored(store):
+    release = threading.Event()
+    manager = JobManager(store)
+    manager.register('greet', lambda params: release.wait(5) and f"Hello, {params['name']}", _require_name)
+
+    job = manager.submit('greet', {'name': 'Ada'})
+    assert job['status'] == 'queued'
+    assert manager.get(job['id'])['status'] in ('queued', 'running')
+
+    release.set()
+    finished = manager.get(job['id'], wait=5)
+    assert finished['status'] == 'succeeded'
+    assert finished['result'] == 'Hello, Ada'
+    assert finished['finished_at'] >= finished['started_at'] >= finished['created_at']
+
+    # Another worker only shares the store
+    other = JobManager(store)
+    assert other.get(job['id'])['result'] == 'Hello, Ada'
+    manager.shutdown()
+
+def test_validation_happens_at_submit(store):
+    manager = JobManager(store)
+    manager.register('greet', lambda params: params['name'], _require_name)
+
+    with pytest.raises(ValueError):
+        manager.submit('greet', {})
+    with pytest.raises(ValueError):
+        manager.submit('unknown', {'name': 'Ada'})
+    assert manager.stats()['submitted'] == 0
+
+def test_failures_and_unstorable_results_are_reported(store):
+    manager = JobManager(store)
+    manager.register('boom', lambda params: 1 / 0)
+    manager.register('opaque', lambda params: object())
+
+    failed = manager.get(manager.submit('boom', {})['id'], wait=5)
+    opaque = manager.get(manager.submit('opaque', {})['id'], wait=5)
+
+    assert failed['status'] == 'failed' and 'division' in failed['error']
+    assert opaque['status'] == 'failed' and 'result' not in opaque
+    assert manager.stats()['failed'] == 2
+    manager.shutdown()
+
+def test_pending_cap_and_concurrency(store):
+    release = threading.Event()
+    running = []
+    manager = JobManager(store, max_concurrent=1, max_pending=2)
+    manager.register('wait', lambda params: running.append(1) or release.wait(5))
+
+    first = manager.submit('wait', {})
+    second = manager.submit('wait', {})
+    with pytest.raises(JobQueueFull):
+        manager.submit('wait', {})
+    manager.get(first['id'], wait=0.2)
+    assert manager.stats()['running'] == 1
+    assert manager.get(second['id'])['status'] == 'queued'
+
+    release.set()
+    assert manager.get(second['id'], wait=5)['status'] == 'succeeded'
+    assert manager.stats()['rejected'] == 1
+    manager.shutdown()
+
+def test_records_expire_after_ttl(store):
+    manager = JobManager(store, ttl=0.05)
+    manager.register('noop', lambda params: None)
+    job = manager.submit('noop', {})
+    manager.shutdown()
+
+    threading.Event().wait(0.1)
+    assert manager.get(job['id']) is None
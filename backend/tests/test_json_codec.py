@@ -0,0 +1,66 @@
+# tests/test_json_codec.py
+
+import json
+import pytest
+from flask import Flask, request
+from services.documentation_generator import Documentation
+from utils.json_codec import ORJSON_AVAILABLE, JsonCodec
+from utils.json_response import JsonRequest, jsonify
+
+BACKENDS = ['json'] + (['orjson'] if ORJSON_AVAILABLE else [])
+
+DOCUMENT = {
+    'title': 'Café docs',
+    'count': 3,
+    'ratio': 0.5,
+    'tags': {'b'},
+    'nested': {'items': [1, None, True], 'huge': 2 ** 70},
+}
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_round_trip_and_modes(backend):
+    codec = JsonCodec(backend)
+    compact = codec.dumps(DOCUMENT)
+    pretty = codec.dumps(DOCUMENT, pretty=True)
+
+    expected = dict(DOCUMENT, tags=['b'])
+    assert codec.loads(compact) == expected
+    assert json.loads(pretty) == expected
+    assert b'\n' not in compact and b', ' not in compact
+    assert b'\n  "title": "Caf\xc3\xa9 docs"' in pretty
+    assert codec.dumps_str({'a': 1}) == '{"a":1}'
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_backends_agree_on_documents(backend):
+    doc = Documentation(title='T', description='D', code_blocks=[], language='python', metrics={'loc': 1})
+    assert JsonCodec(backend).dumps(doc) == JsonCodec('json').dumps(doc.to_dict())
+    assert JsonCodec(backend).dumps({1: 'a'}) == b'{"1":"a"}'
+
+@pytest.mark.parametrize('backend', BACKENDS)
+def test_invalid_input_is_a_value_error(backend):
+    with pytest.raises(ValueError):
+        JsonCodec(backend).loads(b'{"a": ')
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        JsonCodec('simplejson')
+
+def test_request_parsing_and_responses():
+    app = Flask(__name__)
+    app.request_class = JsonRequest
+
+    @app.route('/echo', methods=['POST'])
+    def echo():
+        return jsonify(request.get_json())
+
+    with app.test_client() as client:
+        response = client.post('/echo', json={'code': 'x = "ü"', 'n': [1, 2]})
+        assert response.mimetype == 'application/json'
+        assert response.data == '{"code":"x = \\"ü\\"","n":[1,2]}\n'.encode('utf-8')
+        assert response.get_json() == {'code': 'x = "ü"', 'n': [1, 2]}
+
+        pretty = client.post('/echo?pretty=1', json={'n': 1})
+        assert pretty.data == b'{\n  "n": 1\n}\n'
+
+        invalid = client.post('/echo', data='{"n": ', content_type='application/json')
+        assert invalid.status_code == 400
@@ -0,0 +1,47 @@
+# tests/test_json_repair.py
+
+import json
+import time
+import pytest
+from utils.json_repair import repair_json
+
+def test_valid_json_is_unchanged():
+    value = {'title': 'T', 'items': [1, 2.5, -3e2, True, False, None], 'nested': {'s': 'a "q" \\ é'}}
+    assert repair_json(json.dumps(value)) == value
+    assert repair_json(json.dumps(value, indent=2)) == value
+
+def test_common_model_mistakes():
+    reply = (
+        'Sure! Here is the documentation:\n```json\n'
+        "{title: 'Parser', \"overview\": \"Reads\nfiles\", \"notes\": [\"a\", \"b\",],\n"
+        '"quote": "says "hi" twice", "ok": True, "none": None,}\n```'
+    )
+    assert repair_json(reply) == {
+        'title': 'Parser', 'overview': 'Reads\nfiles', 'notes': ['a', 'b'],
+        'quote': 'says "hi" twice', 'ok': True, 'none': None
+    }
+
+def test_missing_comma_between_members():
+    assert repair_json('{"a": "x"\n  "b": 2}') == {'a': 'x', 'b': 2}
+
+def test_truncated_output_is_closed():
+    reply = '{"title": "T", "components": [{"name": "f", "description": "does th'
+    assert repair_json(reply) == {'title': 'T', 'components': [{'name': 'f', 'description': 'does th'}]}
+
+def test_no_json_raises():
+    with pytest.raises(ValueError):
+        repair_json('I cannot document this code.')
+
+def test_repair_time_is_linear():
+    # Many stray quotes inside one unterminated string, each needing a lookahead
+    small = '{"a": "' + 'x" ' * 5000
+    large = '{"a": "' + 'x" ' * 50000
+    start = time.perf_counter()
+    repair_json(small)
+    small_time = time.perf_counter() - start
+    start = time.perf_counter()
+    # The last quote, followed only by whitespace, closes the string
+    assert repair_json(large) == {'a': 'x" ' * 49999 + 'x'}
+    large_time = time.perf_counter() - start
+
+    assert large_time < max(small_time, 0.001) * 40
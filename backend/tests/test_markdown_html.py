@@ -0,0 +1,54 @@
+# tests/test_markdown_html.py
+
+import time
+import pytest
+from utils.markdown_html import inline_html, markdown_to_html
+
+def test_block_elements():
+    markdown = (
+        '# Title #\n\nFirst line\nsecond line\n\n'
+        '- one\n* two\n1. first\n2) second\n\n'
+        '```python\nif a < b:\n\n    pass\n```\n'
+        '## Next\n#tag is not a heading\n####### nor is this'
+    )
+
+    assert markdown_to_html(markdown) == (
+        '<h1>Title</h1>\n<p>First line\nsecond line</p>\n'
+        '<ul>\n<li>one</li>\n<li>two</li>\n</ul>\n<ol>\n<li>first</li>\n<li>second</li>\n</ol>\n'
+        '<div class="code-block"><div class="code-block-header">python</div>'
+        '<pre><code>if a &lt; b:\n\n    pass</code></pre></div>\n'
+        '<h2>Next</h2>\n<p>#tag is not a heading\n####### nor is this</p>\n'
+    )
+
+def test_inline_spans_and_escaping():
+    assert inline_html('**bold** and *it* <x> & `a*b* <y>`') == \
+        '<strong>bold</strong> and <em>it</em> &lt;x&gt; &amp; <code>a*b* &lt;y&gt;</code>'
+    assert inline_html('a **b *c* d** e') == 'a <strong>b <em>c</em> d</strong> e'
+    # Unpaired or empty delimiters stay literal
+    assert inline_html('2 ** 3 and `tick') == '2 ** 3 and `tick'
+    assert inline_html('**') == '**'
+
+def test_json_fence_goes_to_render_json():
+    markdown = '## Metrics\n\n```json\n{"loc": 3}\n```\nafter'
+    assert markdown_to_html(markdown, render_json=lambda body: f'[{body}]') == \
+        '<h2>Metrics</h2>\n<div class="metrics">[{"loc": 3}]</div>\n<p>after</p>\n'
+    assert '<div class="code-block-header">json</div>' in markdown_to_html(markdown)
+
+def test_unclosed_fence_runs_to_the_end():
+    assert markdown_to_html('text\n```js\nlet a = 1;') == (
+        '<p>text</p>\n<div class="code-block"><div class="code-block-header">js</div>'
+        '<pre><code>let a = 1;</code></pre></div>\n'
+    )
+
+@pytest.mark.benchmark
+def test_pathological_input_stays_linear():
+    # Quadratic for the previous regex converter: every fence opener rescanned the rest
+    small, large = 'x```a\n' * 5000 + '*x ' * 5000, 'x```a\n' * 50000 + '*x ' * 50000
+    start = time.perf_counter()
+    markdown_to_html(small)
+    small_time = time.perf_counter() - start
+    start = time.perf_counter()
+    markdown_to_html(large)
+    large_time = time.perf_counter() - start
+
+    assert large_time < max(small_time, 0.001) * 40
@@ -0,0 +1,80 @@
+# tests/test_persistent_cache.py
+
+import os
+import tempfile
+import threading
+import time
+from utils.persistent_cache import PersistentCache
+from utils.sqlite_connections import SQLiteConnections
+
+def _cache_path(temp_dir):
+    return os.path.join(temp_dir, 'cache', 'test.sqlite3')
+
+def test_round_trip_and_persistence():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = PersistentCache(_cache_path(temp_dir))
+        assert cache.get('missing') is None
+        assert cache.set('key', {'title': 'Doc', 'notes': ['a', 'b']})
+        assert cache.get('key') == {'title': 'Doc', 'notes': ['a', 'b']}
+
+        # A fresh instance (e.g. a restarted worker) sees the same data
+        restarted = PersistentCache(_cache_path(temp_dir))
+        assert restarted.get('key') == {'title': 'Doc', 'notes': ['a', 'b']}
+        assert restarted.stats()['entries'] == 1
+
+def test_size_bounded_eviction():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = PersistentCache(_cache_path(temp_dir), max_bytes=100)
+        cache.set('a', 'x' * 40)
+        time.sleep(0.01)
+        cache.set('b', 'y' * 40)
+        time.sleep(0.01)
+        cache.get('a')  # 'b' becomes the least recently used entry
+        cache.set('c', 'z' * 40)
+
+        assert cache.get('b') is None
+        assert cache.get('a') == 'x' * 40
+        assert cache.get('c') == 'z' * 40
+        assert cache.stats()['bytes'] <= 100
+        assert cache.set('huge', 'x' * 200) is False
+
+def test_ttl_expiry():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cache = PersistentCache(_cache_path(temp_dir), ttl=0.05)
+        cache.set('key', 'value')
+        time.sleep(0.06)
+        assert cache.get('key') is None
+
+def test_concurrent_writers():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = _cache_path(temp_dir)
+        caches = [PersistentCache(path), PersistentCache(path)]
+
+        def writer(index):
+            cache = caches[index % 2]
+            for i in range(25):
+                cache.set(f'{index}-{i}', {'value': i})
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert caches[0].stats()['entries'] == 100
+        assert sum(cache.errors for cache in caches) == 0
+
+def test_connections_are_per_thread_in_wal_mode():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        connections = SQLiteConnections(_cache_path(temp_dir), ['CREATE TABLE IF NOT EXISTS t (x INTEGER)'])
+        conn = connections.get()
+        assert connections.get() is conn
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+
+        other = []
+        thread = threading.Thread(target=lambda: other.append(connections.get()))
+        thread.start()
+        thread.join()
+        assert other[0] is not conn
+        conn.execute('INSERT INTO t VALUES (1)')
+        assert SQLiteConnections(connections.path).get().execute('SELECT x FROM t').fetchall() == [(1,)]
@@ -0,0 +1,135 @@
+# tests/test_python_parser.py
+
+import pytest
+from unittest.mock import patch
+from services.parsers import parse_python
+from services.documentation_generator import DocumentationGenerator
+
+SOURCE = '''import functools
+
+@functools.lru_cache(maxsize=None)
+def cached(value):
+    """Cached helper"""
+    if value and value > 1:
+        return [v for v in range(value) if v % 2]
+    return []
+
+class Service:
+    """A service"""
+
+    @property
+    def name(self):
+        return "service"
+
+    async def fetch(self, url):
+        def handle(response):
+            while response:
+                response = None
+        try:
+            return handle(url)
+        except ValueError:
+            return None
+'''
+
+def test_blocks_cover_decorators_and_end_lines():
+    parsed = parse_python(SOURCE)
+
+    assert [block.qualname for block in parsed.blocks] == ['cached', 'Service']
+    cached, service = parsed.blocks
+    assert (cached.line_number, cached.end_line) == (3, 8)
+    assert cached.decorators == ['functools.lru_cache(maxsize=None)']
+    assert (service.line_number, service.end_line) == (10, 24)
+
+def test_symbol_table_nesting():
+    symbols = parse_python(SOURCE).symbols
+
+    assert symbols['Service.name'].kind == 'method'
+    assert symbols['Service.name'].decorators == ['property']
+    assert symbols['Service.fetch'].is_async
+    assert symbols['Service.fetch.handle'].kind == 'function'
+    assert symbols['Service.fetch.handle'].parent == 'Service.fetch'
+    assert symbols['cached'].docstring == 'Cached helper'
+
+def test_per_function_complexity():
+    symbols = parse_python(SOURCE).symbols
+
+    # if + and + comprehension + comprehension filter
+    assert symbols['cached'].complexity == 5
+    assert symbols['Service.fetch.handle'].complexity == 2
+    # The closure's loop is not counted against fetch itself...
+    assert symbols['Service.fetch'].complexity == 2
+    # ...but is part of the enclosing block
+    assert symbols['Service'].total_complexity == 1 + 1 + 1
+
+def test_syntax_error_raises():
+    with pytest.raises(SyntaxError):
+        parse_python('def broken(:\n    pass')
+
+def test_generator_uses_single_parse():
+    generator = DocumentationGenerator(use_ai=False)
+    doc = generator.generate(SOURCE, 'python', use_ai=False)
+
+    assert [block.name for block in doc.code_blocks] == ['cached', 'Service']
+    assert doc.code_blocks[0].content.startswith('@functools.lru_cache')
+    assert doc.code_blocks[1].content.rstrip().endswith('return None')
+    assert generator._calculate_complexity(doc.code_blocks[0]) == 5
+
+    parsed = generator._parse_python_source(SOURCE)
+    # The outline hash, the metrics stage and this call all reuse the tree parsed for the blocks
+    assert generator.parse_cache.stats()['hits'] == 3
+    assert parsed.node_for('Service') is not None
+    if generator.RADON_AVAILABLE:
+        assert 'halstead_volume' in doc.code_blocks[1].metrics
+
+def test_generator_falls_back_on_invalid_source():
+    generator = DocumentationGenerator(use_ai=False)
+    with patch('services.documentation_generator.parse_python', side_effect=parse_python) as parse:
+        doc = generator.generate('def ok():\n    pass\ndef broken(:\n    pass', 'python', use_ai=False)
+    assert len(doc.code_blocks) == 2
+    # The failed parse is cached like a tree, not retried by every stage
+    assert parse.call_count == 1
+
+def test_generator_accepts_uniformly_indented_snippet():
+    generator = DocumentationGenerator(use_ai=False)
+    snippet = '    def a():\n        pass\n\n    def b():\n        pass\n'
+    doc = generator.generate(snippet, 'python', use_ai=False)
+    assert [block.name for block in doc.code_blocks] == ['a', 'b']
+    assert doc.code_blocks[0].content == '    def a():\n        pass'
+
+DUPLICATES = '''try:
+    def load():
+        return 1
+except ImportError:
+    def load():
+        if True:
+            return 2
+
+class C:
+    @property
+    def x(self):
+        return self._x
+
+    @x.setter
+    def x(self, value):
+        self._x = value
+'''
+
+def test_duplicate_names_are_numbered():
+    parsed = parse_python(DUPLICATES)
+
+    assert [block.qualname for block in parsed.blocks] == ['load', 'load#2', 'C']
+    assert parsed.symbols['load#2'].complexity == 2
+    assert parsed.symbols['C.x'].decorators == ['property']
+    assert parsed.symbols['C.x#2'].decorators == ['x.setter']
+    assert parsed.node_for('C.x#2').lineno == 15
+    assert parsed.node_for('load').body[0].value.value == 1
+
+def test_generator_keeps_duplicate_definitions_apart():
+    generator = DocumentationGenerator(use_ai=False)
+    doc = generator.generate(DUPLICATES, 'python', use_ai=False)
+
+    assert [block.name for block in doc.code_blocks] == ['load', 'load#2', 'C']
+    assert [generator._calculate_complexity(block) for block in doc.code_blocks[:2]] == [1, 2]
+    headers, _ = generator._outline(DUPLICATES, 'python', doc.code_blocks)
+    assert headers.count('def load():') == 2
+    assert '@x.setter def x(self, value):' in headers
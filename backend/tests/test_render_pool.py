@@ -0,0 +1,75 @@
+# tests/test_render_pool.py
+
+import threading
+import time
+import pytest
+from services.render_pool import RenderPool, RenderQueueFull, RenderTimeout
+from services.documentation_generator import DocumentationGenerator
+
+PAYLOAD = {'title': 'Doc', 'language': 'python', 'blocks': ['def run():\n    return 1']}
+
+def _slow_render(payload):
+    time.sleep(payload['seconds'])
+    return b'done'
+
+def test_pool_renders_pdf_and_docx_in_worker_processes():
+    pool = RenderPool(workers=1)
+    try:
+        assert pool.render('pdf', PAYLOAD).startswith(b'%PDF')
+        assert pool.render('docx', PAYLOAD).startswith(b'PK')
+        stats = pool.stats()
+        assert stats['rendered'] == 2
+        assert stats['queue_depth'] == 0
+        assert stats['avg_render_ms'] > 0
+    finally:
+        pool.shutdown()
+
+def test_full_queue_rejects_instead_of_waiting():
+    pool = RenderPool(workers=0, max_queue=1, renderers={'slow': _slow_render})
+    worker = threading.Thread(target=pool.render, args=('slow', {'seconds': 0.5}))
+    worker.start()
+    time.sleep(0.1)
+    try:
+        with pytest.raises(RenderQueueFull):
+            pool.render('slow', {'seconds': 0})
+        assert pool.stats()['queue_depth'] == 1
+    finally:
+        worker.join()
+    assert pool.stats() | {'avg_render_ms': None, 'max_render_ms': None} == {
+        'workers': 0, 'queue_depth': 0, 'max_queue': 1, 'rendered': 1, 'rejected': 1,
+        'timeouts': 0, 'failures': 0, 'avg_render_ms': None, 'max_render_ms': None, 'avg_wait_ms': 0.0
+    }
+
+def test_timeout_terminates_hung_worker_and_frees_its_slot():
+    pool = RenderPool(workers=1, max_queue=1, renderers={'slow': _slow_render})
+    try:
+        pool.render('slow', {'seconds': 0})  # start the worker process
+        hung = list(pool._executor._processes.values())
+        pool.timeout = 0.2
+        with pytest.raises(RenderTimeout):
+            pool.render('slow', {'seconds': 60})
+        assert pool.stats()['queue_depth'] == 0
+        for process in hung:
+            process.join(5)
+            assert not process.is_alive()
+
+        pool.timeout = 30
+        assert pool.render('slow', {'seconds': 0}) == b'done'
+        stats = pool.stats()
+        assert (stats['timeouts'], stats['failures'], stats['rendered']) == (1, 0, 2)
+    finally:
+        pool.shutdown()
+    assert pool.stats()['queue_depth'] == 0
+
+def test_unknown_format_is_rejected():
+    with pytest.raises(ValueError):
+        RenderPool(workers=0).render('odt', PAYLOAD)
+
+def test_generator_exports_binary_formats_through_pool():
+    generator = DocumentationGenerator(use_ai=False)
+    generator.export_cache = None
+    generator.render_pool = RenderPool(workers=0)
+    doc = generator.generate('def run():\n    return 1\n', 'python', use_ai=False)
+
+    assert generator.export_documentation(doc, 'pdf').startswith(b'%PDF')
+    assert generator.render_pool.stats()['rendered'] == 1
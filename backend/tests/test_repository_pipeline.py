@@ -0,0 +1,125 @@
+# tests/test_repository_pipeline.py
+
+import json
+import os
+import tempfile
+import pytest
+from unittest.mock import patch
+from services import repository_pipeline
+from services.repository_pipeline import RepositoryPipeline
+from utils.file_index import FileIndex
+
+FILES = {
+    'app.py': 'def handler(event):\n    if event:\n        return 1\n    return 0\n',
+    'src/util.ts': 'export function clamp(value: number) {\n    return value;\n}\n',
+    'src/Main.java': 'class Main {\n    int run() { return 0; }\n}\n',
+    'src/empty.py': '',
+    'README.md': '# not code\n'
+}
+
+def _walk(repo_path):
+    for root, _, files in os.walk(repo_path):
+        for name in files:
+            yield os.path.join(root, name)
+
+@pytest.fixture
+def repo():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for name, content in FILES.items():
+            path = os.path.join(temp_dir, 'repo', name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as handle:
+                handle.write(content)
+        yield os.path.join(temp_dir, 'repo'), os.path.join(temp_dir, 'docs')
+
+def test_documents_each_file_and_writes_index(repo):
+    repo_path, output_dir = repo
+    progress = []
+    result = RepositoryPipeline(_walk, workers=0, batch_size=2).run(
+        repo_path, output_dir, report=progress.append)
+
+    assert (result['total'], result['documented'], result['skipped'], result['failed']) == (4, 3, 1, 0)
+    assert [entry['path'] for entry in result['files']] == [
+        'app.py', os.path.join('src', 'Main.java'), os.path.join('src', 'empty.py'), os.path.join('src', 'util.ts')
+    ]
+    assert [update['done'] for update in progress] == [2, 4]
+
+    with open(os.path.join(output_dir, 'src', 'util.ts.md')) as handle:
+        assert 'export function clamp' in handle.read()
+    with open(os.path.join(output_dir, 'index.md')) as handle:
+        index = handle.read()
+    assert '[app.py](app.py.md)' in index
+    assert 'empty file' in index
+    with open(os.path.join(output_dir, 'index.json')) as handle:
+        assert json.load(handle)['documented'] == 3
+
+def test_worker_processes_give_the_same_result(repo):
+    repo_path, output_dir = repo
+    inline = RepositoryPipeline(_walk, workers=0, batch_size=1).run(repo_path, output_dir + '-inline')
+    parallel = RepositoryPipeline(_walk, workers=2, batch_size=1).run(repo_path, output_dir, format='json')
+
+    assert [entry['path'] for entry in parallel['files']] == [entry['path'] for entry in inline['files']]
+    assert parallel['documented'] == 3
+    assert os.path.exists(os.path.join(output_dir, 'app.py.json'))
+
+def test_oversized_files_are_skipped(repo):
+    repo_path, output_dir = repo
+    result = RepositoryPipeline(_walk, workers=0, max_file_bytes=10).run(repo_path, output_dir)
+
+    assert result['documented'] == 0
+    assert {entry['skipped'] for entry in result['files']} == {'file too large', 'empty file'}
+
+def test_invalid_arguments(repo):
+    repo_path, output_dir = repo
+    pipeline = RepositoryPipeline(_walk, workers=0)
+    with pytest.raises(ValueError):
+        pipeline.run(os.path.join(repo_path, 'missing'), output_dir)
+    with pytest.raises(ValueError):
+        pipeline.run(repo_path, output_dir, format='odt')
+
+def test_rescan_only_redocuments_changed_files(repo):
+    repo_path, output_dir = repo
+    index = FileIndex(os.path.join(output_dir + '-index', 'files.sqlite3'))
+    pipeline = RepositoryPipeline(_walk, workers=0, index=index)
+    first = pipeline.run(repo_path, output_dir)
+    assert first['reused'] == 0
+
+    # Nothing changed: no file is even read
+    with patch.object(repository_pipeline, '_document_batch') as batch:
+        second = pipeline.run(repo_path, output_dir)
+    batch.assert_not_called()
+    assert second['reused'] == 4 and second['documented'] == 3
+    assert [entry['path'] for entry in second['files']] == [entry['path'] for entry in first['files']]
+
+    app = os.path.join(repo_path, 'app.py')
+    util = os.path.join(repo_path, 'src', 'util.ts')
+    os.utime(util, (0, 0))  # touched, same content
+    with open(app, 'a') as handle:
+        handle.write('\ndef extra():\n    return 2\n')
+    with patch.object(repository_pipeline, '_document_file', wraps=repository_pipeline._document_file) as document:
+        third = pipeline.run(repo_path, output_dir)
+
+    assert sorted(call.args[1].rel_path for call in document.call_args_list) == ['app.py', os.path.join('src', 'util.ts')]
+    assert third['reused'] == 3
+    assert next(entry for entry in third['files'] if entry['path'] == 'app.py')['blocks'] == 2
+    assert [block['name'] for block in index.code_blocks(os.path.abspath(repo_path), 'app.py')] == ['handler', 'extra']
+
+    # The touched file's new mtime was recorded, so the next pass is metadata only again
+    with patch.object(repository_pipeline, '_document_batch') as batch:
+        assert pipeline.run(repo_path, output_dir)['reused'] == 4
+    batch.assert_not_called()
+
+def test_index_is_bypassed_when_options_change_or_files_go(repo):
+    repo_path, output_dir = repo
+    index = FileIndex(os.path.join(output_dir + '-index', 'files.sqlite3'))
+    pipeline = RepositoryPipeline(_walk, workers=0, index=index)
+    pipeline.run(repo_path, output_dir)
+
+    assert pipeline.run(repo_path, output_dir, format='json')['reused'] == 0
+    assert pipeline.run(repo_path, output_dir, format='json', force=True)['reused'] == 0
+
+    os.remove(os.path.join(repo_path, 'app.py'))
+    os.remove(os.path.join(output_dir, 'src', 'util.ts.json'))
+    result = pipeline.run(repo_path, output_dir, format='json')
+    assert (result['total'], result['reused']) == (3, 2)
+    assert 'app.py' not in index.load(os.path.abspath(repo_path))
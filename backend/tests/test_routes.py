@@ -1,6 +1,9 @@
 import json
 import os
 import tempfile
+from unittest.mock import patch
+from config import Config
+from utils.deadline import Deadline
 from backend.server import create_app
 
 def setup_test_app():
@@ -51,4 +54,94 @@ def test_export_markdown_route():
             })
             assert response.status_code == 200
             data = response.get_json()
-            assert data['status'] == 'success'
\ No newline at end of file
+            assert data['status'] == 'success'
+
+def test_export_markdown_route_streams_without_output_path():
+    app = setup_test_app()
+    with app.test_client() as client:
+        response = client.post('/api/export/markdown', json={
+            'code': 'def hello():\n    return 1\n',
+            'language': 'python'
+        })
+        assert response.status_code == 200
+        assert response.mimetype == 'text/markdown'
+        assert response.is_streamed
+        assert '```python\ndef hello():' in response.get_data(as_text=True)
+
+def test_documentation_job_route():
+    app = setup_test_app()
+    with app.test_client() as client:
+        response = client.post('/api/jobs', json={
+            'type': 'documentation',
+            'params': {'code': 'def hello():\n    return 1\n', 'language': 'python'}
+        })
+        assert response.status_code == 202
+        job = response.get_json()['job']
+        assert response.headers['Location'].endswith(f"/api/jobs/{job['id']}")
+
+        response = client.get(f"/api/jobs/{job['id']}?wait=10")
+        assert response.status_code == 200
+        finished = response.get_json()['job']
+        assert finished['status'] == 'succeeded'
+        assert 'def hello' in finished['result']['documentation']
+
+        assert client.post('/api/jobs', json={'type': 'documentation', 'params': {}}).status_code == 400
+        assert client.get('/api/jobs/missing').status_code == 404
+
+def test_document_repository_route():
+    app = setup_test_app()
+    with app.test_client() as client:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            repo_path = os.path.join(temp_dir, 'repos', 'repo')
+            os.makedirs(repo_path)
+            with open(os.path.join(repo_path, 'app.py'), 'w') as handle:
+                handle.write('def hello():\n    return 1\n')
+            output_root = os.path.join(temp_dir, 'docs')
+
+            with patch.object(Config, 'PIPELINE_REPOSITORY_ROOT', os.path.join(temp_dir, 'repos')), \
+                    patch.object(Config, 'PIPELINE_OUTPUT_DIR', output_root):
+                response = client.post('/api/scan/document', json={'repo_path': repo_path, 'output_dir': 'repo-docs'})
+                assert response.status_code == 202
+                job = response.get_json()['job']
+                finished = client.get(f"/api/jobs/{job['id']}?wait=10").get_json()['job']
+
+                assert finished['status'] == 'succeeded'
+                assert finished['progress']['done'] == 1
+                assert finished['result']['documented'] == 1
+                assert os.path.exists(os.path.join(output_root, 'repo-docs', 'app.py.md'))
+                assert os.path.exists(os.path.join(output_root, 'repo-docs', 'index.md'))
+
+                missing = client.post('/api/scan/document', json={'repo_path': 'nope'})
+                assert missing.status_code == 400
+
+def test_document_repository_route_stays_inside_configured_roots():
+    app = setup_test_app()
+    with app.test_client() as client:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            root = os.path.join(temp_dir, 'repos')
+            os.makedirs(os.path.join(root, 'repo'))
+            os.symlink(temp_dir, os.path.join(root, 'escape'))
+
+            with patch.object(Config, 'PIPELINE_REPOSITORY_ROOT', root), \
+                    patch.object(Config, 'PIPELINE_OUTPUT_DIR', os.path.join(temp_dir, 'docs')):
+                for params in ({'repo_path': temp_dir}, {'repo_path': os.path.join(root, '..')},
+                               {'repo_path': os.path.join(root, 'escape')},
+                               {'repo_path': 'repo', 'output_dir': '../../elsewhere'},
+                               {'repo_path': 'repo', 'output_dir': temp_dir}):
+                    response = client.post('/api/scan/document', json=params)
+                    assert response.status_code == 400, params
+                    assert 'inside the configured directory' in response.get_json()['error']
+
+def test_github_batch_job_runs_within_a_deadline():
+    app = setup_test_app()
+    with app.test_client() as client, \
+            patch('routes.api.github.batch_process_repositories',
+                  return_value={'results': {'a/b': {}}, 'errors': []}) as batch:
+        response = client.post('/api/jobs', headers={'Authorization': 'Bearer test_token'},
+                               json={'type': 'github_batch', 'params': {'repositories': [{'owner': 'a', 'name': 'b'}]}})
+        assert response.status_code == 202
+        job = client.get(f"/api/jobs/{response.get_json()['job']['id']}?wait=10").get_json()['job']
+
+    assert job['status'] == 'succeeded'
+    assert job['result']['partial'] is False
+    assert isinstance(batch.call_args.args[1], Deadline)
@@ -0,0 +1,82 @@
+# tests/test_source_metrics.py
+
+from unittest.mock import patch
+from services.parsers import pygments_lexer, scan_source
+from services.documentation_generator import DocumentationGenerator
+
+PYTHON_SOURCE = '''import os
+
+# Helpers
+def first(values):
+    """Return the first value"""
+    if values and len(values) > 0:
+        return values[0]  # head
+    return None
+
+class Box:
+    def get(self):
+        return os.getcwd()
+'''
+
+def test_scan_source_spans():
+    stats = scan_source(PYTHON_SOURCE, 'python')
+    first = stats.span(4, 8)
+
+    assert (first.loc, first.sloc, first.comment_lines) == (5, 5, 1)
+    assert stats.total().comment_lines == 2
+    assert stats.total().sloc == 9
+
+def test_comments_and_strings_span_lines():
+    stats = scan_source('/* a {\n   b */\nconst s = `x\ny`;\n', 'javascript')
+    totals = stats.total()
+
+    assert totals.comment_lines == 2
+    assert totals.sloc == 2
+    assert totals.token_count == 6
+
+def test_generate_reports_real_metrics():
+    generator = DocumentationGenerator(use_ai=False)
+    doc = generator.generate(PYTHON_SOURCE, 'python', use_ai=False)
+
+    assert doc.metrics['total_blocks'] == 2
+    assert doc.metrics['max_complexity'] == 3
+    assert doc.metrics['average_complexity'] == 2.0
+    assert doc.metrics['comment_lines'] == 2
+    assert doc.code_blocks[0].metrics['loc'] == 5
+    if generator.RADON_AVAILABLE:
+        assert 'maintainability_index' in doc.metrics
+        assert 'halstead_volume' in doc.code_blocks[0].metrics
+
+def test_block_metrics_memoized_by_hash():
+    generator = DocumentationGenerator(use_ai=False)
+    code = 'int add(int a, int b) {\n    return a + b;\n}\n'
+    generator.generate(code, 'cpp', use_ai=False)
+    generator.generate('// header\n' + code, 'cpp', use_ai=False)
+
+    stats = generator.metrics_cache.stats()
+    assert stats['hits'] == 1
+
+def test_memoized_block_metrics_are_not_shared():
+    generator = DocumentationGenerator(use_ai=False)
+    code = 'int add(int a, int b) {\n    return a + b;\n}\n'
+    first = generator.generate(code, 'cpp', use_ai=False).code_blocks[0]
+    first.metrics['loc'] = -1
+    second = generator.generate('// header\n' + code, 'cpp', use_ai=False).code_blocks[0]
+
+    assert second.metrics['loc'] == 3
+    assert second.metrics is not first.metrics
+
+def test_html_export_after_an_edit_lexes_only_the_changed_block():
+    generator = DocumentationGenerator(use_ai=False)
+    generator.export_cache = None
+    source = PYTHON_SOURCE + '\n# lexed per block\n'
+    generator.export_documentation(generator.generate(source, 'python', use_ai=False), format='html')
+
+    doc = generator.generate(source.replace('class Box', 'class Crate'), 'python', use_ai=False)
+    lexer = pygments_lexer('python')
+    with patch.object(type(lexer), 'get_tokens_unprocessed',
+                      autospec=True, side_effect=type(lexer).get_tokens_unprocessed) as lex:
+        html = generator.export_documentation(doc, format='html')
+    changed = next(block for block in doc.code_blocks if 'Crate' in block.content)
+    assert [call.args[1] for call in lex.call_args_list] == [changed.content]
+    assert len(doc.code_blocks) > 1 and 'Crate' in html
@@ -0,0 +1,104 @@
+# tests/test_templates.py
+
+import json
+import os
+import tempfile
+from unittest.mock import patch
+
+import pytest
+from services.documentation_generator import CodeBlock, Documentation, DocumentationGenerator
+from services.templates import CompiledTemplate, TemplateRegistry
+
+def _doc():
+    blocks = [
+        CodeBlock(content='def a():\n    return 1', language='python', line_number=1, name='a',
+                  complexity=1, metrics={'loc': 2}),
+        CodeBlock(content='def b(x):\n    if x:\n        return 2', language='python', line_number=4, name='b')
+    ]
+    return Documentation('Sample', 'Two functions.', 'python', blocks, {'total_blocks': 2, 'average_complexity': 1.5})
+
+def test_default_template_output():
+    output = ''.join(TemplateRegistry().get('default').render(_doc()))
+
+    assert output == (
+        '# Sample\n\nTwo functions.\n\n## Code\n\n'
+        '```python\ndef a():\n    return 1\n```\n\n'
+        '```python\ndef b(x):\n    if x:\n        return 2\n```\n\n'
+    )
+
+def test_detailed_template_sections():
+    doc = _doc()
+    chunks = list(TemplateRegistry().get('detailed').render(doc))
+    output = ''.join(chunks)
+
+    assert f'_Generated at: {doc.generated_at}_' in output
+    assert '## Overview\n\nTwo functions.' in output
+    assert '## Table of Contents\n\n1. [Block at line 1](#block-at-line-1)\n2. [Block at line 4]' in output
+    assert '- **Average Complexity**: 1.5' in output
+    assert output.index('## Project Metrics') < output.index('## Code Blocks')
+    # Stored loc/complexity are used; missing ones are computed
+    assert '- Lines of code: 2\n- Complexity: 1\n' in output
+    assert '- Lines of code: 3\n- Complexity: 2\n' in output
+    assert len(chunks) > len(doc.code_blocks)
+
+def test_empty_sections_are_left_out():
+    doc = Documentation('Empty', '', 'python', [], {})
+    output = ''.join(TemplateRegistry().get('detailed').render(doc))
+
+    assert output == f'# Empty\n\n_Generated at: {doc.generated_at}_\n\n'
+
+def test_rendering_does_not_parse_templates():
+    template = CompiledTemplate('custom', {'code_block': '{index:>3}: {name!r} {content}\n'})
+    with patch('string.Formatter.parse', side_effect=AssertionError('parsed at render time')):
+        output = ''.join(template.render(_doc()))
+
+    assert output.startswith("  1: 'a' def a()")
+    assert template.fields == {'index', 'name', 'content'}
+
+@pytest.mark.parametrize('sections, message', [
+    ({'title': '# {title.__class__}'}, 'unknown placeholder'),
+    ({'title': '# {title[0]}'}, 'unknown placeholder'),
+    ({'title': '# {0}'}, 'unknown placeholder'),
+    ({'title': '# {content}'}, 'unknown placeholder'),
+    ({'code_block': '{content:{index}}'}, 'nested fields'),
+    ({'title': '# {title'}, "expected '}'"),
+    ({'header': '# {title}'}, 'unknown sections'),
+    ({'title': '# {title!x}'}, 'unknown conversion'),
+    ({'title': '# {title:d}'}, 'bad format spec'),
+    ({'toc_item': '{line_number:q}'}, 'bad format spec'),
+    ({'metric_item': '{value:d}'}, 'bad format spec'),
+    ({'title': 3}, 'must be a string'),
+    ({}, 'non-empty')
+])
+def test_invalid_templates_are_rejected(sections, message):
+    with pytest.raises(ValueError, match=message):
+        CompiledTemplate('custom', sections)
+
+def test_user_templates_from_directory():
+    with tempfile.TemporaryDirectory() as directory:
+        with open(os.path.join(directory, 'brief.json'), 'w') as handle:
+            json.dump({'title': '{title} ({block_count} blocks)\n', 'code_block': '- {name}\n'}, handle)
+        with open(os.path.join(directory, 'broken.json'), 'w') as handle:
+            handle.write('{"title": "{nope}"}')
+        with open(os.path.join(directory, 'conversion.json'), 'w') as handle:
+            handle.write('{"title": "{title!x}"}')
+        with open(os.path.join(directory, 'default.json'), 'w') as handle:
+            json.dump({'title': '{title}'}, handle)
+
+        registry = TemplateRegistry()
+        assert registry.load_directory(directory) == ['brief']
+
+    assert list(registry) == ['default', 'detailed', 'brief']
+    assert ''.join(registry.get('brief').render(_doc())) == 'Sample (2 blocks)\n- a\n- b\n'
+    with pytest.raises(ValueError, match='Invalid template'):
+        registry.get('broken')
+
+def test_export_cache_key_follows_template_source():
+    generator = DocumentationGenerator(use_ai=False)
+    doc = _doc()
+    generator.templates.register('brief', {'title': '{title}\n'})
+    key = generator._export_cache_key(doc, 'markdown', 'brief')
+    generator.templates.register('brief', {'title': '# {title}\n'})
+
+    assert generator._export_cache_key(doc, 'markdown', 'brief') != key
+    assert generator.export_documentation(doc, 'markdown', 'brief') == '# Sample\n'
@@ -0,0 +1,240 @@
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, BinaryIO, Dict, Iterator, Optional
+
+
+class ArtifactCache:
+    """
+    Rendered exports stored as files under ``directory``, with an in-memory LRU index.
+
+    Each artifact is one file named by its key, written atomically (temp file +
+    ``os.replace``), so concurrent workers never read a half-written export.
+    The index is rebuilt from the directory on startup, oldest files first, and
+    keeps the total under ``max_bytes`` / ``max_entries`` by deleting the least
+    recently used files. Another worker may evict a file this index still
+    lists; that is treated as a miss. Filesystem errors are logged and treated
+    as misses so the cache can never take an export down with it.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024, max_entries: int = 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.errors = 0
+        # key -> size in bytes, least recently used first
+        self._index: 'OrderedDict[str, int]' = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._logger = logging.getLogger(__name__)
+        self._load_index()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def _load_index(self) -> None:
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            entries = []
+            with os.scandir(self.directory) as listing:
+                for entry in listing:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    if entry.name.startswith('.tmp-'):
+                        # Left behind by a worker that died mid-write
+                        if time.time() - stat.st_mtime > 3600:
+                            self._discard(entry.path)
+                        continue
+                    entries.append((stat.st_mtime, entry.name, stat.st_size))
+        except OSError as e:
+            self._error('index', e)
+            return
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._bytes += size
+        self._evict()
+
+    def open(self, key: str) -> Optional[BinaryIO]:
+        """Open a cached artifact for reading, or None on a miss."""
+        try:
+            handle = open(self._path(key), 'rb')
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+                self._forget(key)
+            return None
+        except OSError as e:
+            self._error('open', e)
+            return None
+        with self._lock:
+            self.hits += 1
+            if key in self._index:
+                self._index.move_to_end(key)
+            else:
+                # Written by another worker since this index was built
+                size = os.fstat(handle.fileno()).st_size
+                self._index[key] = size
+                self._bytes += size
+        return handle
+
+    def get(self, key: str) -> Optional[bytes]:
+        handle = self.open(key)
+        if handle is None:
+            return None
+        with handle:
+            return handle.read()
+
+    def iter_chunks(self, key: str, chunk_size: int = 64 * 1024) -> Optional[Iterator[bytes]]:
+        """Cached artifact as an iterator of chunks (None on a miss), for streamed responses."""
+        handle = self.open(key)
+        if handle is None:
+            return None
+
+        def chunks():
+            with handle:
+                while True:
+                    chunk = handle.read(chunk_size)
+                    if not chunk:
+                        return
+                    yield chunk
+        return chunks()
+
+    def set(self, key: str, data: bytes) -> bool:
+        """Store an artifact; returns False if it is larger than the whole budget or the write failed."""
+        writer = self.writer(key)
+        writer.write(data)
+        return writer.commit()
+
+    def writer(self, key: str) -> '_ArtifactWriter':
+        """Incremental writer: ``write`` chunks, then ``commit`` (or ``discard``)."""
+        return _ArtifactWriter(self, key)
+
+    def _store(self, key: str, temp_path: str, size: int) -> bool:
+        if size > self.max_bytes:
+            self._discard(temp_path)
+            return False
+        try:
+            os.replace(temp_path, self._path(key))
+        except OSError as e:
+            self._error('store', e)
+            self._discard(temp_path)
+            return False
+        with self._lock:
+            self._forget(key)
+            self._index[key] = size
+            self._bytes += size
+            self._evict()
+        return True
+
+    def _evict(self) -> None:
+        # Caller holds the lock (or is __init__)
+        while self._index and (len(self._index) > self.max_entries or self._bytes > self.max_bytes):
+            key, size = self._index.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self._error('evict', e)
+
+    def _forget(self, key: str) -> None:
+        size = self._index.pop(key, None)
+        if size is not None:
+            self._bytes -= size
+
+    def _discard(self, temp_path: str) -> None:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+    def _error(self, operation: str, error: Exception) -> None:
+        self.errors += 1
+        self._logger.warning(f"Artifact cache {operation} failed: {error}")
+
+    def clear(self) -> None:
+        with self._lock:
+            keys = list(self._index)
+            self._index.clear()
+            self._bytes = 0
+        for key in keys:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._index),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'errors': self.errors,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
+
+
+class _ArtifactWriter:
+    """Streams an artifact into a temp file next to its final path; ``commit`` publishes it."""
+
+    def __init__(self, cache: ArtifactCache, key: str):
+        self._cache = cache
+        self._key = key
+        self._size = 0
+        self._file = None
+        try:
+            fd, self._temp_path = tempfile.mkstemp(dir=cache.directory, prefix='.tmp-')
+            self._file = os.fdopen(fd, 'wb')
+        except OSError as e:
+            cache._error('write', e)
+
+    def write(self, data: bytes) -> None:
+        if self._file is None:
+            return
+        self._size += len(data)
+        if self._size > self._cache.max_bytes:
+            # Too big to ever be cached; stop buffering it on disk
+            self.discard()
+            return
+        try:
+            self._file.write(data)
+        except OSError as e:
+            self._cache._error('write', e)
+            self.discard()
+
+    def commit(self) -> bool:
+        if self._file is None:
+            return False
+        try:
+            self._file.close()
+        except OSError as e:
+            self._cache._error('write', e)
+            self.discard()
+            return False
+        self._file = None
+        return self._cache._store(self._key, self._temp_path, self._size)
+
+    def discard(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                pass
+            self._file = None
+            self._cache._discard(self._temp_path)
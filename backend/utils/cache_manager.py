@@ -1,6 +1,8 @@
-
 from functools import wraps
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, Hashable
+from collections import OrderedDict
+from threading import Lock
+import sys
 import time
 import hashlib
 import json
@@ -39,4 +41,112 @@ class CacheManager:
         else:
             self._cache.clear()
 
-cache = CacheManager()
\ No newline at end of file
+cache = CacheManager()
+
+
+def content_hash(*parts: Any) -> str:
+    """Stable sha256 hex digest over the given parts (None and non-str values included)."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, bytes):
+            data = part
+        elif isinstance(part, str):
+            data = part.encode('utf-8', 'surrogatepass')
+        else:
+            data = json.dumps(part, sort_keys=True, default=str).encode('utf-8')
+        # Length-prefix every part so ('ab', 'c') and ('a', 'bc') differ
+        digest.update(len(data).to_bytes(8, 'big'))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class LRUCache:
+    """
+    Thread-safe in-memory cache with LRU + TTL eviction and a byte budget.
+
+    Entry sizes come from ``sizeof`` (defaults to ``sys.getsizeof``) and are only
+    an estimate; the cap keeps the cache bounded, it is not an exact accounting.
+    """
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024,
+                 ttl: Optional[float] = 3600, sizeof: Optional[Callable[[Any], int]] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._sizeof = sizeof or sys.getsizeof
+        # key -> (value, size, expires_at)
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, size, expires_at = entry
+            if expires_at is not None and time.monotonic() >= expires_at:
+                self._remove(key)
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> bool:
+        """Store a value; returns False if it is larger than the whole byte budget."""
+        size = self._sizeof(value)
+        if size > self.max_bytes:
+            return False
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+            while self._entries and (len(self._entries) > self.max_entries or self._bytes > self.max_bytes):
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+        return True
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key: Hashable) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (entry[2] is None or time.monotonic() < entry[2])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_entries': self.max_entries,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -0,0 +1,54 @@
+import math
+import time
+from typing import Optional
+
+
+class Deadline:
+    """
+    Time budget of one request, passed from the route down to every outbound call.
+
+    Calls take ``timeout()`` as their network timeout, and retries go through
+    ``sleep()``, which refuses to back off when the remaining budget could not
+    also cover the retried call. Anything skipped for lack of time sets
+    ``cut_short``, so the route can return what it has, flagged as partial,
+    instead of holding a worker until gunicorn kills it. ``Deadline(None)`` is
+    unbounded and behaves like no deadline at all.
+    """
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.expires_at = None if seconds is None else time.monotonic() + seconds
+        self.cut_short = False
+
+    def remaining(self) -> float:
+        if self.expires_at is None:
+            return math.inf
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def check(self) -> bool:
+        """False (and ``cut_short`` set) once the budget is spent; call before starting work."""
+        if self.expired:
+            self.cut_short = True
+            return False
+        return True
+
+    def timeout(self, default: float) -> float:
+        """``default`` capped to the remaining budget, for a network call's timeout."""
+        return max(0.001, min(default, self.remaining()))
+
+    def sleep(self, seconds: float, reserve: float = 0.0) -> bool:
+        """
+        Back off ``seconds`` before a retry, if ``seconds + reserve`` still fits the budget.
+
+        ``reserve`` is the least time the retried call needs to be worth making.
+        Returns False without sleeping, and sets ``cut_short``, when it does not fit.
+        """
+        if self.remaining() <= seconds + reserve:
+            self.cut_short = True
+            return False
+        if seconds > 0:
+            time.sleep(seconds)
+        return True
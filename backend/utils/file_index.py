@@ -0,0 +1,134 @@
+import json
+import logging
+import sqlite3
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.sqlite_connections import SQLiteConnections
+
+
+class FileIndex:
+    """
+    SQLite record of each repository file as of its last documentation run.
+
+    Rows are keyed by ``(repo, path)`` and hold the file's size, mtime and
+    content hash, the options it was documented with, the pipeline entry, and
+    its code blocks and metrics. A rescan compares stat data against the index
+    and only reads (and rehashes) files whose size or mtime moved. Connections
+    come from ``SQLiteConnections``, like ``PersistentCache``'s. SQLite
+    failures are logged and behave like an empty index, so a broken index
+    only costs a full run.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.errors = 0
+        self._connections = SQLiteConnections(path, (
+            'CREATE TABLE IF NOT EXISTS files ('
+            ' repo TEXT NOT NULL,'
+            ' path TEXT NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' mtime REAL NOT NULL,'
+            ' hash TEXT NOT NULL,'
+            ' options TEXT NOT NULL,'
+            ' entry TEXT NOT NULL,'
+            ' code_blocks TEXT NOT NULL,'
+            ' metrics TEXT NOT NULL,'
+            ' PRIMARY KEY (repo, path))',
+        ))
+        self._logger = logging.getLogger(__name__)
+
+    def load(self, repo: str) -> Dict[str, Dict[str, Any]]:
+        """Rows of one repository by relative path, without code blocks (see ``code_blocks``)."""
+        try:
+            rows = self._connections.get().execute(
+                'SELECT path, size, mtime, hash, options, entry, metrics FROM files WHERE repo = ?', (repo,)
+            ).fetchall()
+        except sqlite3.Error as e:
+            self._error('read', e)
+            return {}
+        return {
+            path: {
+                'size': size,
+                'mtime': mtime,
+                'hash': content_hash,
+                'options': options,
+                'entry': json.loads(entry),
+                'metrics': json.loads(metrics)
+            }
+            for path, size, mtime, content_hash, options, entry, metrics in rows
+        }
+
+    def code_blocks(self, repo: str, path: str) -> Optional[List[Dict[str, Any]]]:
+        try:
+            row = self._connections.get().execute(
+                'SELECT code_blocks FROM files WHERE repo = ? AND path = ?', (repo, path)
+            ).fetchone()
+        except sqlite3.Error as e:
+            self._error('read', e)
+            return None
+        return json.loads(row[0]) if row else None
+
+    def update(self, repo: str, rows: Iterable[Dict[str, Any]]) -> None:
+        """Insert or replace rows (``path``, ``size``, ``mtime``, ``hash``, ``options``, ``entry``, ...)."""
+        values = [
+            (repo, row['path'], row['size'], row['mtime'], row['hash'], row['options'],
+             json.dumps(row['entry']), json.dumps(row.get('code_blocks', [])), json.dumps(row.get('metrics', {})))
+            for row in rows
+        ]
+        if not values:
+            return
+        self._write(
+            'INSERT OR REPLACE INTO files'
+            ' (repo, path, size, mtime, hash, options, entry, code_blocks, metrics)'
+            ' VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            values
+        )
+
+    def touch(self, repo: str, stats: Iterable[Dict[str, Any]]) -> None:
+        """Record new size/mtime for files whose content turned out unchanged."""
+        self._write(
+            'UPDATE files SET size = ?, mtime = ? WHERE repo = ? AND path = ?',
+            [(row['size'], row['mtime'], repo, row['path']) for row in stats]
+        )
+
+    def remove(self, repo: str, paths: Iterable[str]) -> None:
+        self._write('DELETE FROM files WHERE repo = ? AND path = ?', [(repo, path) for path in paths])
+
+    def _write(self, sql: str, values: List[tuple]) -> None:
+        if not values:
+            return
+        try:
+            conn = self._connections.get()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.executemany(sql, values)
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+        except sqlite3.Error as e:
+            self._error('write', e)
+
+    def clear(self, repo: Optional[str] = None) -> None:
+        try:
+            if repo is None:
+                self._connections.get().execute('DELETE FROM files')
+            else:
+                self._connections.get().execute('DELETE FROM files WHERE repo = ?', (repo,))
+        except sqlite3.Error as e:
+            self._error('clear', e)
+
+    def _error(self, operation: str, error: Exception) -> None:
+        self.errors += 1
+        self._logger.warning(f"File index {operation} failed: {error}")
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {'path': self.path, 'errors': self.errors}
+        try:
+            repos, files = self._connections.get().execute(
+                'SELECT COUNT(DISTINCT repo), COUNT(*) FROM files'
+            ).fetchone()
+            stats.update({'repositories': repos, 'files': files})
+        except sqlite3.Error:
+            pass
+        return stats
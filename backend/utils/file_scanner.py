@@ -0,0 +1,198 @@
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterable, List, Optional, Pattern, Tuple
+
+# Never documentation sources: VCS metadata, tool caches and installed packages. Build output
+# (build/, dist/, target/, ...) is left to .gitignore, since repositories do track source there.
+DEFAULT_SKIP_DIRS = frozenset({
+    '.git', '.hg', '.svn', '__pycache__', '.tox', '.nox', '.mypy_cache', '.pytest_cache',
+    '.ruff_cache', '.eggs', 'venv', '.venv', 'site-packages', 'node_modules'
+})
+
+DEFAULT_IGNORE_FILES = ('.gitignore', '.ignore')
+
+# (directory the rule was read from, relative to the scan root; compiled pattern; negated; directories only)
+IgnoreRule = Tuple[str, Pattern, bool, bool]
+
+
+@dataclass
+class ScannedFile:
+    path: str
+    size: int
+    mtime: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _translate(pattern: str) -> str:
+    """gitignore glob → regex; ``*``/``?``/``[...]`` stay within one path segment, ``**`` crosses them."""
+    regex = []
+    i, n = 0, len(pattern)
+    while i < n:
+        char = pattern[i]
+        if char == '*':
+            if pattern.startswith('**', i):
+                if pattern.startswith('**/', i):
+                    regex.append('(?:.*/)?')
+                    i += 3
+                    continue
+                if i + 2 == n:
+                    regex.append('.*')
+                    i += 2
+                    continue
+            regex.append('[^/]*')
+        elif char == '?':
+            regex.append('[^/]')
+        elif char == '[':
+            end = pattern.find(']', i + 2)
+            if end == -1:
+                regex.append(re.escape(char))
+            else:
+                body = pattern[i + 1:end]
+                if body[0] in '!^':
+                    body = '^' + body[1:]
+                regex.append(f"[{body.replace(chr(92), chr(92) * 2)}]")
+                i = end
+        elif char == '\\' and i + 1 < n:
+            i += 1
+            regex.append(re.escape(pattern[i]))
+        else:
+            regex.append(re.escape(char))
+        i += 1
+    return ''.join(regex)
+
+
+def parse_ignore_lines(lines: Iterable[str], base: str = '') -> List[IgnoreRule]:
+    """Rules of one ignore file; ``base`` is its directory relative to the scan root ('' for the root)."""
+    rules = []
+    for line in lines:
+        line = line.rstrip('\n')
+        if not line.endswith('\\ '):
+            line = line.rstrip()
+        if not line or line.startswith('#'):
+            continue
+        negate = line.startswith('!')
+        if negate:
+            line = line[1:]
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            continue
+        # A slash anywhere but the end anchors the pattern to the ignore file's directory
+        anchored = '/' in line
+        regex = _translate(line.lstrip('/'))
+        if not anchored:
+            regex = '(?:.*/)?' + regex
+        rules.append((base, re.compile(regex + r'\Z', re.DOTALL), negate, dir_only))
+    return rules
+
+
+def is_ignored(rules: List[IgnoreRule], rel_path: str, is_dir: bool) -> bool:
+    """Last matching rule wins, as in git; rules from deeper ignore files come later."""
+    ignored = False
+    for base, pattern, negate, dir_only in rules:
+        if dir_only and not is_dir:
+            continue
+        if base:
+            if not rel_path.startswith(base + '/'):
+                continue
+            candidate = rel_path[len(base) + 1:]
+        else:
+            candidate = rel_path
+        if pattern.match(candidate):
+            ignored = not negate
+    return ignored
+
+
+class FileScanner:
+    """
+    ``os.scandir`` walk that returns source files with their size and mtime.
+
+    Directories are pruned before they are entered: anything in ``skip_dirs``,
+    virtualenvs (a ``pyvenv.cfg`` inside), and whatever ``.gitignore``/``.ignore``
+    files (plus ``.git/info/exclude``) exclude, with nested ignore files applying
+    to their own subtree. Only files whose extension is in ``extensions`` are
+    stat-ed, and files over ``max_file_bytes`` are left out. Symlinks are not
+    followed. With ``workers > 1`` the top-level subtrees are walked on a thread
+    pool; ``scandir``/``stat`` release the GIL, so this helps on slow or network
+    filesystems. Results are sorted by path.
+    """
+
+    def __init__(self, extensions: Optional[Iterable[str]] = None, skip_dirs: Iterable[str] = DEFAULT_SKIP_DIRS,
+                 ignore_files: Iterable[str] = DEFAULT_IGNORE_FILES, max_file_bytes: Optional[int] = None,
+                 workers: int = 1):
+        self.extensions = frozenset(ext.lower() for ext in extensions) if extensions is not None else None
+        self.skip_dirs = frozenset(skip_dirs)
+        self.ignore_files = tuple(ignore_files)
+        self.max_file_bytes = max_file_bytes
+        self.workers = workers
+
+    def scan(self, root: str) -> List[ScannedFile]:
+        rules = self._read_rules(os.path.join(root, '.git', 'info', 'exclude'), '')
+        files, top_dirs, rules = self._scan_dir(root, '', rules)
+        if self.workers > 1 and len(top_dirs) > 1:
+            with ThreadPoolExecutor(max_workers=min(self.workers, len(top_dirs))) as executor:
+                for subtree in executor.map(lambda top: self._walk(top[0], top[1], rules), top_dirs):
+                    files.extend(subtree)
+        else:
+            for path, rel in top_dirs:
+                files.extend(self._walk(path, rel, rules))
+        files.sort(key=lambda scanned: scanned.path)
+        return files
+
+    def _walk(self, path: str, rel: str, rules: List[IgnoreRule]) -> List[ScannedFile]:
+        files: List[ScannedFile] = []
+        stack = [(path, rel, rules)]
+        while stack:
+            path, rel, rules = stack.pop()
+            dir_files, subdirs, rules = self._scan_dir(path, rel, rules)
+            files.extend(dir_files)
+            stack.extend((sub_path, sub_rel, rules) for sub_path, sub_rel in subdirs)
+        return files
+
+    def _scan_dir(self, path: str, rel: str, rules: List[IgnoreRule]
+                  ) -> Tuple[List[ScannedFile], List[Tuple[str, str]], List[IgnoreRule]]:
+        """Files of one directory, the subdirectories left to walk, and the rules that apply below it."""
+        try:
+            with os.scandir(path) as listing:
+                entries = list(listing)
+        except OSError:
+            return [], [], rules
+        names = {entry.name for entry in entries}
+        if rel and 'pyvenv.cfg' in names:
+            return [], [], rules
+        for name in self.ignore_files:
+            if name in names:
+                rules = rules + self._read_rules(os.path.join(path, name), rel)
+
+        files, subdirs = [], []
+        for entry in entries:
+            name = entry.name
+            child_rel = f"{rel}/{name}" if rel else name
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    if name not in self.skip_dirs and not is_ignored(rules, child_rel, True):
+                        subdirs.append((entry.path, child_rel))
+                elif entry.is_file(follow_symlinks=False):
+                    if self.extensions is not None and os.path.splitext(name)[1].lower() not in self.extensions:
+                        continue
+                    if is_ignored(rules, child_rel, False):
+                        continue
+                    stat = entry.stat(follow_symlinks=False)
+                    if self.max_file_bytes is not None and stat.st_size > self.max_file_bytes:
+                        continue
+                    files.append(ScannedFile(entry.path, stat.st_size, stat.st_mtime))
+            except OSError:
+                continue
+        return files, subdirs, rules
+
+    @staticmethod
+    def _read_rules(path: str, base: str) -> List[IgnoreRule]:
+        try:
+            with open(path, encoding='utf-8', errors='replace') as handle:
+                return parse_ignore_lines(handle, base)
+        except OSError:
+            return []
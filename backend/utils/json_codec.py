@@ -0,0 +1,79 @@
+import dataclasses
+import json
+from datetime import date, datetime
+from typing import Any, Optional
+
+from config import Config
+from utils.optional_imports import module_available
+
+ORJSON_AVAILABLE = module_available('orjson')
+BACKENDS = ('orjson', 'json')
+
+
+def _default(obj: Any) -> Any:
+    """Serialize what the standard encoders do not: documents, sets, dates, anything else as str."""
+    if hasattr(obj, 'to_dict'):
+        return obj.to_dict()
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, bytes):
+        return obj.decode('utf-8', 'replace')
+    return str(obj)
+
+
+class JsonCodec:
+    """
+    JSON encoding and decoding through orjson when installed, the stdlib otherwise.
+
+    ``dumps`` returns UTF-8 bytes, compact unless ``pretty`` (2-space indent).
+    Both backends produce the same documents: non-ASCII is written as is,
+    objects with ``to_dict`` go through it, and anything orjson rejects (ints
+    over 64 bits, for one) is encoded again by the stdlib rather than failing.
+    ``loads`` accepts str or bytes and raises ``ValueError`` on bad input.
+    """
+
+    def __init__(self, backend: Optional[str] = None):
+        backend = backend or 'auto'
+        if backend == 'auto':
+            backend = 'orjson' if ORJSON_AVAILABLE else 'json'
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown JSON backend: {backend}")
+        if backend == 'orjson' and not ORJSON_AVAILABLE:
+            raise ValueError("JSON backend 'orjson' is not installed")
+        self.name = backend
+        self._orjson = None
+        if backend == 'orjson':
+            import orjson
+            self._orjson = orjson
+            # Dataclasses go through _default so they match the stdlib backend's output
+            self._options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+            self._pretty_options = self._options | orjson.OPT_INDENT_2
+
+    def dumps(self, obj: Any, pretty: bool = False) -> bytes:
+        if self._orjson is not None:
+            try:
+                return self._orjson.dumps(obj, default=_default,
+                                          option=self._pretty_options if pretty else self._options)
+            except TypeError:
+                pass
+        if pretty:
+            text = json.dumps(obj, default=_default, ensure_ascii=False, indent=2)
+        else:
+            text = json.dumps(obj, default=_default, ensure_ascii=False, separators=(',', ':'))
+        return text.encode('utf-8')
+
+    def dumps_str(self, obj: Any, pretty: bool = False) -> str:
+        return self.dumps(obj, pretty).decode('utf-8')
+
+    def loads(self, data: Any) -> Any:
+        if self._orjson is not None:
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError, a ValueError
+            return self._orjson.loads(data)
+        return json.loads(data)
+
+
+codec = JsonCodec(Config.JSON_BACKEND)
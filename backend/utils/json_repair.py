@@ -0,0 +1,158 @@
+"""
+Tolerant JSON parsing for model output that is almost, but not quite, JSON.
+
+``repair_json`` reads the first JSON object or array in a text and accepts
+what language models commonly get wrong: surrounding prose or code fences,
+raw newlines and stray quotes inside strings, single-quoted strings, bare
+keys, Python literals, missing or trailing commas, and output cut off before
+the closing quotes and brackets. It is a single forward pass with bounded
+lookahead, so it runs in linear time on any input.
+"""
+
+import re
+from typing import Any, Dict, List
+
+_NUMBER = re.compile(r'-?(?:0|[1-9]\d*)(?:\.\d+)?(?:[eE][+-]?\d+)?')
+_WHITESPACE = re.compile(r'\s*')
+_HEX4 = re.compile(r'[0-9a-fA-F]{4}')
+_BARE = re.compile(r'[^\s,:{}\[\]"\']+(?:[ \t]+[^\s,:{}\[\]"\']+)*')
+# Runs of ordinary characters inside a string delimited by each quote
+_STRING_RUN = {quote: re.compile(r'[^%s\\]*' % quote) for quote in '"\''}
+_ESCAPES = {'"': '"', "'": "'", '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+_LITERALS = {'true': True, 'false': False, 'null': None, 'True': True, 'False': False, 'None': None}
+# A quote followed by one of these (after whitespace) closes its string
+_AFTER_CLOSING_QUOTE = ',:}]'
+_MAX_DEPTH = 200
+
+
+class _Repairer:
+    def __init__(self, text: str):
+        self.text = text
+        self.pos = 0
+        self.depth = 0
+
+    def skip_whitespace(self) -> None:
+        self.pos = _WHITESPACE.match(self.text, self.pos).end()
+
+    def peek(self) -> str:
+        return self.text[self.pos] if self.pos < len(self.text) else ''
+
+    def value(self) -> Any:
+        self.skip_whitespace()
+        char = self.peek()
+        if char == '{':
+            return self.container(self.object_members, {})
+        if char == '[':
+            return self.container(self.array_items, [])
+        if char in ('"', "'"):
+            return self.string(char)
+        match = _NUMBER.match(self.text, self.pos)
+        if match and (match.end() == len(self.text) or self.text[match.end()] in ' \t\r\n,:}]'):
+            self.pos = match.end()
+            number = match.group()
+            return float(number) if any(c in number for c in '.eE') else int(number)
+        match = _BARE.match(self.text, self.pos)
+        if match is None:
+            return None
+        self.pos = match.end()
+        word = match.group()
+        return _LITERALS.get(word, word)
+
+    def container(self, fill, container):
+        self.depth += 1
+        if self.depth > _MAX_DEPTH:
+            raise ValueError("JSON nested too deeply to repair")
+        self.pos += 1
+        fill(container)
+        self.depth -= 1
+        return container
+
+    def object_members(self, members: Dict[str, Any]) -> None:
+        while True:
+            self.skip_whitespace()
+            char = self.peek()
+            if not char:
+                return  # Truncated: close what is open
+            self.pos += 1
+            if char == '}':
+                return
+            if char in ',]':
+                continue
+            if char in ('"', "'"):
+                key = self.string(char, advance=False)
+            else:
+                self.pos -= 1
+                match = _BARE.match(self.text, self.pos)
+                if match is None:
+                    self.pos += 1
+                    continue
+                self.pos = match.end()
+                key = match.group()
+            self.skip_whitespace()
+            if self.peek() == ':':
+                self.pos += 1
+            members[str(key)] = self.value()
+
+    def array_items(self, items: List[Any]) -> None:
+        while True:
+            self.skip_whitespace()
+            char = self.peek()
+            if not char:
+                return
+            if char in ']}':
+                self.pos += 1
+                return
+            if char in ',:':
+                self.pos += 1
+                continue
+            start = self.pos
+            items.append(self.value())
+            if self.pos == start:
+                self.pos += 1  # Nothing parsable here; skip the character
+
+    def string(self, quote: str, advance: bool = True) -> str:
+        """A string from its opening ``quote``; raw control characters are kept as they are."""
+        if advance:
+            self.pos += 1
+        text, run = self.text, _STRING_RUN[quote]
+        parts = []
+        while True:
+            end = run.match(text, self.pos).end()
+            parts.append(text[self.pos:end])
+            self.pos = end
+            if end >= len(text):
+                return ''.join(parts)  # Unterminated
+            if text[end] == '\\':
+                escape = text[end + 1:end + 2]
+                if escape == 'u' and _HEX4.fullmatch(text, end + 2, end + 6):
+                    parts.append(chr(int(text[end + 2:end + 6], 16)))
+                    self.pos = end + 6
+                elif escape in _ESCAPES:
+                    parts.append(_ESCAPES[escape])
+                    self.pos = end + 2
+                else:
+                    parts.append('\\' + escape)
+                    self.pos = end + 1 + len(escape)
+                continue
+            # A quote closes the string only if structure follows it, or the next
+            # member's key on a new line (a missing comma)
+            after = _WHITESPACE.match(text, end + 1).end()
+            self.pos = end + 1
+            if after >= len(text) or text[after] in _AFTER_CLOSING_QUOTE or (
+                    text[after] == quote and '\n' in text[end + 1:after]):
+                return ''.join(parts)
+            parts.append(quote)
+
+
+def repair_json(text: str) -> Any:
+    """
+    The first JSON object or array in ``text``, repaired where needed.
+
+    Raises ``ValueError`` if the text contains no ``{`` or ``[``.
+    """
+    starts = [i for i in (text.find('{'), text.find('[')) if i >= 0]
+    if not starts:
+        raise ValueError("No JSON object or array found")
+    repairer = _Repairer(text)
+    repairer.pos = min(starts)
+    return repairer.value()
@@ -0,0 +1,28 @@
+from flask import Request, current_app, request
+
+from utils.json_codec import codec
+
+
+class JsonRequest(Request):
+    """Request whose ``get_json`` parses the body with ``codec``."""
+    json_module = codec
+
+
+def _pretty_requested() -> bool:
+    if current_app.config.get('JSONIFY_PRETTYPRINT_REGULAR') or current_app.debug:
+        return True
+    return request.args.get('pretty', '').lower() in ('1', 'true', 'yes')
+
+
+def jsonify(*args, **kwargs):
+    """
+    ``flask.jsonify`` encoded with ``codec``.
+
+    Responses are compact for machine clients; ``?pretty=1``, debug mode or
+    ``JSONIFY_PRETTYPRINT_REGULAR`` indents them for people reading them.
+    """
+    if args and kwargs:
+        raise TypeError('jsonify() behavior undefined when passed both args and kwargs')
+    data = args[0] if len(args) == 1 else (args or kwargs)
+    body = codec.dumps(data, pretty=_pretty_requested())
+    return current_app.response_class(body + b'\n', mimetype=current_app.config['JSONIFY_MIMETYPE'])
@@ -0,0 +1,40 @@
+import json
+import re
+from typing import Any, List, Tuple
+
+# Optional markdown fence, then '{' or ',' before each top-level "key":
+_MEMBER = re.compile(r'\s*(?:```(?:json)?\s*)?[{,]?\s*"((?:\\.|[^"\\])*)"\s*:\s*')
+
+
+class JsonSectionStream:
+    """
+    Pulls top-level members out of a JSON object that arrives in pieces.
+
+    ``feed`` appends text and returns every ``(key, value)`` pair whose value
+    has become complete, so a streamed Gemini reply can be forwarded section
+    by section instead of after the closing brace. Raw newlines inside strings
+    are accepted, as Gemini often emits them.
+    """
+
+    def __init__(self):
+        self.buffer = ''
+        self.position = 0
+        self._decoder = json.JSONDecoder(strict=False)
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        self.buffer += text
+        members = []
+        while True:
+            match = _MEMBER.match(self.buffer, self.position)
+            if match is None:
+                break
+            try:
+                value, end = self._decoder.raw_decode(self.buffer, match.end())
+            except json.JSONDecodeError:
+                break
+            # A number or literal at the very end of the buffer may still be growing
+            if end == len(self.buffer) and not isinstance(value, (str, list, dict)):
+                break
+            members.append((json.loads(f'"{match.group(1)}"'), value))
+            self.position = end
+        return members
@@ -0,0 +1,148 @@
+import html
+import re
+from typing import Callable, List, Optional, Tuple
+
+_BULLET = re.compile(r'\s{0,3}[-*+]\s+(.*)\Z')
+_ORDERED = re.compile(r'\s{0,3}\d{1,9}[.)]\s+(.*)\Z')
+_FENCE = '```'
+
+
+def _heading(line: str) -> Optional[Tuple[int, str]]:
+    """(level, text) of an ATX heading such as ``## Title ##``, or None."""
+    level = len(line) - len(line.lstrip('#'))
+    if level > 6 or (level < len(line) and not line[level].isspace()):
+        return None
+    text = line[level:].strip()
+    closed = text.rstrip('#')
+    if not closed or closed[-1].isspace():
+        text = closed.rstrip()
+    return level, text
+
+
+def _alternate(text: str, delimiter: str, tag: str, inside: Callable[[str], str],
+               outside: Callable[[str], str]) -> str:
+    """
+    Wrap every second piece of ``text.split(delimiter)`` in ``tag``.
+
+    Delimiters pair up left to right; an unpaired last one, or a pair with
+    nothing between, stays literal. One split and one join, so the cost is
+    linear however the delimiters are laid out.
+    """
+    parts = text.split(delimiter)
+    if len(parts) % 2 == 0:
+        parts[-2:] = [parts[-2] + delimiter + parts[-1]]
+    out = []
+    for i, part in enumerate(parts):
+        if not i % 2:
+            out.append(outside(part))
+        elif part:
+            out.append(f"<{tag}>{inside(part)}</{tag}>")
+        else:
+            out.append(outside(delimiter * 2))
+    return ''.join(out)
+
+
+def _italic(text: str) -> str:
+    return _alternate(text, '*', 'em', html.escape, html.escape)
+
+
+def _emphasis(text: str) -> str:
+    return _alternate(text, '**', 'strong', _italic, _italic)
+
+
+def inline_html(text: str) -> str:
+    """Escaped text with `code`, **bold** and *italic* spans; code spans are not formatted further."""
+    if '`' in text:
+        return _alternate(text, '`', 'code', html.escape, _emphasis)
+    if '*' in text:
+        return _emphasis(text)
+    return html.escape(text)
+
+
+def markdown_to_html(markdown: str, render_json: Optional[Callable[[str], str]] = None) -> str:
+    """
+    Convert the markdown the exporters produce to HTML in one pass over its lines.
+
+    Handles ATX headings, fenced code, ``-``/``*``/``+`` and numbered lists,
+    paragraphs, and inline code, bold and italic. A ```` ```json ```` fence is
+    passed to ``render_json`` (the metrics block) when given. Every line is
+    looked at once and inline spans are found with ``str.split``, so the time
+    is linear in the input with no backtracking worst case. Text is HTML-escaped.
+    """
+    out: List[str] = []
+    paragraph: List[str] = []
+    list_tag: Optional[str] = None
+    fence_lang: Optional[str] = None
+    fence_lines: List[str] = []
+
+    def flush_paragraph():
+        if paragraph:
+            out.append('<p>' + '\n'.join(inline_html(line) for line in paragraph) + '</p>\n')
+            paragraph.clear()
+
+    def close_list():
+        nonlocal list_tag
+        if list_tag is not None:
+            out.append(f'</{list_tag}>\n')
+            list_tag = None
+
+    def flush_fence():
+        body = '\n'.join(fence_lines)
+        if fence_lang == 'json' and render_json is not None:
+            out.append(f'<div class="metrics">{render_json(body)}</div>\n')
+        else:
+            header = f'<div class="code-block-header">{html.escape(fence_lang)}</div>' if fence_lang else ''
+            out.append(f'<div class="code-block">{header}<pre><code>{html.escape(body)}</code></pre></div>\n')
+        fence_lines.clear()
+
+    for line in markdown.split('\n'):
+        if fence_lang is not None:
+            if line.strip() == _FENCE:
+                flush_fence()
+                fence_lang = None
+            else:
+                fence_lines.append(line)
+            continue
+
+        stripped = line.strip()
+        if not stripped:
+            flush_paragraph()
+            close_list()
+            continue
+        if stripped.startswith(_FENCE):
+            flush_paragraph()
+            close_list()
+            fence_lang = stripped[3:].strip()
+            continue
+        if stripped[0] == '#':
+            heading = _heading(stripped)
+            if heading is not None:
+                flush_paragraph()
+                close_list()
+                level, text = heading
+                out.append(f'<h{level}>{inline_html(text)}</h{level}>\n')
+                continue
+
+        item = _BULLET.match(line)
+        tag = 'ul'
+        if item is None:
+            item = _ORDERED.match(line)
+            tag = 'ol'
+        if item is not None:
+            flush_paragraph()
+            if list_tag != tag:
+                close_list()
+                out.append(f'<{tag}>\n')
+                list_tag = tag
+            out.append(f'<li>{inline_html(item.group(1))}</li>\n')
+            continue
+
+        close_list()
+        paragraph.append(stripped)
+
+    if fence_lang is not None:
+        # Unclosed fence: the rest of the document is code
+        flush_fence()
+    flush_paragraph()
+    close_list()
+    return ''.join(out)
@@ -0,0 +1,18 @@
+import importlib.util
+import logging
+
+
+def module_available(name: str, hint: str = '') -> bool:
+    """
+    Whether ``name`` can be imported, without importing it.
+
+    Heavy optional dependencies are checked this way at module import and only
+    imported where they are first used, so worker boot does not pay for them.
+    """
+    try:
+        available = importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        available = False
+    if not available and hint:
+        logging.warning(hint)
+    return available
@@ -0,0 +1,133 @@
+import json
+import logging
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+from utils.sqlite_connections import SQLiteConnections
+
+
+class PersistentCache:
+    """
+    SQLite-backed JSON key/value store that survives worker restarts.
+
+    The database runs in WAL mode with a busy timeout, so several gunicorn
+    workers can read and write the same file concurrently. Total payload size
+    is capped at ``max_bytes``; the least recently read entries are evicted
+    first. Any SQLite failure is logged and treated as a cache miss so the
+    cache can never take a request down with it.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024, ttl: Optional[float] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self._connections = SQLiteConnections(path, (
+            'CREATE TABLE IF NOT EXISTS entries ('
+            ' key TEXT PRIMARY KEY,'
+            ' value TEXT NOT NULL,'
+            ' size INTEGER NOT NULL,'
+            ' created_at REAL NOT NULL,'
+            ' accessed_at REAL NOT NULL,'
+            ' expires_at REAL)',
+            'CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)'
+        ))
+        self._logger = logging.getLogger(__name__)
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            conn = self._connections.get()
+            row = conn.execute('SELECT value, expires_at FROM entries WHERE key = ?', (key,)).fetchone()
+            now = time.time()
+            if row is None or (row[1] is not None and row[1] <= now):
+                if row is not None:
+                    conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+                self.misses += 1
+                return None
+            conn.execute('UPDATE entries SET accessed_at = ? WHERE key = ?', (now, key))
+            self.hits += 1
+            return json.loads(row[0])
+        except (sqlite3.Error, OSError, ValueError) as e:
+            self.errors += 1
+            self._logger.warning(f"Persistent cache read failed: {e}")
+            return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> bool:
+        try:
+            payload = json.dumps(value)
+        except (TypeError, ValueError) as e:
+            self._logger.warning(f"Persistent cache value is not JSON serializable: {e}")
+            return False
+
+        size = len(payload.encode('utf-8'))
+        if size > self.max_bytes:
+            return False
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+
+        try:
+            conn = self._connections.get()
+            # IMMEDIATE takes the write lock up front so insert + eviction is atomic across workers
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                conn.execute(
+                    'INSERT OR REPLACE INTO entries (key, value, size, created_at, accessed_at, expires_at)'
+                    ' VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, payload, size, now, now, now + ttl if ttl else None)
+                )
+                self._evict(conn, now)
+                conn.execute('COMMIT')
+            except Exception:
+                conn.execute('ROLLBACK')
+                raise
+            return True
+        except (sqlite3.Error, OSError) as e:
+            self.errors += 1
+            self._logger.warning(f"Persistent cache write failed: {e}")
+            return False
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        conn.execute('DELETE FROM entries WHERE expires_at IS NOT NULL AND expires_at <= ?', (now,))
+        total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        excess = total - self.max_bytes
+        victims = []
+        for key, size in conn.execute('SELECT key, size FROM entries ORDER BY accessed_at ASC'):
+            victims.append((key,))
+            excess -= size
+            if excess <= 0:
+                break
+        conn.executemany('DELETE FROM entries WHERE key = ?', victims)
+
+    def delete(self, key: str) -> None:
+        try:
+            self._connections.get().execute('DELETE FROM entries WHERE key = ?', (key,))
+        except sqlite3.Error as e:
+            self._logger.warning(f"Persistent cache delete failed: {e}")
+
+    def clear(self) -> None:
+        try:
+            self._connections.get().execute('DELETE FROM entries')
+        except sqlite3.Error as e:
+            self._logger.warning(f"Persistent cache clear failed: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        stats = {
+            'path': self.path,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'errors': self.errors
+        }
+        try:
+            entries, total = self._connections.get().execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries'
+            ).fetchone()
+            stats.update({'entries': entries, 'bytes': total})
+        except sqlite3.Error:
+            pass
+        return stats
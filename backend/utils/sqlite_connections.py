@@ -0,0 +1,38 @@
+import os
+import sqlite3
+import threading
+from typing import Iterable
+
+
+class SQLiteConnections:
+    """
+    One SQLite connection per thread and process to a shared database file.
+
+    Connections run in WAL mode with a busy timeout and autocommit, so several
+    gunicorn workers and their threads can read and write the same file
+    concurrently. The parent directory is created and the ``schema`` statements
+    are run when a thread opens its connection.
+    """
+
+    def __init__(self, path: str, schema: Iterable[str] = ()):
+        self.path = path
+        self.schema = tuple(schema)
+        self._local = threading.local()
+
+    def get(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        # Connections must not cross a fork, so key them by pid as well as thread
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        for statement in self.schema:
+            conn.execute(statement)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
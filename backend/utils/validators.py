@@ -1,10 +1,24 @@
-from typing import Dict, Any
+import os
+from typing import Dict, Any, Optional
 from functools import lru_cache
 
+# Source file extensions of the supported languages
+LANGUAGE_BY_EXTENSION = {
+    '.py': 'python',
+    '.js': 'javascript', '.jsx': 'javascript', '.mjs': 'javascript', '.cjs': 'javascript',
+    '.ts': 'typescript', '.tsx': 'typescript', '.mts': 'typescript', '.cts': 'typescript',
+    '.java': 'java',
+    '.cpp': 'cpp', '.cc': 'cpp', '.cxx': 'cpp', '.hpp': 'cpp', '.hh': 'cpp', '.h': 'cpp',
+    '.cs': 'csharp'
+}
+
 @lru_cache(maxsize=100)
 def get_supported_languages() -> set:
     return {'python', 'javascript', 'typescript', 'java', 'cpp', 'csharp'}
 
+def language_for_path(path: str) -> Optional[str]:
+    return LANGUAGE_BY_EXTENSION.get(os.path.splitext(path)[1].lower())
+
 def validate_code_input(data: Dict[str, Any]) -> bool:
     if not isinstance(data, dict):
         return False